@@ -2,6 +2,8 @@ from fastapi import APIRouter
 
 from app.api.controllers.auth_controller import auth_router
 from app.api.controllers.item_controller import item_router
+from app.api.controllers.notification_controller import notification_router
+from app.api.controllers.ticket_controller import ticket_router
 from app.api.controllers.user_controller import user_router
 
 general_router = APIRouter(prefix="/api")
@@ -9,3 +11,5 @@ general_router = APIRouter(prefix="/api")
 general_router.include_router(item_router)
 general_router.include_router(user_router)
 general_router.include_router(auth_router)
+general_router.include_router(notification_router)
+general_router.include_router(ticket_router)
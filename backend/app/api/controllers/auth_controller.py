@@ -30,7 +30,7 @@ async def register(req: RegisterRequest, request: Request) -> UserResponse:
             last_name=req.last_name,
             password=req.password,
         )
-        return UserResponse.model_validate(vars(user))
+        return UserResponse.model_validate(user, from_attributes=True)
     except UserAlreadyExistsError as e:
         raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=str(e)) from e
 
@@ -0,0 +1,135 @@
+import dataclasses
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from jose import JWTError
+
+from app.business.entities.user_entity import UserRole
+from app.connections.dao.engine import get_pool_status
+from app.connections.dao.slow_queries import SLOW_QUERIES
+from app.core.profiling import PROFILES
+from app.core.security import get_access_token_payload
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from app.business.services.item_service import ItemService
+
+internal_router = APIRouter(prefix="/internal", tags=["Internal"])
+
+
+def require_admin(request: Request) -> None:
+    """Rejects requests without the bearer access token of an admin."""
+    try:
+        payload = get_access_token_payload(request.headers.get("Authorization"))
+    except JWTError as e:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Access token required",
+        ) from e
+    if payload["role"] != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail="Admin access required",
+        )
+
+
+@internal_router.get(
+    "/db",
+    summary="Database pool status",
+    description="Report the live state of this worker's database connection pool (admins only).",
+    dependencies=[Depends(require_admin)],
+)
+async def db_status(request: Request) -> dict:
+    """Return pool occupancy (checked out, idle, overflow) and checkout wait times.
+
+    When a read replica is configured, its pool is reported under "replica".
+    """
+    engine: AsyncEngine | None = request.app.state.engine
+    if engine is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="No database pool: the repositories are kept in memory",
+        )
+    status = get_pool_status(engine)
+
+    replica_engine: AsyncEngine | None = request.app.state.replica_engine
+    if replica_engine is not None:
+        status["replica"] = get_pool_status(replica_engine)
+
+    return status
+
+
+@internal_router.get(
+    "/startup",
+    summary="Startup phases",
+    description=(
+        "Report how long each phase of this worker's startup took, in milliseconds (admins only)."
+    ),
+    dependencies=[Depends(require_admin)],
+)
+async def startup_phases(request: Request) -> dict[str, float]:
+    """Return the duration of each lifespan startup phase."""
+    return request.app.state.startup_phases
+
+
+@internal_router.get(
+    "/profiles",
+    summary="List request profiles",
+    description="List the request profiles stored by this worker, newest first (admins only).",
+    dependencies=[Depends(require_admin)],
+)
+async def list_profiles() -> list[dict]:
+    """Return the stored profiles with their timings, without function statistics."""
+    return PROFILES.summaries()
+
+
+@internal_router.get(
+    "/profiles/{profile_id}",
+    summary="Get a request profile",
+    description="Get a stored request profile with its function statistics (admins only).",
+    dependencies=[Depends(require_admin)],
+)
+async def get_profile(profile_id: str) -> dict:
+    """Return a stored profile, with the functions sorted by cumulative time."""
+    profile = PROFILES.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Profile not found")
+    return profile
+
+
+@internal_router.get(
+    "/slow-queries",
+    summary="Slow queries",
+    description=(
+        "List the last slow SQL statements of this worker and the captured plans of "
+        "the slow statement fingerprints, newest first (admins only)."
+    ),
+    dependencies=[Depends(require_admin)],
+)
+async def slow_queries() -> dict:
+    """Return the slow statements, with redacted parameters and calling route, and plans."""
+    return SLOW_QUERIES.as_dict()
+
+
+@internal_router.post(
+    "/item-snapshots",
+    summary="Snapshot the items",
+    description=(
+        "Snapshot the current state of all the items, the base of the past state "
+        "queries (as_of), without waiting for the periodic one (admins only)."
+    ),
+    dependencies=[Depends(require_admin)],
+    status_code=HTTPStatus.CREATED,
+)
+async def take_item_snapshot(request: Request) -> dict:
+    """Take a snapshot of the items and describe it."""
+    service: ItemService = request.app.state.item_service
+    snapshot = await service.take_history_snapshot()
+    if snapshot is None:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail="Another worker is taking a snapshot",
+        )
+    return dataclasses.asdict(snapshot)
@@ -1,35 +1,164 @@
+from datetime import datetime
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Request, UploadFile
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile
 
+from app.api.serializers import EntityListSerializer, JSONBytesResponse
 from app.api.validators.item_validators import (
     ImportItemsResponse,
+    ItemChangesResponse,
     ItemCreateRequest,
+    ItemEventResponse,
+    ItemEventsListResponse,
     ItemResponse,
     ItemsListResponse,
     ItemUpdateRequest,
 )
-from app.exceptions.item_exceptions import ItemNotFoundError
+from app.business.entities.item_entity import ItemEntity
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.core.timing import get_current_time
+from app.exceptions.item_exceptions import (
+    ItemChangesCursorError,
+    ItemChangesExpiredError,
+    ItemNotFoundError,
+)
 
 if TYPE_CHECKING:
     from app.business.services.item_service import ItemService
 
 item_router = APIRouter(prefix="/items", tags=["Items"])
 
+ExpandQuery = Annotated[
+    Literal["owner"] | None,
+    Query(description="Embed related resources: 'owner' adds the owner's names"),
+]
+
+MAX_EVENTS_PAGE_SIZE = 1000
+MAX_CHANGES_PAGE_SIZE = 1000
+
+AsOfQuery = Annotated[
+    datetime | None,
+    Query(description="Return the state at this past date (with time zone), from the history"),
+]
+AfterQuery = Annotated[int | None, Query(ge=0, description="Return the events after this ID")]
+EventsLimitQuery = Annotated[int, Query(ge=1, le=MAX_EVENTS_PAGE_SIZE)]
+
+items_serializer = EntityListSerializer(ItemEntity, ItemResponse)
+events_serializer = EntityListSerializer(ItemEventEntity, ItemEventResponse)
+
+
+def check_time_zones(**dates: datetime | None) -> None:
+    """Rejects dates without time zone, which could not be compared with the history."""
+    for name, date in dates.items():
+        if date is not None and date.tzinfo is None:
+            raise HTTPException(HTTPStatus.BAD_REQUEST, detail=f"{name} needs a time zone")
+
+
+def check_item_update(req: ItemUpdateRequest) -> None:
+    """Rejects updates clearing a field an item cannot be without."""
+    cleared = req.cleared_required_fields()
+    if cleared:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST,
+            detail=f"Required fields cannot be cleared: {', '.join(cleared)}",
+        )
+
+
+def check_as_of(as_of: datetime | None, expand: str | None) -> None:
+    """Validates a past state query."""
+    check_time_zones(as_of=as_of)
+    if as_of is not None and expand is not None:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail="expand is not supported with as_of")
+
+
+def _events_page(events: list[ItemEventEntity], limit: int) -> JSONBytesResponse:
+    """Returns a page of events, fetched with one extra event to know whether another follows."""
+    next_after = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_after = events[-1].id
+    return JSONBytesResponse(
+        events_serializer.dump_response("events", events, next_after=next_after),
+    )
+
 
 @item_router.get(
     "",
     summary="List all items",
     description="Return all items in the database",
+    response_model=ItemsListResponse,
+)
+async def list_items(
+    request: Request,
+    expand: ExpandQuery = None,
+    as_of: AsOfQuery = None,
+) -> JSONBytesResponse:
+    """Retrieve a list of all items from the database, or as they were at `as_of`."""
+    check_as_of(as_of, expand)
+    service: ItemService = request.app.state.item_service
+    items = await service.list_items(expand_owner=expand == "owner", as_of=as_of)
+    return JSONBytesResponse(items_serializer.dump_response("items", items))
+
+
+# Declared before /{item_id}, which would match "history" and "changes" first
+@item_router.get(
+    "/history",
+    summary="List item events in a time range",
+    response_model=ItemEventsListResponse,
+)
+async def list_item_events(
+    request: Request,
+    start: Annotated[datetime, Query(description="Start of the range (included)")],
+    end: Annotated[datetime | None, Query(description="End (excluded), defaults to now")] = None,
+    after: AfterQuery = None,
+    limit: EventsLimitQuery = 100,
+) -> JSONBytesResponse:
+    """List the changes of all items that occurred in a time range, oldest first."""
+    service: ItemService = request.app.state.item_service
+    check_time_zones(start=start, end=end)
+    if end is None:
+        end = get_current_time()
+    events = await service.list_item_events(start, end, after=after, limit=limit + 1)
+    return _events_page(events, limit)
+
+
+@item_router.get(
+    "/changes",
+    summary="List the item changes since a cursor",
+    description=(
+        "Return the items created or updated and the IDs of the items deleted since "
+        "`since`, a cursor returned by a previous call. Without it, all the items are "
+        "returned. Clients keep a copy of the items up to date by applying the changes, "
+        "then calling again with the new cursor. A cursor older than the retention of "
+        "the deleted items, or from before a reset of the items, is rejected with 410 "
+        "Gone: the client has to start over without cursor."
+    ),
+    response_model=ItemChangesResponse,
 )
-async def list_items(request: Request) -> ItemsListResponse:
-    """Retrieve a list of all items from the database."""
+async def list_item_changes(
+    request: Request,
+    since: Annotated[str | None, Query(description="Cursor of the previous call")] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_CHANGES_PAGE_SIZE)] = 500,
+) -> JSONBytesResponse:
+    """List the changes of the items since a cursor, oldest first."""
     service: ItemService = request.app.state.item_service
-    items = await service.list_items()
-    api_items = [ItemResponse.model_validate(vars(item)) for item in items]
-    return ItemsListResponse(items=api_items)
+    try:
+        changes, cursor = await service.list_item_changes(since, limit=limit)
+    except ItemChangesCursorError as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail=str(e)) from e
+    except ItemChangesExpiredError as e:
+        raise HTTPException(HTTPStatus.GONE, detail=str(e)) from e
+    return JSONBytesResponse(
+        items_serializer.dump_response(
+            "items",
+            changes.items,
+            deleted=[str(item_id) for item_id in changes.deleted],
+            cursor=cursor,
+            has_more=changes.has_more,
+        ),
+    )
 
 
 @item_router.get(
@@ -37,14 +166,40 @@ async def list_items(request: Request) -> ItemsListResponse:
     summary="Get an item",
     description="Retrieve an item by its unique ID",
 )
-async def get_item(item_id: UUID, request: Request) -> ItemResponse:
-    """Retrieve a single item by its ID."""
+async def get_item(
+    item_id: UUID,
+    request: Request,
+    expand: ExpandQuery = None,
+    as_of: AsOfQuery = None,
+) -> ItemResponse:
+    """Retrieve a single item by its ID, or as it was at `as_of`."""
+    check_as_of(as_of, expand)
+    service: ItemService = request.app.state.item_service
+    try:
+        item = await service.get_item(item_id, expand_owner=expand == "owner", as_of=as_of)
+        return ItemResponse.model_validate(item, from_attributes=True)
+    except ItemNotFoundError as e:
+        raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
+
+
+@item_router.get(
+    "/{item_id}/history",
+    summary="Get the history of an item",
+    response_model=ItemEventsListResponse,
+)
+async def get_item_history(
+    item_id: UUID,
+    request: Request,
+    after: AfterQuery = None,
+    limit: EventsLimitQuery = 100,
+) -> JSONBytesResponse:
+    """List the changes of an item, oldest first, including after its deletion."""
     service: ItemService = request.app.state.item_service
     try:
-        item = await service.get_item(item_id)
-        return ItemResponse.model_validate(vars(item))
+        events = await service.get_item_history(item_id, after=after, limit=limit + 1)
     except ItemNotFoundError as e:
         raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
+    return _events_page(events, limit)
 
 
 @item_router.post(
@@ -57,7 +212,7 @@ async def create_item(req: ItemCreateRequest, request: Request) -> ItemResponse:
     """Create a new item in the database."""
     service: ItemService = request.app.state.item_service
     item = await service.create_item(**req.model_dump())
-    return ItemResponse.model_validate(vars(item))
+    return ItemResponse.model_validate(item, from_attributes=True)
 
 
 @item_router.patch(
@@ -67,10 +222,11 @@ async def create_item(req: ItemCreateRequest, request: Request) -> ItemResponse:
 )
 async def update_item(item_id: UUID, req: ItemUpdateRequest, request: Request) -> ItemResponse:
     """Update an existing item in the database."""
+    check_item_update(req)
     service: ItemService = request.app.state.item_service
     try:
         item = await service.update_item(item_id, req.model_dump(exclude_unset=True))
-        return ItemResponse.model_validate(vars(item))
+        return ItemResponse.model_validate(item, from_attributes=True)
     except ItemNotFoundError as e:
         raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
 
@@ -104,5 +260,7 @@ async def import_items(file: UploadFile, request: Request) -> ImportItemsRespons
     contents = await file.read()
     created_entities, errors = await service.import_items_from_file(file.filename, contents)
 
-    created_api = [ItemResponse.model_validate(vars(item)) for item in created_entities]
+    created_api = [
+        ItemResponse.model_validate(item, from_attributes=True) for item in created_entities
+    ]
     return ImportItemsResponse(created=created_api, errors=errors)
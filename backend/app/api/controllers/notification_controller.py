@@ -0,0 +1,84 @@
+import json
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from jose import JWTError
+
+from app.business.entities.user_entity import UserRole
+from app.core.config import config
+from app.core.security import get_access_token_payload
+
+if TYPE_CHECKING:
+    from app.core.notifications import NotificationHub
+
+notification_router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+# Delay before the browser reconnects a dropped stream
+RECONNECT_DELAY_MS = 3000
+
+
+def _authenticate(request: Request, access_token: str | None) -> tuple[str, bool]:
+    """Returns the user of the access token of a request, and whether they are an admin.
+
+    The token comes from the Authorization header, or from the `access_token` query
+    parameter for browsers (EventSource cannot send headers).
+    """
+    try:
+        payload = get_access_token_payload(request.headers.get("Authorization"), access_token)
+    except JWTError as e:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, detail="Access token required") from e
+    return payload["sub"], payload["role"] == UserRole.ADMIN
+
+
+def _format_event(event: str, data: dict) -> bytes:
+    """Formats a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+async def _stream(hub: "NotificationHub", user: str, *, is_admin: bool) -> AsyncIterator[bytes]:
+    """Streams the notifications of a user until the client disconnects."""
+    subscription = hub.subscribe(user, is_admin=is_admin)
+    try:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n".encode()
+        while True:
+            if not await subscription.wait(config.notification_keepalive_seconds):
+                yield b": keepalive\n\n"
+                continue
+            resync, notifications = subscription.drain()
+            chunks = [_format_event("resync", {})] if resync else []
+            chunks.extend(_format_event(n["kind"], n) for n in notifications)
+            yield b"".join(chunks)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@notification_router.get(
+    "/stream",
+    summary="Stream notifications",
+    description=(
+        "Server-sent events about the items of the authenticated user (all items for "
+        "admins). Events of the same subject still pending for a slow client are "
+        "merged; a `resync` event asks the client to reload its data when some were "
+        "dropped or missed."
+    ),
+    response_class=StreamingResponse,
+)
+async def stream_notifications(
+    request: Request,
+    access_token: Annotated[
+        str | None,
+        Query(description="Access token, for clients unable to send the Authorization header"),
+    ] = None,
+) -> StreamingResponse:
+    """Open a notification stream of the authenticated user."""
+    user, is_admin = _authenticate(request, access_token)
+    hub: NotificationHub = request.app.state.notification_hub
+    return StreamingResponse(
+        _stream(hub, user, is_admin=is_admin),
+        media_type="text/event-stream",
+        # Proxies must pass each event on as soon as it is sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
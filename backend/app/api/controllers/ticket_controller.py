@@ -0,0 +1,177 @@
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from jose import JWTError
+
+from app.api.controllers.item_controller import check_item_update
+from app.api.serializers import EntityListSerializer, JSONBytesResponse
+from app.api.validators.ticket_validators import (
+    TicketCreateRequest,
+    TicketDecisionRequest,
+    TicketDecisionsResponse,
+    TicketFailureResponse,
+    TicketResponse,
+    TicketsListResponse,
+)
+from app.business.entities.ticket_entity import TicketEntity
+from app.business.entities.user_entity import UserRole
+from app.business.services.ticket_service import APPROVER_ROLES
+from app.core.security import get_access_token_payload
+from app.exceptions.item_exceptions import ItemNotFoundError
+from app.exceptions.ticket_exceptions import InvalidApproverError, TicketNotFoundError
+
+if TYPE_CHECKING:
+    from app.business.services.ticket_service import TicketService
+
+ticket_router = APIRouter(prefix="/tickets", tags=["Tickets"])
+
+MAX_TICKETS_PAGE_SIZE = 100
+
+tickets_serializer = EntityListSerializer(TicketEntity, TicketResponse)
+
+
+def _authenticate(request: Request) -> tuple[str, UserRole]:
+    """Returns the user of the bearer access token of a request, and their role."""
+    try:
+        payload = get_access_token_payload(request.headers.get("Authorization"))
+    except JWTError as e:
+        raise HTTPException(HTTPStatus.UNAUTHORIZED, detail="Access token required") from e
+    return payload["sub"], payload["role"]
+
+
+def _authenticate_approver(request: Request) -> tuple[str, UserRole]:
+    """Returns the manager or admin making a request, rejecting the other users."""
+    user, role = _authenticate(request)
+    if role not in APPROVER_ROLES:
+        raise HTTPException(HTTPStatus.FORBIDDEN, detail="Manager or admin access required")
+    return user, role
+
+
+@ticket_router.post(
+    "",
+    summary="Request changes of an item",
+    description=(
+        "Open a ticket asking a manager (`approver`, else any manager) to apply changes "
+        "to an item, typically someone else's."
+    ),
+    status_code=HTTPStatus.CREATED,
+)
+async def create_ticket(req: TicketCreateRequest, request: Request) -> TicketResponse:
+    """Open a change ticket as the authenticated user."""
+    user, _ = _authenticate(request)
+    changes = req.changes.model_dump(mode="json", exclude_unset=True)
+    if not changes:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail="No change requested")
+    # Rejected now rather than failing the approval later
+    check_item_update(req.changes)
+    service: TicketService = request.app.state.ticket_service
+    try:
+        ticket = await service.create_ticket(
+            user,
+            req.item_id,
+            changes,
+            approver=req.approver,
+            comment=req.comment,
+        )
+    except ItemNotFoundError as e:
+        raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
+    except InvalidApproverError as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail=str(e)) from e
+    return TicketResponse.model_validate(ticket, from_attributes=True)
+
+
+# Declared before /{ticket_id}, which would match "pending" first
+@ticket_router.get(
+    "/pending",
+    summary="List the pending tickets",
+    description=(
+        "Open tickets a manager can decide (assigned to them or to no one), all open "
+        "tickets for an admin, oldest first."
+    ),
+    response_model=TicketsListResponse,
+)
+async def list_pending_tickets(
+    request: Request,
+    limit: Annotated[int, Query(ge=1, le=MAX_TICKETS_PAGE_SIZE)] = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> JSONBytesResponse:
+    """List the queue of the authenticated manager or admin."""
+    user, role = _authenticate_approver(request)
+    service: TicketService = request.app.state.ticket_service
+    # Fetch one extra row to know whether another page follows
+    tickets = await service.list_pending_tickets(user, role, limit + 1, offset)
+
+    next_offset = None
+    if len(tickets) > limit:
+        tickets = tickets[:limit]
+        next_offset = offset + limit
+
+    return JSONBytesResponse(
+        tickets_serializer.dump_response("tickets", tickets, next_offset=next_offset),
+    )
+
+
+@ticket_router.get("/{ticket_id}", summary="Get a ticket")
+async def get_ticket(ticket_id: UUID, request: Request) -> TicketResponse:
+    """Retrieve a ticket, for its requester, managers and admins."""
+    user, role = _authenticate(request)
+    service: TicketService = request.app.state.ticket_service
+    try:
+        ticket = await service.get_ticket(ticket_id)
+    except TicketNotFoundError as e:
+        raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
+    if role not in APPROVER_ROLES and ticket.requester != user:
+        raise HTTPException(HTTPStatus.NOT_FOUND, detail=f"Ticket {ticket_id} not found")
+    return TicketResponse.model_validate(ticket, from_attributes=True)
+
+
+async def _decide(
+    request: Request,
+    req: TicketDecisionRequest,
+    *,
+    approve: bool,
+) -> TicketDecisionsResponse:
+    """Approves or rejects tickets as the authenticated manager or admin."""
+    user, role = _authenticate_approver(request)
+    service: TicketService = request.app.state.ticket_service
+    decisions = await service.decide_tickets(
+        req.ticket_ids,
+        user,
+        role,
+        approve=approve,
+        comment=req.comment,
+    )
+    return TicketDecisionsResponse(
+        decided=[TicketResponse.model_validate(t, from_attributes=True) for t in decisions.decided],
+        skipped=decisions.skipped,
+        failed=[
+            TicketFailureResponse(ticket_id=ticket_id, error=error)
+            for ticket_id, error in decisions.failed.items()
+        ],
+    )
+
+
+@ticket_router.post(
+    "/approve",
+    summary="Approve tickets",
+    description=(
+        "Approve open tickets of the queue of the user at once, applying their changes "
+        "to the items in one transaction. Tickets another approver is deciding at the "
+        "same time are skipped rather than waited for."
+    ),
+)
+async def approve_tickets(req: TicketDecisionRequest, request: Request) -> TicketDecisionsResponse:
+    """Approve tickets and apply their changes."""
+    return await _decide(request, req, approve=True)
+
+
+@ticket_router.post(
+    "/reject",
+    summary="Reject tickets",
+    description="Reject open tickets of the queue of the user at once.",
+)
+async def reject_tickets(req: TicketDecisionRequest, request: Request) -> TicketDecisionsResponse:
+    """Reject tickets, leaving their items unchanged."""
+    return await _decide(request, req, approve=False)
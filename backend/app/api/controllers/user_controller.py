@@ -1,28 +1,117 @@
+import csv
+import io
+import json
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated, Literal
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
+from starlette.datastructures import UploadFile
 
+from app.api.controllers.item_controller import (
+    AsOfQuery,
+    ExpandQuery,
+    check_as_of,
+    items_serializer,
+)
+from app.api.serializers import EntityListSerializer, JSONBytesResponse
+from app.api.validators.item_validators import ItemsListResponse
 from app.api.validators.user_validators import (
+    BulkUserCreateResponse,
     UserCreateRequest,
     UserResponse,
     UsersListResponse,
+    UsersStatsListResponse,
+    UserStatsResponse,
     UserWithPasswordResponse,
 )
+from app.business.entities.user_entity import UserEntity
 from app.exceptions.user_exceptions import UserNotFoundError
 
 if TYPE_CHECKING:
+    from app.business.services.item_service import ItemService
     from app.business.services.user_service import UserService
 
 user_router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@user_router.get("", summary="List users")
-async def list_users(request: Request) -> UsersListResponse:
-    """List all users."""
+MAX_USERS_PAGE_SIZE = 100
+MAX_BULK_USERS = 5000
+
+users_serializer = EntityListSerializer(UserEntity, UserResponse)
+
+
+@user_router.get("", summary="List users", response_model=UsersListResponse)
+async def list_users(
+    request: Request,
+    q: Annotated[str | None, Query(description="Email, first or last name prefix")] = None,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_USERS_PAGE_SIZE)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> JSONBytesResponse:
+    """List users ordered by email.
+
+    With `q`, only users whose email, first name or last name starts with it
+    (case-insensitive) are returned, which backs owner autocomplete.
+    Without `limit`, all matching users are returned.
+    """
+    service: UserService = request.app.state.user_service
+    # Fetch one extra row to know whether another page follows
+    fetch_limit = limit + 1 if limit is not None else None
+    users = await service.list_users(prefix=q, limit=fetch_limit, offset=offset)
+
+    next_offset = None
+    if limit is not None and len(users) > limit:
+        users = users[:limit]
+        next_offset = offset + limit
+
+    return JSONBytesResponse(
+        users_serializer.dump_response("users", users, next_offset=next_offset),
+    )
+
+
+@user_router.get("/stats", summary="List users by number of assigned items")
+async def list_user_stats(
+    request: Request,
+    limit: Annotated[int, Query(ge=1, le=MAX_USERS_PAGE_SIZE)] = 50,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    order: Annotated[Literal["desc", "asc"], Query(description="Sort by item count")] = "desc",
+    by_category: Annotated[bool, Query(description="Include counts per category")] = False,  # noqa: FBT002
+) -> UsersStatsListResponse:
+    """List users with their number of assigned items, computed in the database."""
     service: UserService = request.app.state.user_service
-    users = await service.list_users()
-    return UsersListResponse(users=[UserResponse.model_validate(vars(u)) for u in users])
+    stats = await service.list_item_counts(
+        limit + 1,  # one extra row to know whether another page follows
+        offset,
+        descending=order == "desc",
+        with_categories=by_category,
+    )
+
+    next_offset = None
+    if len(stats) > limit:
+        stats = stats[:limit]
+        next_offset = offset + limit
+
+    return UsersStatsListResponse(
+        users=[UserStatsResponse.model_validate(entry, from_attributes=True) for entry in stats],
+        next_offset=next_offset,
+    )
+
+
+@user_router.get(
+    "/{email}/items",
+    summary="List the items of a user",
+    response_model=ItemsListResponse,
+)
+async def list_user_items(
+    email: str,
+    request: Request,
+    expand: ExpandQuery = None,
+    as_of: AsOfQuery = None,
+) -> JSONBytesResponse:
+    """List the items a user owns, or owned at `as_of` (also after their deletion)."""
+    check_as_of(as_of, expand)
+    service: ItemService = request.app.state.item_service
+    items = await service.list_items(expand_owner=expand == "owner", owner=email, as_of=as_of)
+    return JSONBytesResponse(items_serializer.dump_response("items", items))
 
 
 @user_router.get("/{email}", summary="Get user")
@@ -31,7 +120,7 @@ async def get_user(email: str, request: Request) -> UserResponse:
     service: UserService = request.app.state.user_service
     try:
         user = await service.get_user(email)
-        return UserResponse.model_validate(vars(user))
+        return UserResponse.model_validate(user, from_attributes=True)
     except UserNotFoundError as e:
         raise HTTPException(HTTPStatus.NOT_FOUND, detail=str(e)) from e
 
@@ -54,6 +143,103 @@ async def create_user(req: UserCreateRequest, request: Request) -> UserWithPassw
     )
 
 
+def _parse_csv_users(contents: bytes) -> list[dict]:
+    """Parse a CSV file of users, normalizing headers and stripping values."""
+    reader = csv.DictReader(io.StringIO(contents.decode("utf-8-sig")))
+    if reader.fieldnames:
+        reader.fieldnames = [
+            c.strip().lower().replace(" ", "_").replace("-", "_") for c in reader.fieldnames
+        ]
+    return [
+        {key: value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in reader
+    ]
+
+
+async def _read_bulk_users(request: Request) -> list[dict]:
+    """Read the user rows of a bulk request, sent as JSON, raw CSV or a CSV upload."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            msg = "Expected a CSV file in the 'file' form field"
+            raise ValueError(msg)
+        return _parse_csv_users(await file.read())
+
+    if content_type in {"text/csv", "application/csv"}:
+        return _parse_csv_users(await request.body())
+
+    payload = json.loads(await request.body())
+    rows = payload.get("users") if isinstance(payload, dict) else payload
+    if not isinstance(rows, list):
+        msg = "Expected a list of users or an object with a 'users' list"
+        raise TypeError(msg)
+    return rows
+
+
+@user_router.post(
+    "/bulk",
+    summary="Create users in bulk",
+    description=(
+        "Create many users at once, from a JSON list (or {'users': [...]}), a raw CSV body "
+        "(text/csv) or a CSV upload in the 'file' field. Columns: email, first_name, "
+        "last_name, and optionally password and role."
+    ),
+    status_code=HTTPStatus.CREATED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": UserCreateRequest.model_json_schema()},
+                },
+                "text/csv": {"schema": {"type": "string"}},
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                    },
+                },
+            },
+        },
+    },
+)
+async def bulk_create_users(request: Request) -> BulkUserCreateResponse:
+    """Bulk creation of users by an admin (onboarding).
+
+    NOTE: Response contains the raw initial passwords
+        that the admin needs to provide to the users.
+    """
+    service: UserService = request.app.state.user_service
+    try:
+        rows = await _read_bulk_users(request)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, detail=f"Invalid bulk payload: {e}") from e
+
+    if len(rows) > MAX_BULK_USERS:
+        raise HTTPException(
+            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BULK_USERS} users can be created per request",
+        )
+
+    created, errors = await service.create_users_bulk(rows)
+    return BulkUserCreateResponse(
+        created=[
+            UserWithPasswordResponse(
+                email=user.email,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                role=user.role,
+                raw_password=raw_password,
+            )
+            for user, raw_password in created
+        ],
+        errors=errors,
+    )
+
+
 @user_router.delete("/{email}", summary="Delete user", status_code=HTTPStatus.NO_CONTENT)
 async def delete_user(email: str, request: Request) -> None:
     """Delete a user by their email."""
@@ -1,7 +1,11 @@
 from datetime import datetime
+from typing import Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
+
+# Fields an item cannot be without (NOT NULL columns), so an update cannot clear them
+REQUIRED_ITEM_FIELDS = ("name", "category", "serial_number_1", "status")
 
 
 class ItemCreateRequest(BaseModel):
@@ -17,7 +21,10 @@ class ItemCreateRequest(BaseModel):
 
 
 class ItemUpdateRequest(BaseModel):
-    """Request model for updating an item."""
+    """Request model for updating an item.
+
+    The fields left out are unchanged, the ones set to null are cleared.
+    """
 
     name: str | None = None
     category: str | None = None
@@ -28,9 +35,30 @@ class ItemUpdateRequest(BaseModel):
     location: str | None = None
     status: str | None = None
 
+    def cleared_required_fields(self) -> list[str]:
+        """Returns the required fields the update sets to null."""
+        return [
+            field
+            for field in REQUIRED_ITEM_FIELDS
+            if field in self.model_fields_set and getattr(self, field) is None
+        ]
+
+
+class ItemOwnerResponse(BaseModel):
+    """Response model for the owner details embedded in an item."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    email: EmailStr
+    first_name: str
+    last_name: str
+
 
 class ItemResponse(BaseModel):
-    """Response model for an item."""
+    """Response model for an item.
+
+    owner_details is only filled when the owner expansion is requested.
+    """
 
     id: UUID
     name: str
@@ -42,6 +70,7 @@ class ItemResponse(BaseModel):
     location: str | None
     status: str
     created_at: datetime
+    owner_details: ItemOwnerResponse | None = None
 
 
 class ItemsListResponse(BaseModel):
@@ -50,6 +79,47 @@ class ItemsListResponse(BaseModel):
     items: list[ItemResponse]
 
 
+class ItemEventResponse(BaseModel):
+    """Response model for an event of the item history.
+
+    changes holds the values set by the change: all the fields on creation, the
+    updated ones on update, none on deletion. actor is the user whose access token
+    authenticated the change, if any.
+    """
+
+    id: int
+    item_id: UUID
+    event_type: Literal["created", "updated", "deleted"]
+    changes: dict[str, Any]
+    actor: str | None
+    request_id: str | None
+    occurred_at: datetime
+
+
+class ItemEventsListResponse(BaseModel):
+    """Response model for a page of item events.
+
+    next_after holds the `after` value of the next page, or None if this is the last one.
+    """
+
+    events: list[ItemEventResponse]
+    next_after: int | None = None
+
+
+class ItemChangesResponse(BaseModel):
+    """Response model for the item changes since a cursor.
+
+    items holds the items created or updated since, in their current state, and
+    deleted the IDs of the items deleted since. cursor is the `since` value of the
+    next call: right away while has_more, later on to get the next changes.
+    """
+
+    items: list[ItemResponse]
+    deleted: list[UUID]
+    cursor: str
+    has_more: bool
+
+
 class ImportItemError(BaseModel):
     """Describes an error that happened when importing a row."""
 
@@ -0,0 +1,79 @@
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, EmailStr, Field
+
+from app.api.validators.item_validators import ItemUpdateRequest
+from app.business.entities.ticket_entity import TicketStatus
+
+MAX_BULK_TICKETS = 500
+
+
+class TicketCreateRequest(BaseModel):
+    """Request model for requesting changes of an item.
+
+    approver assigns the ticket to a manager, else any manager can decide it.
+    """
+
+    item_id: UUID
+    changes: ItemUpdateRequest
+    approver: EmailStr | None = None
+    comment: str | None = None
+
+
+class TicketResponse(BaseModel):
+    """Response model for a ticket.
+
+    changes holds the item fields the ticket sets once approved. The decided_* fields
+    are filled once the ticket is approved or rejected.
+    """
+
+    id: UUID
+    item_id: UUID
+    requester: EmailStr
+    approver: EmailStr | None
+    changes: dict[str, Any]
+    comment: str | None
+    status: TicketStatus
+    created_at: datetime
+    decided_by: EmailStr | None
+    decided_at: datetime | None
+    decision_comment: str | None
+
+
+class TicketsListResponse(BaseModel):
+    """Response model for a list of tickets.
+
+    next_offset holds the offset of the next page, or None if this is the last one.
+    """
+
+    tickets: list[TicketResponse]
+    next_offset: int | None = None
+
+
+class TicketDecisionRequest(BaseModel):
+    """Request model for approving or rejecting tickets at once."""
+
+    ticket_ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_TICKETS)
+    comment: str | None = None
+
+
+class TicketFailureResponse(BaseModel):
+    """Response model for a ticket whose item update was refused."""
+
+    ticket_id: UUID
+    error: str
+
+
+class TicketDecisionsResponse(BaseModel):
+    """Response model for a bulk decision on tickets.
+
+    skipped holds the tickets left as they were: not open in the queue of the user,
+    or being decided by someone else at the same time. failed holds the approved
+    tickets whose item update was refused, which stay open.
+    """
+
+    decided: list[TicketResponse]
+    skipped: list[UUID]
+    failed: list[TicketFailureResponse]
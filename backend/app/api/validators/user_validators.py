@@ -23,9 +23,31 @@ class UserResponse(BaseModel):
 
 
 class UsersListResponse(BaseModel):
-    """Response model for a list of users."""
+    """Response model for a list of users.
+
+    When the listing is paginated, next_offset holds the offset of the next page,
+    or None if this is the last one.
+    """
 
     users: list[UserResponse]
+    next_offset: int | None = None
+
+
+class UserStatsResponse(UserResponse):
+    """Response model for a user with their number of assigned items.
+
+    items_per_category is only filled when the breakdown is requested.
+    """
+
+    item_count: int
+    items_per_category: dict[str, int] | None = None
+
+
+class UsersStatsListResponse(BaseModel):
+    """Response model for a page of user statistics."""
+
+    users: list[UserStatsResponse]
+    next_offset: int | None = None
 
 
 class UserWithPasswordResponse(UserResponse):
@@ -37,3 +59,18 @@ class UserWithPasswordResponse(UserResponse):
     """
 
     raw_password: str
+
+
+class BulkUserCreateError(BaseModel):
+    """Describes an error that happened when creating a row of a bulk request."""
+
+    row: int
+    email: str | None = None
+    error: str
+
+
+class BulkUserCreateResponse(BaseModel):
+    """Response for the bulk user creation endpoint."""
+
+    created: list[UserWithPasswordResponse]
+    errors: list[BulkUserCreateError]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from app.business.entities.item_entity import ItemEntity
+
+
+@dataclass(slots=True)
+class ItemChangesEntity:
+    """Describes a page of the item changes after a change number.
+
+    items holds the items created or updated since (in their current state) and
+    deleted the IDs of the items deleted since. The next page starts after
+    last_change_seq, which stays behind the changes that may not be committed yet.
+    The change numbers only compare within an epoch, which a reset of the items ends.
+    """
+
+    items: list[ItemEntity]
+    deleted: list[UUID]
+    last_change_seq: int
+    has_more: bool
+    epoch: int
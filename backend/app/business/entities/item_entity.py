@@ -1,14 +1,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
 
-if TYPE_CHECKING:
-    from datetime import datetime
-    from uuid import UUID
+# Imported at runtime: pydantic resolves these annotations to serialize entities
+from datetime import datetime  # noqa: TC003
+from uuid import UUID  # noqa: TC003
 
 
-@dataclass
+@dataclass(slots=True)
+class ItemOwnerEntity:
+    """Public details of the user owning an item."""
+
+    email: str
+    first_name: str
+    last_name: str
+
+
+@dataclass(slots=True)
 class ItemEntity:
     """Represents an item in the system."""
 
@@ -22,3 +30,4 @@ class ItemEntity:
     location: str | None
     status: str
     created_at: datetime
+    owner_details: ItemOwnerEntity | None = None  # only loaded when expanded
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+# Imported at runtime: pydantic resolves these annotations to serialize entities
+from datetime import datetime  # noqa: TC003
+from uuid import UUID  # noqa: TC003
+
+
+@dataclass(slots=True)
+class ItemEventEntity:
+    """Represents a change of an item, as recorded in its history.
+
+    changes holds the values set by the change (all the fields on creation, none on
+    deletion), encoded as JSON-compatible values.
+    """
+
+    id: int | None
+    item_id: UUID
+    event_type: str
+    changes: dict
+    actor: str | None
+    request_id: str | None
+    occurred_at: datetime
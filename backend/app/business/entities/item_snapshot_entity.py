@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+
+@dataclass(slots=True)
+class ItemSnapshotEntity:
+    """Describes a snapshot of all the items, the base of the past state queries.
+
+    The snapshot holds the state of the items at taken_at, which includes every event
+    of the item history up to last_event_id.
+    """
+
+    id: int
+    taken_at: datetime
+    settled_at: datetime
+    last_event_id: int
+    item_count: int
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+
+@dataclass(slots=True)
+class RefreshTokenEntity:
+    """Represents a stored refresh token (only its hash is kept)."""
+
+    id: UUID
+    token_hash: str
+    user_email: str
+    issued_at: datetime
+    expires_at: datetime
+    revoked: bool = False
+    replaced_by: UUID | None = None
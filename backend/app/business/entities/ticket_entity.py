@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+# Imported at runtime: pydantic resolves these annotations to serialize entities
+from datetime import datetime  # noqa: TC003
+from enum import Enum
+from uuid import UUID  # noqa: TC003
+
+
+class TicketStatus(str, Enum):
+    """Enum for ticket statuses."""
+
+    OPEN = "open"
+    APPROVED = "approved"
+    REJECTED = "rejected"
+
+
+@dataclass(slots=True)
+class TicketEntity:
+    """Represents a change of an item requested by someone else than its owner.
+
+    changes holds the item fields to update, applied when the ticket is approved.
+    approver is the manager the ticket is assigned to, None for any manager.
+    """
+
+    id: UUID | None
+    item_id: UUID
+    requester: str
+    approver: str | None
+    changes: dict
+    comment: str | None
+    status: TicketStatus
+    created_at: datetime
+    decided_by: str | None = None
+    decided_at: datetime | None = None
+    decision_comment: str | None = None
+
+
+@dataclass(slots=True)
+class TicketDecisionsEntity:
+    """Describes the outcome of a bulk approval or rejection of tickets.
+
+    skipped holds the tickets not open in the queue of the approver at the time: being
+    decided by another approver, already decided, or unknown. failed holds the
+    tickets whose item update was refused, with the reason, which stay open.
+    """
+
+    decided: list[TicketEntity] = field(default_factory=list)
+    skipped: list[UUID] = field(default_factory=list)
+    failed: dict[UUID, str] = field(default_factory=dict)
@@ -8,15 +8,28 @@ class UserRole(str, Enum):
     """Enum for user roles."""
 
     USER = "USER"
+    MANAGER = "MANAGER"  # approves the change tickets
     ADMIN = "ADMIN"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserEntity:
     """Represents a user in the system."""
 
     email: str
     first_name: str
     last_name: str
-    hashed_password: str
+    hashed_password: str | None  # None when loaded without credentials (directory listings)
     role: UserRole = UserRole.USER
+
+
+@dataclass(slots=True)
+class UserItemStatsEntity:
+    """Represents a user along with the number of items assigned to them."""
+
+    email: str
+    first_name: str
+    last_name: str
+    role: UserRole
+    item_count: int
+    items_per_category: dict[str, int] | None = None
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+    from uuid import UUID
+
+    from app.business.entities.item_changes_entity import ItemChangesEntity
+    from app.business.entities.item_entity import ItemEntity
+    from app.business.entities.item_event_entity import ItemEventEntity
+    from app.business.entities.item_snapshot_entity import ItemSnapshotEntity
+
+
+class ItemRepository(Protocol):
+    """Storage of the items, implemented for each repository backend.
+
+    Every write also records an event in the item history.
+    """
+
+    async def list_items(
+        self,
+        *,
+        expand_owner: bool = False,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves all items (of `owner` if given), with their owner details if `expand_owner`."""
+        ...
+
+    async def list_items_as_of(
+        self,
+        as_of: datetime,
+        *,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves the items (of `owner` if given) as they were at a past date.
+
+        The state is rebuilt from the latest snapshot before that date and the item
+        history recorded since.
+        """
+        ...
+
+    async def get_as_of(self, item_id: UUID, as_of: datetime) -> ItemEntity:
+        """Retrieves an item as it was at a past date.
+
+        Raises:
+            ItemNotFoundError: If the item did not exist at that date.
+        """
+        ...
+
+    async def take_snapshot(
+        self,
+        *,
+        min_interval: timedelta | None = None,
+    ) -> ItemSnapshotEntity | None:
+        """Snapshots all the items, unless the latest snapshot is younger than `min_interval`.
+
+        Returns None when skipped (or when another worker is taking one).
+        """
+        ...
+
+    async def purge_snapshots(self, before: datetime) -> int:
+        """Thins out the snapshots taken before the latest one taken before a date.
+
+        The first snapshot of each month (UTC) is kept, and the past dates since `before`
+        keep their snapshot. Returns how many were deleted.
+        """
+        ...
+
+    async def get(self, item_id: UUID, *, expand_owner: bool = False) -> ItemEntity:
+        """Retrieves an item by its ID.
+
+        Raises:
+            ItemNotFoundError: If no item has this ID.
+        """
+        ...
+
+    async def create(self, item: ItemEntity) -> ItemEntity:
+        """Stores a new item, generating its ID if None, and returns it."""
+        ...
+
+    async def update(self, item_id: UUID, updates: dict) -> ItemEntity:
+        """Updates fields of an item and returns it.
+
+        Raises:
+            ItemNotFoundError: If no item has this ID.
+        """
+        ...
+
+    async def delete(self, item_id: UUID) -> None:
+        """Deletes an item.
+
+        Raises:
+            ItemNotFoundError: If no item has this ID.
+        """
+        ...
+
+    async def get_history(
+        self,
+        item_id: UUID,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of an item (possibly deleted), oldest first.
+
+        Only the events with an ID above `after` are returned, at most `limit`.
+        """
+        ...
+
+    async def list_events(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of all items that occurred in [start, end), oldest first.
+
+        Only the events with an ID above `after` are returned, at most `limit`.
+        """
+        ...
+
+    async def list_changes(self, since: int, *, limit: int) -> ItemChangesEntity:
+        """Retrieves the items changed and deleted after a change number, in change order.
+
+        At most `limit` changes are returned, an item appearing once in its latest state,
+        along with the current epoch of the change numbers.
+        """
+        ...
+
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Forgets the items deleted before a date, returning how many."""
+        ...
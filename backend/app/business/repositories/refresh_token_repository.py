@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+    from app.business.entities.refresh_token_entity import RefreshTokenEntity
+
+
+class RefreshTokenRepository(Protocol):
+    """Storage of the refresh tokens, implemented for each repository backend."""
+
+    async def create(
+        self,
+        token_hash: str,
+        user_email: str,
+        expires_at: datetime,
+        replaced_by: UUID | None = None,
+    ) -> RefreshTokenEntity:
+        """Stores a new refresh token and returns it."""
+        ...
+
+    async def get_by_hash(self, token_hash: str) -> RefreshTokenEntity | None:
+        """Retrieves a refresh token by its hashed value."""
+        ...
+
+    async def revoke(self, token_id: UUID, replaced_by: UUID | None = None) -> None:
+        """Revokes a refresh token, recording the token replacing it if any."""
+        ...
+
+    async def revoke_by_user(self, user_email: str) -> None:
+        """Revokes all the refresh tokens of a user."""
+        ...
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+    from app.business.entities.ticket_entity import TicketDecisionsEntity, TicketEntity
+
+
+class TicketRepository(Protocol):
+    """Storage of the change tickets, implemented for each repository backend."""
+
+    async def create(self, ticket: TicketEntity) -> TicketEntity:
+        """Stores a new ticket, generating its ID if None, and returns it."""
+        ...
+
+    async def get(self, ticket_id: UUID) -> TicketEntity:
+        """Retrieves a ticket by its ID.
+
+        Raises:
+            TicketNotFoundError: If no ticket has this ID.
+        """
+        ...
+
+    async def list_pending(
+        self,
+        approver: str | None,
+        limit: int,
+        offset: int = 0,
+    ) -> list[TicketEntity]:
+        """Retrieves the open tickets of a queue, oldest first.
+
+        Args:
+            approver: The manager whose queue is read (the tickets assigned to them and
+                the unassigned ones), None for all the open tickets.
+            limit: Maximum number of tickets to return.
+            offset: Number of tickets to skip.
+        """
+        ...
+
+    async def decide(
+        self,
+        ticket_ids: list[UUID],
+        *,
+        approve: bool,
+        decided_by: str,
+        approver: str | None,
+        comment: str | None = None,
+    ) -> TicketDecisionsEntity:
+        """Approves or rejects open tickets of a queue, at once.
+
+        Approving a ticket applies its changes to the item, recording an item event.
+        The tickets another approver is deciding at the same time are skipped rather
+        than waited for.
+
+        Args:
+            ticket_ids: The tickets to decide.
+            approve: True to approve them, False to reject them.
+            decided_by: The user deciding.
+            approver: The queue the tickets must be in, as for `list_pending`.
+            comment: A comment on the decision.
+        """
+        ...
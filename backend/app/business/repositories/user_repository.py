@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from app.business.entities.user_entity import UserEntity, UserItemStatsEntity
+
+
+class UserRepository(Protocol):
+    """Storage of the users, implemented for each repository backend."""
+
+    async def list_users(
+        self,
+        prefix: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserEntity]:
+        """Retrieves users ordered by email, without their password hash.
+
+        Args:
+            prefix: Case-insensitive prefix of the email, first name or last name.
+            limit: Maximum number of users to return. If None, no limit.
+            offset: Number of users to skip.
+        """
+        ...
+
+    async def list_item_counts(
+        self,
+        limit: int,
+        offset: int = 0,
+        *,
+        descending: bool = True,
+        with_categories: bool = False,
+    ) -> list[UserItemStatsEntity]:
+        """Retrieves users with their number of assigned items (ties ordered by email).
+
+        Args:
+            limit: Maximum number of users to return.
+            offset: Number of users to skip.
+            descending: Flag to sort by decreasing item count.
+            with_categories: Flag to also count the items per category.
+        """
+        ...
+
+    async def get(self, email: str, *, user_or_none: bool = False) -> UserEntity | None:
+        """Retrieves a user by their email.
+
+        Raises:
+            UserNotFoundError: If no user has this email and `user_or_none` is False.
+        """
+        ...
+
+    async def create(self, user: UserEntity) -> UserEntity:
+        """Stores a new user and returns it."""
+        ...
+
+    async def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Returns the subset of the given emails that already belong to a user."""
+        ...
+
+    async def create_many(self, users: list[UserEntity]) -> list[UserEntity]:
+        """Stores many users, skipping existing emails, and returns the stored ones."""
+        ...
+
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        """Replaces the stored password hash of a user.
+
+        Raises:
+            UserNotFoundError: If no user has this email.
+        """
+        ...
+
+    async def delete(self, email: str) -> None:
+        """Deletes a user.
+
+        Raises:
+            UserNotFoundError: If no user has this email.
+        """
+        ...
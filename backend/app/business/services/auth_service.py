@@ -6,14 +6,18 @@ from datetime import timedelta
 from typing import TYPE_CHECKING
 
 from app.core.config import config
-from app.core.security import create_access_token, verify_password
+from app.core.security import (
+    create_access_token,
+    run_in_hash_executor,
+    verify_and_update_password,
+)
 from app.core.timing import get_current_time
 from app.exceptions.user_exceptions import UserNotFoundError
 
 if TYPE_CHECKING:
     from app.business.entities.user_entity import UserEntity
-    from app.connections.repositories.refresh_token_repository import RefreshTokenRepository
-    from app.connections.repositories.user_postgre_repository import UserPostgreRepository
+    from app.business.repositories.refresh_token_repository import RefreshTokenRepository
+    from app.business.repositories.user_repository import UserRepository
 
 
 def _hash_refresh_token(raw_token: str) -> str:
@@ -26,7 +30,7 @@ class AuthService:
 
     def __init__(
         self,
-        user_repo: UserPostgreRepository,
+        user_repo: UserRepository,
         refresh_repo: RefreshTokenRepository,
     ) -> None:
         """Initializes the AuthService with user and refresh token repositories."""
@@ -36,6 +40,9 @@ class AuthService:
     async def authenticate_user(self, email: str, password: str) -> UserEntity | None:
         """Authenticate a user.
 
+        If the stored hash was made with an outdated scheme or cost factor, it is
+        transparently replaced by a hash following the current policy.
+
         Args:
             email: The email address of the user to authenticate.
             password: The plain text password to verify.
@@ -47,9 +54,19 @@ class AuthService:
         if not user:
             return None
 
-        if not verify_password(password, user.hashed_password):
+        # bcrypt is slow on purpose: verify in the hashing executor, off the event loop
+        valid, new_hash = await run_in_hash_executor(
+            verify_and_update_password,
+            password,
+            user.hashed_password,
+        )
+        if not valid:
             return None
 
+        if new_hash:
+            await self.user_repo.update_password_hash(user.email, new_hash)
+            user.hashed_password = new_hash
+
         return user
 
     def _create_access_token_for_user(self, user: UserEntity) -> str:
@@ -1,14 +1,68 @@
 import io
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
 from uuid import UUID
 
-import pandas as pd
 from pydantic import ValidationError
 from starlette.concurrency import run_in_threadpool
 
 from app.api.validators.item_validators import ItemCreateRequest
+from app.business.entities.item_changes_entity import ItemChangesEntity
 from app.business.entities.item_entity import ItemEntity
-from app.connections.repositories.item_postgre_repository import ItemPostgreRepository
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.business.entities.item_snapshot_entity import ItemSnapshotEntity
+from app.business.repositories.item_repository import ItemRepository
+from app.core.config import config
+from app.core.metrics import REGISTRY, Counter, Histogram
 from app.core.timing import get_current_time
+from app.exceptions.item_exceptions import ItemChangesCursorError, ItemChangesExpiredError
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+IMPORT_ROWS = REGISTRY.register(
+    Counter("item_import_rows_total", "Rows processed by item imports.", ("outcome",)),
+)
+IMPORT_DURATION = REGISTRY.register(
+    Histogram(
+        "item_import_duration_seconds",
+        "Duration of item imports, from parsing to the last created item.",
+        buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    ),
+)
+
+
+def normalize_import_rows(df: "pd.DataFrame") -> list[dict]:
+    """Normalizes the headers of an imported file and returns its stripped rows."""
+    df.columns = [c.strip().lower().replace(" ", "_").replace("-", "_") for c in df.columns]
+    df = df.where(df.notna(), None)
+    df[df.columns] = df.apply(lambda x: x.str.strip())
+    return df.to_dict(orient="records")
+
+
+def encode_changes_cursor(epoch: int, change_seq: int, deletions_since: datetime) -> str:
+    """Builds a cursor of the item changes.
+
+    Besides the change number the client is up to date with and its epoch, the cursor
+    holds the date since which the client may need the tombstones of the items it
+    holds: once they may have been purged, or the items reset, the cursor has expired.
+    """
+    return f"{epoch}.{change_seq}.{int(deletions_since.timestamp() * 1000)}"
+
+
+def decode_changes_cursor(cursor: str) -> tuple[int, int, datetime]:
+    """Returns the epoch, the change number and the deletions date of a cursor.
+
+    Raises:
+        ItemChangesCursorError: If the cursor is malformed.
+    """
+    try:
+        epoch, change_seq, milliseconds = cursor.split(".")
+        deletions_since = datetime.fromtimestamp(int(milliseconds) / 1000, tz=UTC)
+        return int(epoch), int(change_seq), deletions_since
+    except (ValueError, OverflowError, OSError) as e:
+        raise ItemChangesCursorError(cursor) from e
 
 
 class ItemService:
@@ -19,17 +73,40 @@ class ItemService:
     It handles the business logic and data validation for item operations.
     """
 
-    def __init__(self, repo: ItemPostgreRepository) -> None:
+    def __init__(self, repo: ItemRepository) -> None:
         """Initialize the ItemService with a repository."""
         self.repo = repo
 
-    async def list_items(self) -> list[ItemEntity]:
-        """Retrieve a list of all items from the repository."""
-        return await self.repo.list_items()
+    async def list_items(
+        self,
+        *,
+        expand_owner: bool = False,
+        owner: str | None = None,
+        as_of: datetime | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieve a list of all items (of `owner` if given) from the repository.
 
-    async def get_item(self, item_id: UUID) -> ItemEntity:
-        """Retrieve an item by its ID from the repository."""
-        return await self.repo.get(item_id)
+        With `as_of`, the items are returned as they were at that date, rebuilt from
+        their history (without owner details).
+        """
+        if as_of is not None:
+            return await self.repo.list_items_as_of(as_of, owner=owner)
+        return await self.repo.list_items(expand_owner=expand_owner, owner=owner)
+
+    async def get_item(
+        self,
+        item_id: UUID,
+        *,
+        expand_owner: bool = False,
+        as_of: datetime | None = None,
+    ) -> ItemEntity:
+        """Retrieve an item by its ID from the repository.
+
+        With `as_of`, the item is returned as it was at that date (without owner details).
+        """
+        if as_of is not None:
+            return await self.repo.get_as_of(item_id, as_of)
+        return await self.repo.get(item_id, expand_owner=expand_owner)
 
     async def create_item(
         self,
@@ -62,12 +139,106 @@ class ItemService:
         """Delete an item from the repository."""
         await self.repo.delete(item_id)
 
+    async def get_item_history(
+        self,
+        item_id: UUID,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieve the history of an item, oldest event first.
+
+        The history of a deleted item is kept. An item without any event (created
+        before the history was recorded) has an empty history.
+
+        Raises:
+            ItemNotFoundError: If the item has no event and does not exist.
+        """
+        events = await self.repo.get_history(item_id, after=after, limit=limit)
+        if not events and after is None:
+            await self.repo.get(item_id)
+        return events
+
+    async def list_item_events(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieve the events of all items that occurred in [start, end), oldest first."""
+        return await self.repo.list_events(start, end, after=after, limit=limit)
+
+    async def take_history_snapshot(
+        self,
+        min_interval: timedelta | None = None,
+    ) -> ItemSnapshotEntity | None:
+        """Snapshot all the items, the base of the past state queries.
+
+        Returns None if the latest snapshot is younger than `min_interval`, or another
+        worker is taking one.
+        """
+        return await self.repo.take_snapshot(min_interval=min_interval)
+
+    async def purge_history_snapshots(self) -> int:
+        """Thin out the snapshots older than the retention to one per month."""
+        retention = timedelta(days=config.item_snapshot_retention_days)
+        return await self.repo.purge_snapshots(get_current_time() - retention)
+
+    async def list_item_changes(
+        self,
+        cursor: str | None,
+        *,
+        limit: int,
+    ) -> tuple[ItemChangesEntity, str]:
+        """Retrieve the items changed and deleted since a cursor, and the next cursor.
+
+        Without cursor, all the items are returned (page by page) as changes. The next
+        cursor goes on with the next page when `has_more`, else with the next changes.
+
+        Raises:
+            ItemChangesCursorError: If the cursor is malformed.
+            ItemChangesExpiredError: If deletions since the cursor may have been purged,
+                or the items were reset since.
+        """
+        now = get_current_time()
+        settled_at = now - timedelta(seconds=config.item_changes_settle_seconds)
+        if cursor is None:
+            epoch, since, deletions_since = None, 0, settled_at
+        else:
+            epoch, since, deletions_since = decode_changes_cursor(cursor)
+            if deletions_since < now - timedelta(days=config.item_tombstone_retention_days):
+                raise ItemChangesExpiredError(cursor)
+
+        changes = await self.repo.list_changes(since, limit=limit)
+        if epoch is not None and epoch != changes.epoch:
+            # The numbers of the cursor are from before a reset of the items
+            raise ItemChangesExpiredError(cursor)
+        if not changes.has_more:
+            # Up to date: the items deleted from now on are the only ones still needed
+            deletions_since = settled_at
+        return changes, encode_changes_cursor(
+            changes.epoch,
+            changes.last_change_seq,
+            deletions_since,
+        )
+
+    async def purge_item_tombstones(self) -> int:
+        """Forget the deleted items older than the retention of the changes feed."""
+        retention = timedelta(days=config.item_tombstone_retention_days)
+        return await self.repo.purge_tombstones(get_current_time() - retention)
+
     async def import_items_from_file(
         self,
         filename: str,
         contents: bytes,
     ) -> tuple[list[ItemEntity], list[dict]]:
         """Parse CSV/XLSX with pandas, validate, and create items."""
+        # pandas is slow to import and only needed here, so load it on first use
+        import pandas as pd  # noqa: PLC0415
+
+        start = time.perf_counter()
 
         def _parse() -> pd.DataFrame:
             lower = filename.lower()
@@ -84,12 +255,10 @@ class ItemService:
             return [], [{"row": 0, "error": f"Failed to parse file: {e}"}]
 
         # Normalize headers, convert NaN → None and strip str values
-        df.columns = [c.strip().lower().replace(" ", "_").replace("-", "_") for c in df.columns]
-        df = df.where(pd.notna(df), None)
-        df[df.columns] = df.apply(lambda x: x.str.strip())
+        rows = normalize_import_rows(df)
 
         created, errors = [], []
-        for idx, row in enumerate(df.to_dict(orient="records"), start=1):
+        for idx, row in enumerate(rows, start=1):
 
             payload = {
                 "name": row.get("name"),
@@ -113,4 +282,7 @@ class ItemService:
             except Exception as e:
                 errors.append({"row": idx, "error": f"Failed to create item: {e}"})
 
+        IMPORT_ROWS.inc(len(created), ("created",))
+        IMPORT_ROWS.inc(len(errors), ("failed",))
+        IMPORT_DURATION.observe(time.perf_counter() - start)
         return created, errors
@@ -0,0 +1,103 @@
+from uuid import UUID
+
+from app.business.entities.ticket_entity import TicketDecisionsEntity, TicketEntity, TicketStatus
+from app.business.entities.user_entity import UserRole
+from app.business.repositories.item_repository import ItemRepository
+from app.business.repositories.ticket_repository import TicketRepository
+from app.business.repositories.user_repository import UserRepository
+from app.core.timing import get_current_time
+from app.exceptions.ticket_exceptions import InvalidApproverError
+
+APPROVER_ROLES = frozenset({UserRole.MANAGER, UserRole.ADMIN})
+
+
+class TicketService:
+    """Service class for managing the change tickets of items.
+
+    Anyone can request a change of an item through a ticket. Managers approve or
+    reject the open tickets assigned to them and the unassigned ones (their queue),
+    admins any open ticket. Approving a ticket applies its changes to the item.
+    """
+
+    def __init__(
+        self,
+        repo: TicketRepository,
+        item_repo: ItemRepository,
+        user_repo: UserRepository,
+    ) -> None:
+        """Initialize the TicketService with its repository and the ones it checks."""
+        self.repo = repo
+        self.item_repo = item_repo
+        self.user_repo = user_repo
+
+    async def create_ticket(
+        self,
+        requester: str,
+        item_id: UUID,
+        changes: dict,
+        approver: str | None = None,
+        comment: str | None = None,
+    ) -> TicketEntity:
+        """Request changes of an item, assigned to `approver` if given (else any manager).
+
+        Raises:
+            ItemNotFoundError: If the item does not exist.
+            InvalidApproverError: If the approver is not a manager or an admin.
+        """
+        await self.item_repo.get(item_id)
+        if approver is not None:
+            user = await self.user_repo.get(approver, user_or_none=True)
+            if user is None or user.role not in APPROVER_ROLES:
+                raise InvalidApproverError(approver)
+        ticket = TicketEntity(
+            id=None,
+            item_id=item_id,
+            requester=requester,
+            approver=approver,
+            changes=changes,
+            comment=comment,
+            status=TicketStatus.OPEN,
+            created_at=get_current_time(),
+        )
+        return await self.repo.create(ticket)
+
+    async def get_ticket(self, ticket_id: UUID) -> TicketEntity:
+        """Retrieve a ticket by its ID."""
+        return await self.repo.get(ticket_id)
+
+    async def list_pending_tickets(
+        self,
+        user: str,
+        role: UserRole,
+        limit: int,
+        offset: int = 0,
+    ) -> list[TicketEntity]:
+        """List the open tickets a manager or an admin can decide, oldest first."""
+        return await self.repo.list_pending(self._queue_of(user, role), limit, offset)
+
+    async def decide_tickets(
+        self,
+        ticket_ids: list[UUID],
+        user: str,
+        role: UserRole,
+        *,
+        approve: bool,
+        comment: str | None = None,
+    ) -> TicketDecisionsEntity:
+        """Approve or reject open tickets at once, applying the changes of the approved ones.
+
+        The tickets outside the queue of the user, already decided or being decided by
+        someone else are skipped.
+        """
+        return await self.repo.decide(
+            list(dict.fromkeys(ticket_ids)),
+            approve=approve,
+            decided_by=user,
+            approver=self._queue_of(user, role),
+            comment=comment,
+        )
+
+    @staticmethod
+    def _queue_of(user: str, role: UserRole) -> str | None:
+        """Returns the queue of an approver: theirs for a manager, None (all) for an admin."""
+        return None if role == UserRole.ADMIN else user
@@ -1,21 +1,45 @@
 import secrets
 
-from app.business.entities.user_entity import UserEntity, UserRole
-from app.connections.repositories.user_postgre_repository import UserPostgreRepository
-from app.core.security import hash_password
+from pydantic import ValidationError
+
+from app.api.validators.user_validators import UserCreateRequest
+from app.business.entities.user_entity import UserEntity, UserItemStatsEntity, UserRole
+from app.business.repositories.user_repository import UserRepository
+from app.core.security import hash_password, hash_passwords
 from app.exceptions.user_exceptions import UserAlreadyExistsError
 
 
 class UserService:
     """Service class for managing users."""
 
-    def __init__(self, repo: UserPostgreRepository) -> None:
+    def __init__(self, repo: UserRepository) -> None:
         """Initialize the UserService with a repository."""
         self.repo = repo
 
-    async def list_users(self) -> list[UserEntity]:
-        """List all users."""
-        return await self.repo.list_users()
+    async def list_users(
+        self,
+        prefix: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserEntity]:
+        """List users, optionally filtered by a name or email prefix and paginated."""
+        return await self.repo.list_users(prefix=prefix, limit=limit, offset=offset)
+
+    async def list_item_counts(
+        self,
+        limit: int,
+        offset: int = 0,
+        *,
+        descending: bool = True,
+        with_categories: bool = False,
+    ) -> list[UserItemStatsEntity]:
+        """List users sorted by their number of assigned items."""
+        return await self.repo.list_item_counts(
+            limit,
+            offset,
+            descending=descending,
+            with_categories=with_categories,
+        )
 
     async def get_user(self, email: str) -> UserEntity:
         """Retrieve a user by their ID."""
@@ -77,6 +101,79 @@ class UserService:
         created_entity = await self.repo.create(entity)
         return created_entity, password
 
+    async def create_users_bulk(
+        self,
+        rows: list[dict],
+    ) -> tuple[list[tuple[UserEntity, str]], list[dict]]:
+        """Creation of many users at once by an admin (onboarding).
+
+        Rows are validated individually, existing emails are looked up with a single
+        query, passwords are generated and hashed in parallel, and all valid users are
+        inserted in one batch. Invalid rows are reported without failing the others.
+
+        Args:
+            rows: Raw user rows with the fields of `UserCreateRequest`.
+
+        Returns:
+            A tuple (created, errors). created holds each new UserEntity along with its
+            raw password, errors holds one {"row", "email", "error"} dict per rejected
+            row (rows are numbered from 1).
+        """
+        errors: list[dict] = []
+        valid: list[tuple[int, UserCreateRequest]] = []
+        seen: set[str] = set()
+
+        for idx, row in enumerate(rows, start=1):
+            email = row.get("email") if isinstance(row, dict) else None
+            try:
+                req = UserCreateRequest.model_validate(row)
+            except ValidationError as e:
+                errors.append({"row": idx, "email": email, "error": str(e)})
+                continue
+
+            if req.email in seen:
+                error = "Duplicate email in request"
+                errors.append({"row": idx, "email": req.email, "error": error})
+                continue
+
+            seen.add(req.email)
+            valid.append((idx, req))
+
+        existing = await self.repo.get_existing_emails([req.email for _, req in valid])
+        pending: list[tuple[int, UserCreateRequest]] = []
+        for idx, req in valid:
+            if req.email in existing:
+                error = str(UserAlreadyExistsError(req.email))
+                errors.append({"row": idx, "email": req.email, "error": error})
+            else:
+                pending.append((idx, req))
+
+        passwords = [req.password or secrets.token_urlsafe(12) for _, req in pending]
+        hashes = await hash_passwords(passwords)
+        entities = [
+            UserEntity(
+                email=req.email,
+                first_name=req.first_name,
+                last_name=req.last_name,
+                hashed_password=hashed,
+                role=req.role,
+            )
+            for (_, req), hashed in zip(pending, hashes, strict=True)
+        ]
+
+        inserted = {user.email for user in await self.repo.create_many(entities)}
+        created: list[tuple[UserEntity, str]] = []
+        for (idx, req), entity, password in zip(pending, entities, passwords, strict=True):
+            if entity.email in inserted:
+                created.append((entity, password))
+            else:
+                # Created concurrently since the existence check
+                error = str(UserAlreadyExistsError(req.email))
+                errors.append({"row": idx, "email": req.email, "error": error})
+
+        errors.sort(key=lambda error: error["row"])
+        return created, errors
+
     async def delete_user(self, email: str) -> None:
         """Delete a user by their email address."""
         await self.repo.delete(email)
@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from statistics import quantiles
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from app.core.config import config
+
+
+class PoolWaitStats:
+    """Statistics about how long checkouts wait for a pooled connection.
+
+    The wait includes queueing for a free connection, opening a new one when the pool
+    can grow, and the pre-ping if enabled.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        """Initializes the statistics, keeping the last `window` waits for percentiles."""
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits: deque[float] = deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        """Records the wait of a checkout, in seconds."""
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def as_dict(self) -> dict:
+        """Returns the statistics with durations in milliseconds."""
+        recent = sorted(self.recent_waits)
+        p50 = p95 = p99 = 0.0
+        if len(recent) > 1:
+            cuts = quantiles(recent, n=100, method="inclusive")
+            p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+        elif recent:
+            p50 = p95 = p99 = recent[0]
+
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "recent_p50_wait_ms": p50 * 1000,
+            "recent_p95_wait_ms": p95 * 1000,
+            "recent_p99_wait_ms": p99 * 1000,
+        }
+
+
+class MonitoredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool recording checkout waits in `wait_stats`."""
+
+    def __init__(self, *args: object, **kwargs: object) -> None:
+        """Initializes the pool with empty wait statistics."""
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        """Checks out a connection, timing how long it takes."""
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.wait_stats.timeouts += 1
+            raise
+        finally:
+            self.wait_stats.record(time.perf_counter() - start)
+
+    def recreate(self) -> "MonitoredAsyncQueuePool":
+        """Recreates the pool, carrying over the wait statistics."""
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+def create_engine_from_config(database_url: str | None = None) -> AsyncEngine:
+    """Creates the async engine with the pool and driver settings from the config.
+
+    Args:
+        database_url: The database URL. If None, use `config.database_url`.
+
+    Returns:
+        The configured AsyncEngine, pooled with a MonitoredAsyncQueuePool.
+    """
+    return create_async_engine(
+        database_url or config.database_url,
+        echo=config.db_echo,
+        poolclass=MonitoredAsyncQueuePool,
+        pool_size=config.db_pool_size,
+        max_overflow=config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+        pool_recycle=config.db_pool_recycle,
+        pool_pre_ping=config.db_pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": config.db_statement_cache_size},
+    )
+
+
+def get_pool_status(engine: AsyncEngine) -> dict:
+    """Returns the live state of the engine's connection pool.
+
+    Args:
+        engine: The engine whose pool is inspected.
+
+    Returns:
+        A dict with the pool configuration, the number of checked out, idle and
+        overflow connections, and the checkout wait statistics when available.
+    """
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            {
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,  # noqa: SLF001
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                # Negative while the pool has not yet opened `pool_size` connections
+                "overflow": max(pool.overflow(), 0),
+                "timeout_s": pool.timeout(),
+            },
+        )
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        status["waits"] = wait_stats.as_dict()
+
+    return status
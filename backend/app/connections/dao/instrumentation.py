@@ -0,0 +1,201 @@
+import hashlib
+import re
+import time
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.connections.dao.slow_queries import SLOW_QUERIES
+from app.core.config import config
+from app.core.metrics import (
+    DB_LATENCY_BUCKETS,
+    REGISTRY,
+    CallbackCounter,
+    CallbackGauge,
+    Histogram,
+    Labels,
+)
+from app.core.profiling import record_db_time
+
+STATEMENT_LABEL_LENGTH = 200
+FINGERPRINT_CACHE_SIZE = 2048
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"\$\d+(?:::\w+)*|%\(\w+\)s")
+_PARAM_LIST = re.compile(r"\(\?(?:, \?)+\)")
+_REPEATED_ROWS = re.compile(r"(\([^()]*\))(?:, \1)+")
+
+# Raw statement -> (fingerprint, normalized statement)
+_fingerprints: dict[str, tuple[str, str]] = {}
+
+# Instrumented engines by pool label, read when the pool metrics are scraped
+_engines: dict[str, AsyncEngine] = {}
+
+DB_STATEMENT_DURATION = REGISTRY.register(
+    Histogram(
+        "db_statement_duration_seconds",
+        "SQL statement execution time by statement fingerprint.",
+        ("pool", "fingerprint", "statement"),
+        buckets=DB_LATENCY_BUCKETS,
+    ),
+)
+
+
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """Groups statements that only differ by their parameters.
+
+    Literals and bind parameters are replaced by `?`, and parameter lists or
+    multi-row VALUES of any length are collapsed to a single occurrence, so that
+    e.g. `IN ($1, $2)` and `IN ($1, $2, $3)` share the same fingerprint.
+
+    Args:
+        statement: The SQL statement as sent to the driver.
+
+    Returns:
+        A tuple (fingerprint, normalized statement), the fingerprint being a short
+        hash of the normalized statement.
+    """
+    cached = _fingerprints.get(statement)
+    if cached is not None:
+        return cached
+
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PARAM_LIST.sub("(?, ...)", normalized)
+    normalized = _REPEATED_ROWS.sub(r"\1, ...", normalized)
+
+    fingerprint = hashlib.sha1(normalized.encode(), usedforsecurity=False).hexdigest()[:12]
+    if len(_fingerprints) >= FINGERPRINT_CACHE_SIZE:
+        _fingerprints.clear()
+    _fingerprints[statement] = (fingerprint, normalized)
+    return fingerprint, normalized
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """Records the statement timings, slow statements and pool statistics of an engine.
+
+    Timings are taken around the driver call of each statement, so they exclude the
+    pool checkout (reported separately by the pool metrics) and the ORM processing.
+
+    Args:
+        engine: The engine to instrument.
+        name: The `pool` label of its metrics (e.g. primary or replica).
+    """
+    _engines[name] = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: Connection, *_: object) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Connection,
+        _cursor: object,
+        statement: str,
+        parameters: object,
+        _context: object,
+        executemany: bool,  # noqa: FBT001
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        record_db_time(elapsed)
+        fingerprint, normalized = fingerprint_statement(statement)
+        DB_STATEMENT_DURATION.observe(
+            elapsed,
+            (name, fingerprint, normalized[:STATEMENT_LABEL_LENGTH]),
+        )
+
+        threshold_ms = config.slow_query_threshold_ms
+        if threshold_ms is not None and elapsed * 1000 >= threshold_ms:
+            SLOW_QUERIES.record(
+                engine,
+                name,
+                statement,
+                parameters,
+                elapsed=elapsed,
+                fingerprint=fingerprint,
+                executemany=executemany,
+            )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context: ExceptionContext) -> None:
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+def _pool_metric(read: Callable[[Pool], float]) -> Callable[[], dict[Labels, float]]:
+    """Builds a scrape callback reading a value from the pool of each instrumented engine."""
+
+    def callback() -> dict[Labels, float]:
+        return {
+            (name,): read(engine.pool)
+            for name, engine in _engines.items()
+            if isinstance(engine.pool, AsyncAdaptedQueuePool)
+        }
+
+    return callback
+
+
+def _wait_stat(attribute: str) -> Callable[[Pool], float]:
+    """Builds a reader of one of the checkout wait statistics of a pool."""
+
+    def read(pool: Pool) -> float:
+        wait_stats = getattr(pool, "wait_stats", None)
+        return getattr(wait_stats, attribute) if wait_stats is not None else 0.0
+
+    return read
+
+
+for _metric in (
+    CallbackGauge(
+        "db_pool_size",
+        "Configured number of persistent connections.",
+        _pool_metric(lambda pool: pool.size()),
+        ("pool",),
+    ),
+    CallbackGauge(
+        "db_pool_checked_out",
+        "Connections currently checked out of the pool.",
+        _pool_metric(lambda pool: pool.checkedout()),
+        ("pool",),
+    ),
+    CallbackGauge(
+        "db_pool_idle",
+        "Idle connections in the pool.",
+        _pool_metric(lambda pool: pool.checkedin()),
+        ("pool",),
+    ),
+    CallbackGauge(
+        "db_pool_overflow",
+        "Connections opened beyond the pool size.",
+        _pool_metric(lambda pool: max(pool.overflow(), 0)),
+        ("pool",),
+    ),
+    CallbackCounter(
+        "db_pool_checkouts_total",
+        "Connection checkouts.",
+        _pool_metric(_wait_stat("checkouts")),
+        ("pool",),
+    ),
+    CallbackCounter(
+        "db_pool_checkout_timeouts_total",
+        "Checkouts that timed out waiting for a connection.",
+        _pool_metric(_wait_stat("timeouts")),
+        ("pool",),
+    ),
+    CallbackCounter(
+        "db_pool_checkout_wait_seconds_total",
+        "Total time spent waiting for a connection.",
+        _pool_metric(_wait_stat("total_wait")),
+        ("pool",),
+    ),
+):
+    REGISTRY.register(_metric)
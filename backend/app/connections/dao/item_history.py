@@ -0,0 +1,243 @@
+"""Recording of the item history (`item_events`).
+
+Every item write records an event: who made the change (from the access token of
+the request, if any), which request, when, and the values it set. The Postgres
+repository writes it either:
+- in the transaction of the change (the default), so the history is exactly the
+  committed changes, at the cost of one more INSERT per write;
+- through the `ItemHistoryWriter` write-behind queue (`config.item_history_write_behind`),
+  which buffers the events of committed changes and inserts them in batches in the
+  background. Writes then pay nothing for the history, but the events still buffered
+  are lost if the worker dies, and the history lags behind by up to the flush interval.
+
+The state of the items at a past date is rebuilt by replaying the events recorded
+since the latest snapshot of the items taken before that date (`replay_item_events`).
+Snapshots are taken periodically, so a past query replays at most the events of one
+snapshot interval, whatever the age of the history.
+"""
+
+import asyncio
+import contextlib
+import dataclasses
+import time
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.business.entities.item_entity import ItemEntity
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.connections.dao.postgre_dao import ItemEventModel
+from app.core.log import logger, request_id_var
+from app.core.metrics import REGISTRY, CallbackGauge, Counter, Histogram
+from app.core.notifications import NotificationHub
+from app.core.security import get_request_actor
+from app.core.timing import get_current_time
+
+HISTORY_EVENTS = REGISTRY.register(
+    Counter(
+        "item_history_events_total",
+        "Item history events recorded, written or dropped by the write-behind queue.",
+        ("outcome",),
+    ),
+)
+HISTORY_FLUSH_DURATION = REGISTRY.register(
+    Histogram(
+        "item_history_flush_duration_seconds",
+        "Duration of the batched inserts of the item history write-behind queue.",
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+    ),
+)
+
+
+def _jsonable(value: object) -> object:
+    """Converts a field value to a JSON-compatible value."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _decode_changes(changes: dict) -> dict:
+    """Converts the values of an event back to item field values."""
+    if isinstance(changes.get("created_at"), str):
+        return {**changes, "created_at": datetime.fromisoformat(changes["created_at"])}
+    return changes
+
+
+def replay_item_events(items: dict[UUID, ItemEntity], events: list[ItemEventEntity]) -> None:
+    """Applies events, in the order they occurred, to the state of items (updated in place).
+
+    Updates of items missing from the state (created before their history was
+    recorded, and not in the snapshot the state comes from) are ignored.
+
+    Args:
+        items: The items by ID, e.g. as stored in a snapshot.
+        events: The events recorded after that state, ordered by date then ID. The IDs
+            alone do not give the order of the changes with the write-behind queue:
+            they are drawn when each worker flushes its batch.
+    """
+    for event in events:
+        if event.event_type == "created":
+            items[event.item_id] = ItemEntity(id=event.item_id, **_decode_changes(event.changes))
+        elif event.event_type == "deleted":
+            items.pop(event.item_id, None)
+        elif event.item_id in items:
+            items[event.item_id] = dataclasses.replace(
+                items[event.item_id],
+                **_decode_changes(event.changes),
+            )
+
+
+def item_snapshot(item: ItemEntity) -> dict:
+    """Returns the stored fields of an item (without its ID), as JSON-compatible values."""
+    return {
+        field.name: _jsonable(getattr(item, field.name))
+        for field in dataclasses.fields(item)
+        if field.name not in {"id", "owner_details"}
+    }
+
+
+def new_item_event(item_id: UUID, event_type: str, changes: dict | None = None) -> ItemEventEntity:
+    """Builds the event of a change of an item made by the current request.
+
+    Args:
+        item_id: The ID of the changed item.
+        event_type: "created", "updated" or "deleted".
+        changes: The values set by the change, by field name.
+    """
+    return ItemEventEntity(
+        id=None,
+        item_id=item_id,
+        event_type=event_type,
+        changes={key: _jsonable(value) for key, value in (changes or {}).items()},
+        actor=get_request_actor(),
+        request_id=request_id_var.get(),
+        occurred_at=get_current_time(),
+    )
+
+
+def event_values(event: ItemEventEntity) -> dict:
+    """Returns the column values of an event to insert (its ID is generated)."""
+    return {
+        "item_id": event.item_id,
+        "event_type": event.event_type,
+        "changes": event.changes,
+        "actor": event.actor,
+        "request_id": event.request_id,
+        "occurred_at": event.occurred_at,
+    }
+
+
+def publish_item_event(
+    hub: NotificationHub,
+    event: ItemEventEntity,
+    recipients: list[str],
+) -> None:
+    """Publishes an item event to the users it concerns.
+
+    Used by the memory backend: the notification is the payload the database trigger
+    on item_events sends in the Postgres backend.
+    """
+    notification = {
+        "kind": "item",
+        "id": event.id,
+        "item_id": str(event.item_id),
+        "event_type": event.event_type,
+        "fields": list(event.changes),
+        "actor": event.actor,
+        "occurred_at": event.occurred_at.isoformat(),
+    }
+    hub.publish(notification, recipients)
+
+
+class ItemHistoryWriter:
+    """Write-behind queue inserting item events in batches.
+
+    Events are buffered in memory and inserted with one multi-row INSERT when
+    `batch_size` events are waiting or every `flush_interval` seconds. A failed batch
+    is kept for the next flush, up to `max_buffered` events: beyond that, the oldest
+    events are dropped (and counted) rather than letting the buffer grow unbounded
+    while the database is down.
+    """
+
+    def __init__(
+        self,
+        session_local: sessionmaker[AsyncSession],
+        *,
+        batch_size: int,
+        flush_interval: float,
+        max_buffered: int,
+    ) -> None:
+        """Initializes the writer, started with `start`."""
+        self.session = session_local
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._buffer: list[dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        REGISTRY.register(
+            CallbackGauge(
+                "item_history_buffered_events",
+                "Item history events waiting in the write-behind queue.",
+                lambda: {(): len(self._buffer)},
+            ),
+        )
+
+    def start(self) -> None:
+        """Starts flushing in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops the background flushes, then flushes the remaining events."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, event: ItemEventEntity) -> None:
+        """Buffers an event, waking the writer up when a batch is full."""
+        self._buffer.append(event_values(event))
+        HISTORY_EVENTS.inc(1, ("buffered",))
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Inserts the buffered events, in batches of at most `batch_size`."""
+        while self._buffer:
+            batch = self._buffer[: self.batch_size]
+            del self._buffer[: self.batch_size]
+            start = time.perf_counter()
+            try:
+                async with self.session() as session:
+                    await session.execute(insert(ItemEventModel), batch)
+                    await session.commit()
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"Failed to write {len(batch)} item history events: {e}")
+                self._requeue(batch)
+                return
+            HISTORY_FLUSH_DURATION.observe(time.perf_counter() - start)
+            HISTORY_EVENTS.inc(len(batch), ("written",))
+
+    def _requeue(self, batch: list[dict]) -> None:
+        """Puts a failed batch back in front of the buffer, dropping the overflow."""
+        self._buffer[:0] = batch
+        overflow = len(self._buffer) - self.max_buffered
+        if overflow > 0:
+            del self._buffer[:overflow]
+            HISTORY_EVENTS.inc(overflow, ("dropped",))
+            logger.error(f"Dropped {overflow} item history events, the buffer is full")
+
+    async def _run(self) -> None:
+        """Flushes when a batch is full or the flush interval elapsed."""
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
@@ -0,0 +1,394 @@
+"""In-memory storage backing the memory repositories (`config.repository_backend`).
+
+The tables are dictionaries keyed by primary key, holding entities. Secondary
+indexes are kept up to date on every write:
+- user emails in sorted order, for the paginated user listings;
+- items by owner, for the per-user item counts and the owner checks on deletion;
+- items by category and by serial number (any of the three), for lookups;
+- refresh tokens by hash;
+- open tickets, in creation order, overall and by approver (the pending queues).
+
+Every change of the items is numbered, as by the trigger of the Postgres schema: the
+changes are logged in number order, with the current number of each item and the
+tombstones of the deleted ones, so the changes after a number are found by bisection.
+
+The item history is a list of events in recording order (so also in time order),
+with the positions of the events of each item, and snapshots of the items table.
+
+Data lives in the worker process and is lost on restart: this backend serves
+benchmarks of the service and API layers without database latency, tests without a
+live database, and demo deployments. Writes never await, so each repository call is
+atomic with respect to the event loop.
+"""
+
+import bisect
+import dataclasses
+from collections import defaultdict
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from app.business.entities.item_entity import ItemEntity
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.business.entities.item_snapshot_entity import ItemSnapshotEntity
+from app.business.entities.refresh_token_entity import RefreshTokenEntity
+from app.business.entities.ticket_entity import TicketEntity, TicketStatus
+from app.business.entities.user_entity import UserEntity
+from app.core.timing import get_current_time
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+# Item fields stored in NOT NULL columns in the Postgres schema
+ITEM_REQUIRED_FIELDS = ("id", "name", "category", "serial_number_1", "status", "created_at")
+
+
+class IntegrityViolationError(ValueError):
+    """Raised when a write would break a constraint of the tables (nothing is stored).
+
+    field names the field at fault, when the constraint is on one.
+    """
+
+    def __init__(self, message: str, field: str | None = None) -> None:
+        """Initializes the error with its message and the field at fault."""
+        super().__init__(message)
+        self.field = field
+
+
+class NotNullViolationError(IntegrityViolationError):
+    """Raised when a write would leave a required field empty.
+
+    Mirrors the NOT NULL columns of the Postgres schema (`ITEM_REQUIRED_FIELDS`).
+    """
+
+
+class ForeignKeyViolationError(IntegrityViolationError):
+    """Raised when a write would break a reference between tables.
+
+    Mirrors the foreign keys of the Postgres schema to users.email (items.owner,
+    refresh_tokens.user_email and the users of the tickets) and items.id (tickets.item_id).
+    """
+
+
+class MemoryDatabase:
+    """Tables and secondary indexes of the in-memory backend."""
+
+    def __init__(self) -> None:
+        """Initializes empty tables and indexes."""
+        self.users: dict[str, UserEntity] = {}
+        self.items: dict[UUID, ItemEntity] = {}
+        self.refresh_tokens: dict[UUID, RefreshTokenEntity] = {}
+        self.item_events: list[ItemEventEntity] = []  # event N is at position N - 1
+        self.item_snapshots: list[tuple[ItemSnapshotEntity, dict[UUID, ItemEntity]]] = []
+        self.last_snapshot_id = 0
+        # Called with each new item event and the users it concerns, as the database
+        # notifies the item events in the Postgres backend
+        self.item_event_listeners: list[Callable[[ItemEventEntity, list[str]], None]] = []
+        self.last_change_seq = 0
+        # The change numbers restart with each database, so the cursors of the changes
+        # feed from a previous one (before a restart) are told apart by its start time
+        self.item_changes_epoch = int(get_current_time().timestamp() * 1000)
+        self.tickets: dict[UUID, TicketEntity] = {}
+        # Called with each new or decided ticket and the users it concerns, as the
+        # database notifies them in the Postgres backend
+        self.ticket_listeners: list[Callable[[TicketEntity, list[str]], None]] = []
+        self.item_tombstones: dict[UUID, tuple[int, datetime]] = {}  # change number, date
+
+        self.sorted_emails: list[str] = []
+        self.items_by_owner: defaultdict[str, set[UUID]] = defaultdict(set)
+        self.items_by_category: defaultdict[str, set[UUID]] = defaultdict(set)
+        self.items_by_serial: defaultdict[str, set[UUID]] = defaultdict(set)
+        self.refresh_tokens_by_hash: dict[str, UUID] = {}
+        self.item_events_by_item: defaultdict[UUID, list[int]] = defaultdict(list)
+        self.item_change_seqs: dict[UUID, int] = {}
+        # (change number, item ID) in number order, including the numbers since replaced
+        self.item_changes: list[tuple[int, UUID]] = []
+        # Open ticket IDs in creation order (dictionaries without values, as ordered sets)
+        self.open_tickets: dict[UUID, None] = {}
+        self.open_tickets_by_approver: defaultdict[str | None, dict[UUID, None]]
+        self.open_tickets_by_approver = defaultdict(dict)
+        self.tickets_by_item: defaultdict[UUID, set[UUID]] = defaultdict(set)
+
+    # Items
+
+    def put_item(self, item: ItemEntity) -> None:
+        """Inserts or replaces an item, updating the indexes.
+
+        Raises:
+            NotNullViolationError: If a required field of the item is None.
+            ForeignKeyViolationError: If the owner of the item is not a user.
+        """
+        for field in ITEM_REQUIRED_FIELDS:
+            if getattr(item, field) is None:
+                msg = f"Field {field} of item {item.id} is required"
+                raise NotNullViolationError(msg, field=field)
+        if item.owner is not None and item.owner not in self.users:
+            msg = f"Owner {item.owner} of item {item.id} is not a user"
+            raise ForeignKeyViolationError(msg, field="owner")
+
+        previous = self.items.get(item.id)
+        if previous is not None:
+            self._unindex_item(previous)
+        self.items[item.id] = item
+        self._index_item(item)
+        if item != previous:
+            self._record_item_change(item.id, deleted=False)
+
+    def pop_item(self, item_id: UUID) -> ItemEntity | None:
+        """Removes an item and its index entries, returning it if it existed."""
+        item = self.items.pop(item_id, None)
+        if item is not None:
+            self._unindex_item(item)
+            self._record_item_change(item_id, deleted=True)
+            # tickets.item_id is ON DELETE CASCADE
+            for ticket_id in list(self.tickets_by_item.get(item_id, ())):
+                self.pop_ticket(ticket_id)
+        return item
+
+    def is_current_change(self, seq: int, item_id: UUID) -> bool:
+        """Tells whether a logged change is the latest of its item (or its deletion)."""
+        if self.item_change_seqs.get(item_id) == seq:
+            return True
+        tombstone = self.item_tombstones.get(item_id)
+        return tombstone is not None and tombstone[0] == seq
+
+    def purge_item_tombstones(self, before: datetime) -> int:
+        """Forgets the items deleted before a date, returning how many."""
+        purged = [
+            item_id
+            for item_id, (_, deleted_at) in self.item_tombstones.items()
+            if deleted_at < before
+        ]
+        for item_id in purged:
+            del self.item_tombstones[item_id]
+        self._compact_item_changes()
+        return len(purged)
+
+    def _record_item_change(self, item_id: UUID, *, deleted: bool) -> None:
+        """Numbers a change of an item, replacing its previous number or tombstone."""
+        self.last_change_seq += 1
+        seq = self.last_change_seq
+        if deleted:
+            del self.item_change_seqs[item_id]
+            self.item_tombstones[item_id] = (seq, get_current_time())
+        else:
+            self.item_tombstones.pop(item_id, None)
+            self.item_change_seqs[item_id] = seq
+        self.item_changes.append((seq, item_id))
+        self._compact_item_changes()
+
+    def _compact_item_changes(self) -> None:
+        """Drops the replaced changes from the log once they are the majority of it."""
+        current = len(self.item_change_seqs) + len(self.item_tombstones)
+        if len(self.item_changes) > 2 * current + 1000:
+            self.item_changes = [
+                (seq, item_id)
+                for seq, item_id in self.item_changes
+                if self.is_current_change(seq, item_id)
+            ]
+
+    def items_with_serial(self, serial_number: str) -> list[ItemEntity]:
+        """Returns the items having this serial number in any of their serial fields."""
+        return [self.items[item_id] for item_id in self.items_by_serial.get(serial_number, ())]
+
+    def append_item_event(self, event: ItemEventEntity) -> None:
+        """Appends an event to the item history, numbering it."""
+        position = len(self.item_events)
+        stored = dataclasses.replace(event, id=position + 1)
+        self.item_events.append(stored)
+        self.item_events_by_item[event.item_id].append(position)
+
+        if self.item_event_listeners:
+            recipients = self._item_event_recipients(stored)
+            for listener in self.item_event_listeners:
+                listener(stored, recipients)
+
+    def _item_event_recipients(self, event: ItemEventEntity) -> list[str]:
+        """Returns the users concerned by an item event, as the Postgres trigger does.
+
+        They are the current owner of the item, and the previous one when the event
+        changes the owner.
+        """
+        item = self.items.get(event.item_id)
+        recipients = [item.owner if item is not None else event.changes.get("owner")]
+        if "owner" in event.changes:
+            positions = self.item_events_by_item[event.item_id]
+            for position in reversed(positions[:-1]):
+                changes = self.item_events[position].changes
+                if "owner" in changes:
+                    recipients.append(changes["owner"])
+                    break
+        return [user for user in recipients if user is not None]
+
+    def take_item_snapshot(self) -> ItemSnapshotEntity:
+        """Copies the items table into a new snapshot, including every event so far."""
+        now = get_current_time()
+        self.last_snapshot_id += 1
+        snapshot = ItemSnapshotEntity(
+            id=self.last_snapshot_id,
+            taken_at=now,
+            settled_at=now,
+            last_event_id=len(self.item_events),
+            item_count=len(self.items),
+        )
+        # Stored items are replaced on update, never changed in place: a shallow copy holds
+        self.item_snapshots.append((snapshot, dict(self.items)))
+        return snapshot
+
+    def purge_item_snapshots(self, before: datetime) -> int:
+        """Thins out the snapshots taken before the latest one taken before a date.
+
+        The first snapshot of each month (UTC) is kept. Returns how many were deleted.
+        """
+        snapshots = self.item_snapshots
+        kept = bisect.bisect_right(snapshots, before, key=lambda entry: entry[0].taken_at) - 1
+        if kept <= 0:
+            return 0
+        months = set()
+        first_of_month = []
+        for entry in snapshots[:kept]:
+            taken_at = entry[0].taken_at.astimezone(UTC)
+            if (taken_at.year, taken_at.month) not in months:
+                months.add((taken_at.year, taken_at.month))
+                first_of_month.append(entry)
+        snapshots[:kept] = first_of_month
+        return kept - len(first_of_month)
+
+    def _index_item(self, item: ItemEntity) -> None:
+        """Adds an item to the secondary indexes."""
+        if item.owner is not None:
+            self.items_by_owner[item.owner].add(item.id)
+        self.items_by_category[item.category].add(item.id)
+        for serial in self._serials(item):
+            self.items_by_serial[serial].add(item.id)
+
+    def _unindex_item(self, item: ItemEntity) -> None:
+        """Removes an item from the secondary indexes, dropping emptied keys."""
+        entries = [(self.items_by_category, item.category)]
+        if item.owner is not None:
+            entries.append((self.items_by_owner, item.owner))
+        entries.extend((self.items_by_serial, serial) for serial in self._serials(item))
+        for index, key in entries:
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(item.id)
+                if not ids:
+                    del index[key]
+
+    @staticmethod
+    def _serials(item: ItemEntity) -> set[str]:
+        """Returns the serial numbers of an item."""
+        serials = {item.serial_number_1, item.serial_number_2, item.serial_number_3}
+        serials.discard(None)
+        return serials
+
+    # Users
+
+    def put_user(self, user: UserEntity) -> None:
+        """Inserts or replaces a user, updating the email order."""
+        if user.email not in self.users:
+            bisect.insort(self.sorted_emails, user.email)
+        self.users[user.email] = user
+
+    def pop_user(self, email: str) -> UserEntity | None:
+        """Removes a user and their refresh tokens, returning the user if it existed.
+
+        Raises:
+            ForeignKeyViolationError: If the user still owns items.
+        """
+        if self.items_by_owner.get(email):
+            msg = f"User {email} still owns items"
+            raise ForeignKeyViolationError(msg)
+
+        user = self.users.pop(email, None)
+        if user is not None:
+            del self.sorted_emails[bisect.bisect_left(self.sorted_emails, email)]
+            # refresh_tokens.user_email is ON DELETE CASCADE
+            for token in [t for t in self.refresh_tokens.values() if t.user_email == email]:
+                self.pop_refresh_token(token.id)
+            # tickets.requester is ON DELETE CASCADE, tickets.approver ON DELETE SET NULL
+            for ticket in list(self.tickets.values()):
+                if ticket.requester == email:
+                    self.pop_ticket(ticket.id)
+                elif ticket.approver == email:
+                    unassigned = dataclasses.replace(ticket, approver=None)
+                    self._unindex_ticket(ticket)
+                    self.tickets[ticket.id] = unassigned
+                    self._index_ticket(unassigned)
+        return user
+
+    # Refresh tokens
+
+    def put_refresh_token(self, token: RefreshTokenEntity) -> None:
+        """Inserts or replaces a refresh token.
+
+        Raises:
+            ForeignKeyViolationError: If the user of the token does not exist.
+        """
+        if token.user_email not in self.users:
+            msg = f"User {token.user_email} of refresh token {token.id} does not exist"
+            raise ForeignKeyViolationError(msg)
+        self.refresh_tokens[token.id] = token
+        self.refresh_tokens_by_hash[token.token_hash] = token.id
+
+    def pop_refresh_token(self, token_id: UUID) -> None:
+        """Removes a refresh token."""
+        token = self.refresh_tokens.pop(token_id, None)
+        if token is not None:
+            self.refresh_tokens_by_hash.pop(token.token_hash, None)
+
+    # Tickets
+
+    def put_ticket(self, ticket: TicketEntity) -> None:
+        """Inserts or replaces a ticket, updating the queues and notifying the listeners.
+
+        Raises:
+            ForeignKeyViolationError: If the item or a user of the ticket does not exist.
+        """
+        if ticket.item_id not in self.items:
+            msg = f"Item {ticket.item_id} of ticket {ticket.id} does not exist"
+            raise ForeignKeyViolationError(msg)
+        for user in (ticket.requester, ticket.approver):
+            if user is not None and user not in self.users:
+                msg = f"User {user} of ticket {ticket.id} does not exist"
+                raise ForeignKeyViolationError(msg)
+
+        previous = self.tickets.get(ticket.id)
+        if previous is not None:
+            self._unindex_ticket(previous)
+        self.tickets[ticket.id] = ticket
+        self._index_ticket(ticket)
+
+        if self.ticket_listeners:
+            owner = self.items[ticket.item_id].owner
+            recipients = [u for u in (ticket.requester, ticket.approver, owner) if u is not None]
+            for listener in self.ticket_listeners:
+                listener(ticket, recipients)
+
+    def pop_ticket(self, ticket_id: UUID) -> None:
+        """Removes a ticket and its queue entries."""
+        ticket = self.tickets.pop(ticket_id, None)
+        if ticket is not None:
+            self._unindex_ticket(ticket)
+
+    def _index_ticket(self, ticket: TicketEntity) -> None:
+        """Adds a ticket to the queues if open, and to the tickets of its item."""
+        self.tickets_by_item[ticket.item_id].add(ticket.id)
+        if ticket.status == TicketStatus.OPEN:
+            self.open_tickets[ticket.id] = None
+            self.open_tickets_by_approver[ticket.approver][ticket.id] = None
+
+    def _unindex_ticket(self, ticket: TicketEntity) -> None:
+        """Removes a ticket from the queues and the tickets of its item."""
+        self.open_tickets.pop(ticket.id, None)
+        queue = self.open_tickets_by_approver.get(ticket.approver)
+        if queue is not None:
+            queue.pop(ticket.id, None)
+            if not queue:
+                del self.open_tickets_by_approver[ticket.approver]
+        ids = self.tickets_by_item.get(ticket.item_id)
+        if ids is not None:
+            ids.discard(ticket.id)
+            if not ids:
+                del self.tickets_by_item[ticket.item_id]
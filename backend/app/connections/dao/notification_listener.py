@@ -0,0 +1,88 @@
+"""The database listener of a worker, feeding its notification hub.
+
+Each worker holds one asyncpg connection, outside of the pool, listening on the
+notifications channel (`NOTIFICATIONS_CHANNEL`), whatever the number of clients
+streaming notifications. When the connection is lost, it is reopened with a growing
+delay, and every client is asked to resync, as notifications sent meanwhile are lost.
+"""
+
+import asyncio
+import contextlib
+import json
+
+import asyncpg
+from sqlalchemy import make_url
+
+from app.connections.dao.postgre_dao import NOTIFICATIONS_CHANNEL
+from app.core.log import logger
+from app.core.notifications import NotificationHub
+
+# Time between checks that the connection is still alive
+PING_INTERVAL_SECONDS = 30.0
+MAX_RECONNECT_DELAY_SECONDS = 30.0
+
+
+class NotificationListener:
+    """Listens to the database notifications and publishes them to a hub."""
+
+    def __init__(self, database_url: str, hub: NotificationHub) -> None:
+        """Initializes the listener, started with `start`."""
+        url = make_url(database_url).set(drivername="postgresql")
+        self.dsn = url.render_as_string(hide_password=False)
+        self.hub = hub
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Starts listening in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stops listening and closes the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _on_notification(
+        self,
+        _connection: asyncpg.Connection,
+        _pid: int,
+        _channel: str,
+        payload: str,
+    ) -> None:
+        """Publishes a notification received from the database."""
+        try:
+            notification = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignored a malformed notification: {payload[:200]}")
+            return
+        recipients = [user for user in notification.pop("recipients", ()) if user is not None]
+        self.hub.publish(notification, recipients)
+
+    async def _run(self) -> None:
+        """Keeps a listening connection open, reconnecting when it is lost."""
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(NOTIFICATIONS_CHANNEL, self._on_notification)
+                if delay > 1.0:
+                    # Notifications may have been sent while disconnected
+                    self.hub.request_resync()
+                self.connected, delay = True, 1.0
+                logger.info(f"Listening to the {NOTIFICATIONS_CHANNEL} channel")
+                while True:
+                    await asyncio.sleep(PING_INTERVAL_SECONDS)
+                    await connection.execute("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"Notification listener lost, retrying in {delay:.0f} s: {e}")
+            finally:
+                self.connected = False
+                if connection is not None:
+                    with contextlib.suppress(Exception):
+                        await connection.close(timeout=2)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
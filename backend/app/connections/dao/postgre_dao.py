@@ -1,11 +1,25 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    FetchedValue,
+    ForeignKey,
+    Identity,
+    Index,
+    Sequence,
+    String,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import declarative_base
 
 from app.core.timing import get_current_time
 
+# The schema is created and changed by the Alembic migrations (migrations/versions/),
+# which also hold what the models cannot express: extensions, functions and triggers
 Base = declarative_base()
 
 
@@ -20,6 +34,27 @@ class UserModel(Base):
     hashed_password = Column(String, nullable=True)
     role = Column(String, nullable=False, default="USER")  # enum enforced in domain
 
+    # Case-insensitive prefix search for the user directory (autocomplete)
+    __table_args__ = (
+        Index(
+            "ix_users_email_lower_prefix",
+            func.lower(email).label("email_lower"),
+            postgresql_ops={"email_lower": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_users_first_name_lower_trgm",
+            func.lower(first_name).label("first_name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"first_name_lower": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_users_last_name_lower_trgm",
+            func.lower(last_name).label("last_name_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"last_name_lower": "gin_trgm_ops"},
+        ),
+    )
+
 
 class ItemModel(Base):
     """SQLAlchemy model for an item."""
@@ -36,6 +71,129 @@ class ItemModel(Base):
     location = Column(String, nullable=True)
     status = Column(String, nullable=False, default="available")
     created_at = Column(DateTime(timezone=True), default=get_current_time, nullable=False)
+    # Set by the track_item_change trigger on every insert and update
+    change_seq = Column(
+        BigInteger,
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=FetchedValue(),
+        server_onupdate=FetchedValue(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        # Per-owner lookups and per-owner/category aggregates
+        Index("ix_items_owner_category", owner, category),
+        # Changes since a cursor (GET /items/changes)
+        Index("ix_items_change_seq", change_seq, unique=True),
+    )
+
+
+class ItemTombstoneModel(Base):
+    """SQLAlchemy model for the trace of a deleted item, kept for the changes feed."""
+
+    __tablename__ = "item_tombstones"
+
+    item_id = Column(UUID(as_uuid=True), primary_key=True)
+    change_seq = Column(BigInteger, nullable=False, unique=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+
+# Every change of the items gets the next number of item_change_seq, so the changes
+# since a cursor are the items and tombstones numbered after it. The number and the
+# change time are set by the track_item_change trigger, which also covers writes
+# outside the application (e.g. the seeder's COPY). Updates leaving the row as it was
+# are not counted.
+ITEM_CHANGE_SEQ = Sequence("item_change_seq", metadata=Base.metadata)
+
+
+class ItemChangesEpochModel(Base):
+    """SQLAlchemy model for a reset of the items (e.g. truncated by the seeder).
+
+    The tables are truncated without firing the triggers, so no tombstone records the
+    items dropped. Each reset starts a new epoch, and the cursors of the changes feed
+    from an earlier one are expired. The current epoch is the latest, 0 before any.
+    """
+
+    __tablename__ = "item_changes_epochs"
+
+    epoch = Column(BigInteger, Identity(), primary_key=True)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ItemEventModel(Base):
+    """SQLAlchemy model for an entry of the item history (append-only)."""
+
+    __tablename__ = "item_events"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    # No foreign key: the history of an item outlives its deletion
+    item_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(String, nullable=False)  # created, updated or deleted
+    changes = Column(JSONB, nullable=False, default=dict)
+    actor = Column(String, nullable=True)
+    request_id = Column(String, nullable=True)
+    occurred_at = Column(DateTime(timezone=True), default=get_current_time, nullable=False)
+
+    # Rows are appended in time order, so a BRIN index (a few pages for millions of
+    # rows) is enough for time ranges, and costs next to nothing to maintain on insert
+    __table_args__ = (
+        Index("ix_item_events_item_id", "item_id", "id"),
+        Index("ix_item_events_occurred_at_brin", occurred_at, postgresql_using="brin"),
+    )
+
+
+# Every item event is announced on the "notifications" channel when committed, to the
+# notification listener of each worker (app/connections/dao/notification_listener.py),
+# by the item_events_notify trigger
+NOTIFICATIONS_CHANNEL = "notifications"  # as in the trigger functions
+
+
+class ItemHistorySnapshotModel(Base):
+    """SQLAlchemy model for a snapshot of all the items, taken to speed up past queries.
+
+    The state of the items at a past date is the latest snapshot taken before it, on
+    which the events of the item history recorded since are replayed.
+    """
+
+    __tablename__ = "item_history_snapshots"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    taken_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # The snapshot includes every event up to last_event_id, and the replay starts at
+    # the events that occurred after settled_at (see ItemPostgreRepository.take_snapshot)
+    settled_at = Column(DateTime(timezone=True), nullable=False)
+    last_event_id = Column(BigInteger, nullable=False)
+    item_count = Column(BigInteger, nullable=False, default=0)
+
+
+class ItemSnapshotRowModel(Base):
+    """SQLAlchemy model for the state of an item in a snapshot (columns of items)."""
+
+    __tablename__ = "item_snapshot_rows"
+
+    snapshot_id = Column(
+        BigInteger,
+        ForeignKey("item_history_snapshots.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    name = Column(String, nullable=False)
+    category = Column(String, nullable=False)
+    serial_number_1 = Column(String, nullable=False)
+    serial_number_2 = Column(String, nullable=True)
+    serial_number_3 = Column(String, nullable=True)
+    owner = Column(String, nullable=True)  # no foreign key: users may be deleted since
+    location = Column(String, nullable=True)
+    status = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Past items of an owner
+    __table_args__ = (Index("ix_item_snapshot_rows_owner", "snapshot_id", "owner"),)
 
 
 class RefreshTokenModel(Base):
@@ -50,3 +208,41 @@ class RefreshTokenModel(Base):
     expires_at = Column(DateTime(timezone=True), nullable=False)
     revoked = Column(Boolean, nullable=False, default=False)
     replaced_by = Column(UUID(as_uuid=True), ForeignKey("refresh_tokens.id"), nullable=True)
+
+
+class TicketModel(Base):
+    """SQLAlchemy model for a change ticket of an item.
+
+    Ticket creations and decisions are announced on the notifications channel too, to
+    the requester, the approver and the owner of the item, by the tickets_notify trigger.
+    """
+
+    __tablename__ = "tickets"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    item_id = Column(UUID(as_uuid=True), ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    requester = Column(String, ForeignKey("users.email", ondelete="CASCADE"), nullable=False)
+    # Back to the queue of every manager when the approver is deleted
+    approver = Column(String, ForeignKey("users.email", ondelete="SET NULL"), nullable=True)
+    changes = Column(JSONB, nullable=False)
+    comment = Column(String, nullable=True)
+    status = Column(String, nullable=False, default="open")  # enum enforced in domain
+    created_at = Column(DateTime(timezone=True), default=get_current_time, nullable=False)
+    decided_by = Column(String, nullable=True)  # no foreign key: kept for the audit
+    decided_at = Column(DateTime(timezone=True), nullable=True)
+    decision_comment = Column(String, nullable=True)
+
+    # The pending queues only cover the open tickets, a small and moving part of the
+    # table: partial indexes keep them small, and the decided tickets out of the way
+    __table_args__ = (
+        Index(
+            "ix_tickets_open_approver",
+            approver,
+            created_at,
+            postgresql_where=status == "open",
+        ),
+        Index("ix_tickets_open_created_at", created_at, postgresql_where=status == "open"),
+        # Cascades of the item and user deletions
+        Index("ix_tickets_item_id", item_id),
+        Index("ix_tickets_requester", requester),
+    )
@@ -0,0 +1,42 @@
+from contextvars import ContextVar
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Set once the current request must read from the primary (e.g. after a write)
+_read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
+
+READ_PRIMARY_HEADER = b"x-read-primary"
+
+
+def mark_write() -> None:
+    """Routes the following reads of the current request to the primary.
+
+    Called by repositories before writing, so a request always reads its own writes
+    even when the replica lags behind.
+    """
+    _read_from_primary.set(True)
+
+
+def must_read_from_primary() -> bool:
+    """Returns whether reads of the current request must go to the primary."""
+    return _read_from_primary.get()
+
+
+class ReadRoutingMiddleware:
+    """Routes every read of a request to the primary when it sends `X-Read-Primary`.
+
+    Clients set this header on the requests following one of their writes when
+    they need to read it back (read-your-writes across requests).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initializes the middleware around an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request, flagging it for primary reads if requested."""
+        if scope["type"] == "http" and any(
+            name == READ_PRIMARY_HEADER for name, _ in scope["headers"]
+        ):
+            _read_from_primary.set(True)
+        await self.app(scope, receive, send)
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+class SchemaOutOfDateError(Exception):
+    """Exception raised when the database is not at the latest migration revision."""
+
+    def __init__(self, current: set[str], heads: set[str]) -> None:
+        """Initializes the SchemaOutOfDateError with the current and expected revisions."""
+        super().__init__(
+            f"Database schema is at revision {sorted(current) or 'none'} but migrations "
+            f"are at {sorted(heads)}, run `alembic upgrade head`",
+        )
+        self.current = current
+        self.heads = heads
+
+
+class MigrationsNotFoundError(Exception):
+    """Exception raised when the Alembic migration scripts cannot be found."""
+
+    def __init__(self, path: Path) -> None:
+        """Initializes the MigrationsNotFoundError with the Alembic configuration path."""
+        super().__init__(f"No Alembic migration scripts found from {path}")
+        self.path = path
+
+
+def get_migration_heads() -> set[str]:
+    """Returns the head revisions of the Alembic migration scripts."""
+    # Alembic is only needed for this check, so load it lazily
+    from alembic.config import Config  # noqa: PLC0415
+    from alembic.script import ScriptDirectory  # noqa: PLC0415
+
+    return set(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+async def check_schema(engine: AsyncEngine) -> None:
+    """Verifies the database schema is at the Alembic head revision.
+
+    This only reads the `alembic_version` table, which is much cheaper than
+    reflecting every table on each worker boot. The schema is never created or
+    changed here: run `alembic upgrade head` before starting the workers.
+
+    Raises:
+        MigrationsNotFoundError: If there are no migration scripts (e.g. not deployed).
+        SchemaOutOfDateError: If the database revision differs from the migration head.
+    """
+    from alembic.runtime.migration import MigrationContext  # noqa: PLC0415
+
+    heads = get_migration_heads()
+    if not heads:
+        raise MigrationsNotFoundError(ALEMBIC_INI)
+
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: set(MigrationContext.configure(sync_conn).get_current_heads()),
+        )
+
+    if current != heads:
+        raise SchemaOutOfDateError(current, heads)
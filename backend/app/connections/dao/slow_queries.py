@@ -0,0 +1,177 @@
+"""Slow-query log with optional EXPLAIN capture.
+
+Statements running longer than `config.slow_query_threshold_ms` are logged (with
+their parameters redacted, the calling route and request id) and kept in a ring
+buffer. With `config.slow_query_explain`, the plan of each new slow statement
+fingerprint is captured in the background with `EXPLAIN (ANALYZE off, FORMAT JSON)`,
+which plans the statement without running it.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import config
+from app.core.log import get_request_route, logger, request_id_var
+from app.core.timing import get_current_time
+
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+MAX_SEEN_FINGERPRINTS = 10_000
+
+sql_logger = logger.getChild("sql")
+
+
+def _redact_value(value: object) -> object:
+    """Replaces a parameter value by a description keeping no user data."""
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str | bytes):
+        return f"<{type(value).__name__} len={len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: object, *, executemany: bool = False) -> object:
+    """Redacts the parameters of a statement, as sent to the driver.
+
+    Strings and unknown types are replaced by their type (and length), numbers,
+    booleans and None are kept. For executemany, only the first row is described.
+
+    Args:
+        parameters: The positional (sequence) or named (dict) parameters.
+        executemany: Whether `parameters` holds one set of parameters per row.
+
+    Returns:
+        The redacted parameters, JSON serializable.
+    """
+    if executemany and isinstance(parameters, Sequence) and parameters:
+        return {
+            "rows": len(parameters),
+            "first_row": redact_parameters(parameters[0]),
+        }
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, Sequence) and not isinstance(parameters, str | bytes):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+class SlowQueryLog:
+    """The last slow statements and the plans of the slow statement fingerprints."""
+
+    def __init__(self, max_queries: int, max_plans: int) -> None:
+        """Initializes an empty log keeping at most the given number of entries."""
+        self.queries: deque[dict] = deque(maxlen=max_queries)
+        self.plans: OrderedDict[str, dict] = OrderedDict()
+        self.max_plans = max_plans
+        self._explained: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+
+    def record(
+        self,
+        engine: AsyncEngine,
+        pool: str,
+        statement: str,
+        parameters: object,
+        *,
+        elapsed: float,
+        fingerprint: str,
+        executemany: bool = False,
+    ) -> None:
+        """Records a slow statement, and captures its plan if its fingerprint is new.
+
+        Args:
+            engine: The engine the statement ran on (used for EXPLAIN).
+            pool: The pool label of the engine (e.g. primary or replica).
+            statement: The SQL statement as sent to the driver.
+            parameters: The parameters of the statement, as sent to the driver.
+            elapsed: The execution time in seconds.
+            fingerprint: The fingerprint of the statement.
+            executemany: Whether the statement ran once per parameter set.
+        """
+        entry = {
+            "time": get_current_time().isoformat(),
+            "elapsed_ms": elapsed * 1000,
+            "pool": pool,
+            "fingerprint": fingerprint,
+            "statement": statement,
+            "parameters": redact_parameters(parameters, executemany=executemany),
+            "route": get_request_route(),
+            "request_id": request_id_var.get(),
+        }
+        self.queries.append(entry)
+        sql_logger.warning(
+            f"Slow query ({entry['elapsed_ms']:.0f} ms) {fingerprint}",
+            extra={key: entry[key] for key in ("statement", "parameters", "route", "pool")},
+        )
+
+        if config.slow_query_explain and not executemany:
+            self._schedule_explain(engine, statement, parameters, fingerprint)
+
+    def _schedule_explain(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters: object,
+        fingerprint: str,
+    ) -> None:
+        """Captures the plan of a statement in the background, once per fingerprint."""
+        if fingerprint in self._explained:
+            return
+        if not statement.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if len(self._explained) >= MAX_SEEN_FINGERPRINTS:
+            self._explained.clear()
+        self._explained.add(fingerprint)
+
+        task = loop.create_task(self._explain(engine, statement, parameters, fingerprint))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(
+        self,
+        engine: AsyncEngine,
+        statement: str,
+        parameters: object,
+        fingerprint: str,
+    ) -> None:
+        """Runs EXPLAIN for a statement and stores its plan."""
+        try:
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE off, FORMAT JSON) {statement}",
+                    parameters,
+                )
+                plan = result.scalar_one()
+                await conn.rollback()
+        except Exception as e:  # noqa: BLE001
+            sql_logger.warning(f"EXPLAIN failed for slow query {fingerprint}: {e}")
+            return
+
+        self.plans[fingerprint] = {
+            "fingerprint": fingerprint,
+            "captured_at": get_current_time().isoformat(),
+            "statement": statement,
+            "plan": json.loads(plan) if isinstance(plan, str) else plan,
+        }
+        self.plans.move_to_end(fingerprint)
+        while len(self.plans) > self.max_plans:
+            self.plans.popitem(last=False)
+
+    def as_dict(self) -> dict:
+        """Returns the slow statements and plans, newest first."""
+        return {
+            "threshold_ms": config.slow_query_threshold_ms,
+            "queries": list(reversed(self.queries)),
+            "plans": list(reversed(self.plans.values())),
+        }
+
+
+SLOW_QUERIES = SlowQueryLog(config.slow_query_max_stored, config.slow_query_max_plans)
@@ -0,0 +1,66 @@
+import asyncio
+import uuid
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.connections.dao.postgre_dao import ItemModel
+from app.connections.repositories.item_postgre_repository import (
+    ITEM_COLUMNS,
+    ItemPostgreRepository,
+)
+from app.connections.repositories.refresh_token_postgre_repository import (
+    RefreshTokenPostgreRepository,
+)
+from app.connections.repositories.user_postgre_repository import UserPostgreRepository
+from app.core.log import logger
+
+PING_TIMEOUT_SECONDS = 2.0
+
+
+async def _prepare_hot_statements(conn: AsyncConnection, recent_items: int) -> None:
+    """Runs the hot repository lookups on a connection so their statements get prepared.
+
+    asyncpg prepared statements are cached per connection, so every pooled connection
+    needs its own pass. The lookups are built by the repositories (with keys that match
+    nothing) so the cached SQL text is identical.
+    """
+    async with AsyncSession(bind=conn) as session:
+        await session.execute(ItemPostgreRepository.select_by_id(uuid.UUID(int=0)))
+        await session.execute(UserPostgreRepository.select_by_email(""))
+        await session.execute(RefreshTokenPostgreRepository.select_by_hash(""))
+
+        if recent_items > 0:
+            # Loads the most recently created items into the database buffer cache
+            await session.execute(
+                select(*ITEM_COLUMNS).order_by(ItemModel.created_at.desc()).limit(recent_items),
+            )
+
+
+async def warm_up(engine: AsyncEngine, connections: int, recent_items: int = 0) -> None:
+    """Opens pool connections ahead of traffic and prepares the hot statements on them.
+
+    Args:
+        engine: The engine whose pool is warmed up.
+        connections: Number of connections opened concurrently (and kept in the pool).
+        recent_items: Number of most recent items read to prime the database caches,
+            0 to skip.
+    """
+
+    async def _warm_connection(index: int) -> None:
+        async with engine.connect() as conn:
+            # Only the first connection primes the caches, they are shared server-side
+            await _prepare_hot_statements(conn, recent_items if index == 0 else 0)
+
+    await asyncio.gather(*(_warm_connection(i) for i in range(max(connections, 1))))
+
+
+async def ping_database(engine: AsyncEngine, max_wait: float = PING_TIMEOUT_SECONDS) -> bool:
+    """Returns whether the database answers a trivial query within `max_wait` seconds."""
+    try:
+        async with asyncio.timeout(max_wait), engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Database ping failed: {e}")
+        return False
+    return True
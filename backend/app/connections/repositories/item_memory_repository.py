@@ -0,0 +1,262 @@
+import bisect
+import dataclasses
+import uuid
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from app.business.entities.item_changes_entity import ItemChangesEntity
+from app.business.entities.item_entity import ItemEntity, ItemOwnerEntity
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.business.entities.item_snapshot_entity import ItemSnapshotEntity
+from app.connections.dao.item_history import item_snapshot, new_item_event, replay_item_events
+from app.connections.dao.memory_dao import MemoryDatabase
+from app.core.timing import get_current_time
+from app.exceptions.item_exceptions import ItemNotFoundError
+
+
+class ItemMemoryRepository:
+    """Repository for Item entities, kept in memory.
+
+    Entities are copied in and out of the `MemoryDatabase`, so callers never share
+    (and mutate) the stored ones, as with the Postgres repository.
+    """
+
+    def __init__(self, db: MemoryDatabase) -> None:
+        """Initializes the ItemMemoryRepository with the in-memory tables."""
+        self.db = db
+
+    async def list_items(
+        self,
+        *,
+        expand_owner: bool = False,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves all items, in insertion order (in no order for one owner).
+
+        Args:
+            expand_owner (bool): Flag to embed the owner details.
+            owner (str | None): Only retrieve the items of this owner.
+        """
+        items = self.db.items.values()
+        if owner is not None:
+            items = [self.db.items[item_id] for item_id in self.db.items_by_owner.get(owner, ())]
+        return [self._copy(item, expand_owner=expand_owner) for item in items]
+
+    async def list_items_as_of(
+        self,
+        as_of: datetime,
+        *,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves the items as they were at a past date.
+
+        Args:
+            as_of (datetime): The date, with time zone.
+            owner (str | None): Only retrieve the items this user owned at that date.
+        """
+        items = self._items_as_of(as_of)
+        return [self._copy(item) for item in items.values() if owner is None or item.owner == owner]
+
+    async def get_as_of(self, item_id: UUID, as_of: datetime) -> ItemEntity:
+        """Retrieves an item as it was at a past date.
+
+        Args:
+            item_id (UUID): The ID of the item.
+            as_of (datetime): The date, with time zone.
+
+        Raises:
+            ItemNotFoundError: If the item did not exist at that date.
+        """
+        item = self._items_as_of(as_of, item_id).get(item_id)
+        if item is None:
+            raise ItemNotFoundError(item_id)
+        return self._copy(item)
+
+    async def take_snapshot(
+        self,
+        *,
+        min_interval: timedelta | None = None,
+    ) -> ItemSnapshotEntity | None:
+        """Copies the current state of all the items into a new snapshot.
+
+        Args:
+            min_interval (timedelta | None): Skip the snapshot if the latest one is more
+                recent than this.
+
+        Returns:
+            The new snapshot, or None if skipped.
+        """
+        if min_interval is not None and self.db.item_snapshots:
+            latest, _ = self.db.item_snapshots[-1]
+            if get_current_time() - latest.taken_at < min_interval:
+                return None
+        return self.db.take_item_snapshot()
+
+    async def purge_snapshots(self, before: datetime) -> int:
+        """Thins out the snapshots taken before the latest one taken before a date.
+
+        The first snapshot of each month (UTC) is kept, and the past dates since `before`
+        keep their snapshot. Returns how many were deleted.
+        """
+        return self.db.purge_item_snapshots(before)
+
+    async def list_changes(self, since: int, *, limit: int) -> ItemChangesEntity:
+        """Retrieves the items changed and deleted after a change number, in change order.
+
+        Writes are atomic here, so every change is committed and the cursor can move
+        past all the returned ones.
+
+        Args:
+            since (int): The change number the client is up to date with.
+            limit (int): Maximum number of changes returned.
+        """
+        changes = self.db.item_changes
+        items: list[ItemEntity] = []
+        deleted: list[UUID] = []
+        last_change_seq = since
+        has_more = False
+        first = bisect.bisect_right(changes, since, key=lambda change: change[0])
+        for position in range(first, len(changes)):
+            seq, item_id = changes[position]
+            if not self.db.is_current_change(seq, item_id):
+                continue  # replaced by a later change
+            if len(items) + len(deleted) == limit:
+                has_more = True
+                break
+            if item_id in self.db.items:
+                items.append(self._copy(self.db.items[item_id]))
+            else:
+                deleted.append(item_id)
+            last_change_seq = seq
+        return ItemChangesEntity(
+            items,
+            deleted,
+            last_change_seq,
+            has_more,
+            self.db.item_changes_epoch,
+        )
+
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Forgets the items deleted before a date, returning how many."""
+        return self.db.purge_item_tombstones(before)
+
+    async def get(self, item_id: UUID, *, expand_owner: bool = False) -> ItemEntity:
+        """Retrieves an item by its ID.
+
+        Args:
+            item_id (UUID): The ID of the item to retrieve.
+            expand_owner (bool): Flag to embed the owner details.
+        """
+        item = self.db.items.get(item_id)
+        if item is None:
+            raise ItemNotFoundError(item_id)
+        return self._copy(item, expand_owner=expand_owner)
+
+    async def create(self, item: ItemEntity) -> ItemEntity:
+        """Stores a new item, generating its ID if None."""
+        stored = dataclasses.replace(item, id=item.id or uuid.uuid4(), owner_details=None)
+        self.db.put_item(stored)
+        self.db.append_item_event(new_item_event(stored.id, "created", item_snapshot(stored)))
+        return self._copy(stored)
+
+    async def update(self, item_id: UUID, updates: dict) -> ItemEntity:
+        """Updates fields of an item."""
+        item = self.db.items.get(item_id)
+        if item is None:
+            raise ItemNotFoundError(item_id)
+        updated = dataclasses.replace(item, **updates)
+        self.db.put_item(updated)
+        self.db.append_item_event(new_item_event(item_id, "updated", updates))
+        return self._copy(updated)
+
+    async def delete(self, item_id: UUID) -> None:
+        """Deletes an item."""
+        if self.db.pop_item(item_id) is None:
+            raise ItemNotFoundError(item_id)
+        self.db.append_item_event(new_item_event(item_id, "deleted"))
+
+    async def get_history(
+        self,
+        item_id: UUID,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of an item, oldest first.
+
+        Args:
+            item_id (UUID): The ID of the item, which may have been deleted since.
+            after (int | None): Only return the events recorded after this event ID.
+            limit (int | None): Maximum number of events returned.
+        """
+        positions = self.db.item_events_by_item.get(item_id, [])
+        # Event N is at position N - 1, so the events after N start at position N
+        first = bisect.bisect_left(positions, after or 0)
+        selected = positions[first : first + limit if limit is not None else None]
+        return [self._copy_event(self.db.item_events[position]) for position in selected]
+
+    async def list_events(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of all items that occurred in [start, end), oldest first.
+
+        Args:
+            start (datetime): Start of the time range, included.
+            end (datetime): End of the time range, excluded.
+            after (int | None): Only return the events recorded after this event ID.
+            limit (int | None): Maximum number of events returned.
+        """
+        events = self.db.item_events
+        first = bisect.bisect_left(events, start, key=lambda event: event.occurred_at)
+        last = bisect.bisect_left(events, end, key=lambda event: event.occurred_at)
+        first = max(first, after or 0)
+        if limit is not None:
+            last = min(last, first + limit)
+        return [self._copy_event(event) for event in events[first:last]]
+
+    def _items_as_of(self, as_of: datetime, item_id: UUID | None = None) -> dict[UUID, ItemEntity]:
+        """Replays the events since the latest snapshot before a date, on that snapshot.
+
+        With `item_id`, only that item is rebuilt.
+        """
+        snapshots = self.db.item_snapshots
+        index = bisect.bisect_right(snapshots, as_of, key=lambda entry: entry[0].taken_at)
+        items: dict[UUID, ItemEntity] = {}
+        first = 0
+        if index:
+            snapshot, stored = snapshots[index - 1]
+            first = snapshot.last_event_id  # position of the first event to replay
+            if item_id is None:
+                items = dict(stored)
+            elif item_id in stored:
+                items = {item_id: stored[item_id]}
+
+        events = self.db.item_events
+        last = bisect.bisect_right(events, as_of, key=lambda event: event.occurred_at)
+        if item_id is None:
+            replay_item_events(items, events[first:last])
+        else:
+            positions = self.db.item_events_by_item.get(item_id, [])
+            start = bisect.bisect_left(positions, first)
+            end = bisect.bisect_left(positions, last)
+            replay_item_events(items, [events[position] for position in positions[start:end]])
+        return items
+
+    @staticmethod
+    def _copy_event(event: ItemEventEntity) -> ItemEventEntity:
+        """Copies a stored event."""
+        return dataclasses.replace(event, changes=dict(event.changes))
+
+    def _copy(self, item: ItemEntity, *, expand_owner: bool = False) -> ItemEntity:
+        """Copies a stored item, with its owner details if `expand_owner`."""
+        owner_details = None
+        if expand_owner and item.owner is not None:
+            owner = self.db.users.get(item.owner)
+            if owner is not None:
+                owner_details = ItemOwnerEntity(owner.email, owner.first_name, owner.last_name)
+        return dataclasses.replace(item, owner_details=owner_details)
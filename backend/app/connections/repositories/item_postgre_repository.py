@@ -1,13 +1,83 @@
+import uuid
+from datetime import datetime, timedelta
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.business.entities.item_entity import ItemEntity
-from app.connections.dao.postgre_dao import ItemModel
+from app.business.entities.item_changes_entity import ItemChangesEntity
+from app.business.entities.item_entity import ItemEntity, ItemOwnerEntity
+from app.business.entities.item_event_entity import ItemEventEntity
+from app.business.entities.item_snapshot_entity import ItemSnapshotEntity
+from app.connections.dao.item_history import (
+    ItemHistoryWriter,
+    event_values,
+    item_snapshot,
+    new_item_event,
+    replay_item_events,
+)
+from app.connections.dao.postgre_dao import (
+    ItemChangesEpochModel,
+    ItemEventModel,
+    ItemHistorySnapshotModel,
+    ItemModel,
+    ItemSnapshotRowModel,
+    ItemTombstoneModel,
+    UserModel,
+)
+from app.connections.dao.routing import mark_write, must_read_from_primary
+from app.core.config import config
+from app.core.timing import get_current_time
 from app.exceptions.item_exceptions import ItemNotFoundError
 
+# Columns in ItemEntity field order: read-only queries select them with Core and
+# build entities straight from the row tuples, without loading tracked ORM instances
+ITEM_COLUMNS = (
+    ItemModel.id,
+    ItemModel.name,
+    ItemModel.category,
+    ItemModel.serial_number_1,
+    ItemModel.serial_number_2,
+    ItemModel.serial_number_3,
+    ItemModel.owner,
+    ItemModel.location,
+    ItemModel.status,
+    ItemModel.created_at,
+)
+# Columns in ItemEventEntity field order
+ITEM_EVENT_COLUMNS = (
+    ItemEventModel.id,
+    ItemEventModel.item_id,
+    ItemEventModel.event_type,
+    ItemEventModel.changes,
+    ItemEventModel.actor,
+    ItemEventModel.request_id,
+    ItemEventModel.occurred_at,
+)
+# Columns of the snapshot rows in ItemEntity field order
+SNAPSHOT_ROW_COLUMNS = tuple(getattr(ItemSnapshotRowModel, column.key) for column in ITEM_COLUMNS)
+SNAPSHOT_COLUMNS = (
+    ItemHistorySnapshotModel.id,
+    ItemHistorySnapshotModel.taken_at,
+    ItemHistorySnapshotModel.settled_at,
+    ItemHistorySnapshotModel.last_event_id,
+    ItemHistorySnapshotModel.item_count,
+)
+# Key of the advisory lock taken by the worker taking a snapshot
+SNAPSHOT_LOCK_KEY = 0x17E45AA9
+
 
 class ItemPostgreRepository:
     """Repository for Item entities.
@@ -17,37 +87,309 @@ class ItemPostgreRepository:
     """
 
     session: sessionmaker[AsyncSession]
+    read_session: sessionmaker[AsyncSession]
+    history_writer: ItemHistoryWriter | None
+
+    def __init__(
+        self,
+        session_local: sessionmaker[AsyncSession],
+        read_session_local: sessionmaker[AsyncSession] | None = None,
+        history_writer: ItemHistoryWriter | None = None,
+    ) -> None:
+        """Initializes the ItemPostgreRepository with a session factory.
 
-    def __init__(self, session_local: sessionmaker[AsyncSession]) -> None:
-        """Initializes the ItemPostgreRepository with a session factory."""
+        Read-only methods use `read_session_local` (e.g. bound to a replica) when given,
+        unless the current request has written or asked to read from the primary.
+        Item events are written by `history_writer` when given, else in the transaction
+        of each change.
+        """
         self.session = session_local
+        self.read_session = read_session_local or session_local
+        self.history_writer = history_writer
+
+    def _read_session(self) -> AsyncSession:
+        """Opens a session for a read-only query, on the replica when allowed."""
+        if must_read_from_primary():
+            return self.session()
+        return self.read_session()
+
+    @staticmethod
+    def select_by_id(item_id: UUID) -> Select:
+        """Builds the query of `get` (without expansion), prepared ahead by the pool warm-up."""
+        return select(*ITEM_COLUMNS).where(ItemModel.id == item_id)
+
+    async def list_items(
+        self,
+        *,
+        expand_owner: bool = False,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves all items from the database.
+
+        Args:
+            expand_owner (bool): Flag to embed the owner details, joined in the same query.
+            owner (str | None): Only retrieve the items of this owner.
+        """
+        query = self._select_with_owner() if expand_owner else select(*ITEM_COLUMNS)
+        if owner is not None:
+            query = query.where(ItemModel.owner == owner)
+        async with self._read_session() as session:
+            result = await session.execute(query)
+            if expand_owner:
+                return [self._to_entity_with_owner(row) for row in result]
+            return [ItemEntity(*row) for row in result]
+
+    async def list_items_as_of(
+        self,
+        as_of: datetime,
+        *,
+        owner: str | None = None,
+    ) -> list[ItemEntity]:
+        """Retrieves the items as they were at a past date.
+
+        The latest snapshot taken before that date is read, then the events recorded
+        since are replayed on it. Items created before the history was recorded only
+        appear after the first snapshot.
+
+        Args:
+            as_of (datetime): The date, with time zone.
+            owner (str | None): Only retrieve the items this user owned at that date.
+        """
+        async with self._read_session() as session:
+            snapshot = await self._latest_snapshot(session, as_of)
+            events = await self._select_events_since(session, snapshot, as_of)
+
+            items: dict[UUID, ItemEntity] = {}
+            if snapshot is not None:
+                query = select(*SNAPSHOT_ROW_COLUMNS).where(
+                    ItemSnapshotRowModel.snapshot_id == snapshot.id,
+                )
+                if owner is not None:
+                    # Items owned at the snapshot, and the ones changed since: a subquery
+                    # rather than their IDs, which can outnumber the bind parameters a
+                    # statement takes (32767) after a busy interval
+                    changed = select(ItemEventModel.item_id).where(
+                        *self._events_since(snapshot, as_of),
+                    )
+                    query = query.where(
+                        or_(
+                            ItemSnapshotRowModel.owner == owner,
+                            ItemSnapshotRowModel.id.in_(changed),
+                        ),
+                    )
+                result = await session.execute(query)
+                items = {row.id: ItemEntity(*row) for row in result}
+
+        replay_item_events(items, events)
+        if owner is None:
+            return list(items.values())
+        return [item for item in items.values() if item.owner == owner]
 
-    async def list_items(self) -> list[ItemEntity]:
-        """Retrieves all items from the database."""
+    async def get_as_of(self, item_id: UUID, as_of: datetime) -> ItemEntity:
+        """Retrieves an item as it was at a past date.
+
+        Args:
+            item_id (UUID): The ID of the item.
+            as_of (datetime): The date, with time zone.
+
+        Raises:
+            ItemNotFoundError: If the item did not exist at that date.
+        """
+        async with self._read_session() as session:
+            snapshot = await self._latest_snapshot(session, as_of)
+            events = await self._select_events_since(session, snapshot, as_of, item_id)
+
+            items: dict[UUID, ItemEntity] = {}
+            if snapshot is not None:
+                result = await session.execute(
+                    select(*SNAPSHOT_ROW_COLUMNS).where(
+                        ItemSnapshotRowModel.snapshot_id == snapshot.id,
+                        ItemSnapshotRowModel.id == item_id,
+                    ),
+                )
+                items = {row.id: ItemEntity(*row) for row in result}
+
+        replay_item_events(items, events)
+        if item_id not in items:
+            raise ItemNotFoundError(item_id)
+        return items[item_id]
+
+    async def take_snapshot(
+        self,
+        *,
+        min_interval: timedelta | None = None,
+    ) -> ItemSnapshotEntity | None:
+        """Copies the current state of all the items into a new snapshot.
+
+        The copy is a single INSERT ... SELECT run by the database. Only one worker
+        takes a snapshot at a time (advisory lock): the others skip it.
+
+        The snapshot records the last event of the changes it includes: the events
+        that occurred up to `config.item_snapshot_settle_seconds` before it, whose
+        transactions have committed. The changes of the more recent events may be in
+        the snapshot too: those events are replayed on it all the same, which leaves
+        the same state since they are applied in order.
+
+        Args:
+            min_interval (timedelta | None): Skip the snapshot if the latest one is more
+                recent than this.
+
+        Returns:
+            The new snapshot, or None if skipped.
+        """
+        mark_write()
         async with self.session() as session:
-            result = await session.execute(select(ItemModel))
-            rows = result.scalars().all()
-            return [self._to_entity(row) for row in rows]
+            locked = await session.scalar(select(func.pg_try_advisory_xact_lock(SNAPSHOT_LOCK_KEY)))
+            if not locked:
+                return None
+
+            taken_at = get_current_time()
+            if min_interval is not None:
+                latest = await self._latest_snapshot(session, taken_at)
+                if latest is not None and taken_at - latest.taken_at < min_interval:
+                    return None
 
-    async def get(self, item_id: UUID) -> ItemEntity:
-        """Retrieves an item by its ID."""
+            settled_at = taken_at - timedelta(seconds=config.item_snapshot_settle_seconds)
+            last_event_id = await session.scalar(
+                select(func.coalesce(func.max(ItemEventModel.id), 0)).where(
+                    ItemEventModel.occurred_at < settled_at,
+                ),
+            )
+            snapshot_id = await session.scalar(
+                insert(ItemHistorySnapshotModel)
+                .values(taken_at=taken_at, settled_at=settled_at, last_event_id=last_event_id)
+                .returning(ItemHistorySnapshotModel.id),
+            )
+            result = await session.execute(
+                insert(ItemSnapshotRowModel).from_select(
+                    ["snapshot_id", *(column.key for column in ITEM_COLUMNS)],
+                    select(literal(snapshot_id, ItemHistorySnapshotModel.id.type), *ITEM_COLUMNS),
+                ),
+            )
+            item_count = result.rowcount
+            await session.execute(
+                update(ItemHistorySnapshotModel)
+                .where(ItemHistorySnapshotModel.id == snapshot_id)
+                .values(item_count=item_count),
+            )
+            await session.commit()
+            return ItemSnapshotEntity(snapshot_id, taken_at, settled_at, last_event_id, item_count)
+
+    async def list_changes(self, since: int, *, limit: int) -> ItemChangesEntity:
+        """Retrieves the items changed and deleted after a change number, in change order.
+
+        The changes numbered after `since` are read from the items and from the
+        tombstones of the deleted ones, both through their change_seq index, so the
+        cost follows the number of changes rather than the number of items.
+
+        The change numbers are drawn before the transactions commit, so a change may
+        become visible after a higher-numbered one. The returned `last_change_seq`
+        thus stops before the first change younger than
+        `config.item_changes_settle_seconds`: the recent changes are returned again
+        with the next page, along with the ones committed meanwhile.
+
+        The current epoch is read in the same snapshot, so the changes belong to it.
+
+        Args:
+            since (int): The change number the client is up to date with.
+            limit (int): Maximum number of changes returned.
+        """
+        settle_cutoff = func.clock_timestamp() - timedelta(
+            seconds=config.item_changes_settle_seconds,
+        )
+        async with self._read_session() as session:
+            epoch = await session.scalar(
+                select(func.coalesce(func.max(ItemChangesEpochModel.epoch), 0)),
+            )
+            item_rows = await session.execute(
+                select(*ITEM_COLUMNS, ItemModel.change_seq, ItemModel.updated_at < settle_cutoff)
+                .where(ItemModel.change_seq > since)
+                .order_by(ItemModel.change_seq)
+                .limit(limit + 1),
+            )
+            tombstone_rows = await session.execute(
+                select(
+                    ItemTombstoneModel.item_id,
+                    ItemTombstoneModel.change_seq,
+                    ItemTombstoneModel.deleted_at < settle_cutoff,
+                )
+                .where(ItemTombstoneModel.change_seq > since)
+                .order_by(ItemTombstoneModel.change_seq)
+                .limit(limit + 1),
+            )
+            # (change_seq, settled, item or deleted item ID), merged in change order
+            changes = sorted(
+                [(seq, settled, ItemEntity(*columns)) for *columns, seq, settled in item_rows]
+                + [(seq, settled, item_id) for item_id, seq, settled in tombstone_rows],
+                key=lambda change: change[0],
+            )
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        last_change_seq = since
+        for seq, settled, _ in changes:
+            if not settled:
+                break
+            last_change_seq = seq
+        return ItemChangesEntity(
+            items=[change for _, _, change in changes if isinstance(change, ItemEntity)],
+            deleted=[change for _, _, change in changes if not isinstance(change, ItemEntity)],
+            last_change_seq=last_change_seq,
+            has_more=has_more,
+            epoch=epoch,
+        )
+
+    async def purge_tombstones(self, before: datetime) -> int:
+        """Forgets the items deleted before a date, returning how many."""
+        mark_write()
         async with self.session() as session:
-            model = await session.get(ItemModel, item_id)
-            if not model:
+            result = await session.execute(
+                delete(ItemTombstoneModel).where(ItemTombstoneModel.deleted_at < before),
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def get(self, item_id: UUID, *, expand_owner: bool = False) -> ItemEntity:
+        """Retrieves an item by its ID.
+
+        Args:
+            item_id (UUID): The ID of the item to retrieve.
+            expand_owner (bool): Flag to embed the owner details, joined in the same query.
+        """
+        async with self._read_session() as session:
+            if expand_owner:
+                result = await session.execute(
+                    self._select_with_owner().where(ItemModel.id == item_id),
+                )
+                row = result.first()
+                if not row:
+                    raise ItemNotFoundError(item_id)
+                return self._to_entity_with_owner(row)
+
+            result = await session.execute(self.select_by_id(item_id))
+            row = result.first()
+            if not row:
                 raise ItemNotFoundError(item_id)
-            return self._to_entity(model)
+            return ItemEntity(*row)
 
     async def create(self, item: ItemEntity) -> ItemEntity:
         """Creates a new item in the database."""
+        mark_write()
         async with self.session() as session:
-            model = ItemModel(**vars(item))
+            model = self._to_model(item)
+            # Generated here rather than on flush, as the event refers to it
+            model.id = model.id or uuid.uuid4()
             session.add(model)
-            await session.commit()
+            await self._commit_with_event(
+                session,
+                new_item_event(model.id, "created", item_snapshot(item)),
+            )
             await session.refresh(model)
             return self._to_entity(model)
 
     async def update(self, item_id: UUID, updates: dict) -> ItemEntity:
         """Updates an item in the database."""
+        mark_write()
         async with self.session() as session:
             result = await session.execute(
                 update(ItemModel)
@@ -58,19 +400,206 @@ class ItemPostgreRepository:
             model = result.scalar_one_or_none()
             if not model:
                 raise ItemNotFoundError(item_id)
-            await session.commit()
+            await self._commit_with_event(session, new_item_event(item_id, "updated", updates))
             return self._to_entity(model)
 
     async def delete(self, item_id: UUID) -> None:
         """Deletes an item from the database."""
+        mark_write()
         async with self.session() as session:
             model = await session.get(ItemModel, item_id)
             if not model:
                 raise ItemNotFoundError(item_id)
             await session.delete(model)
+            await self._commit_with_event(session, new_item_event(item_id, "deleted"))
+
+    async def get_history(
+        self,
+        item_id: UUID,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of an item, oldest first.
+
+        Args:
+            item_id (UUID): The ID of the item, which may have been deleted since.
+            after (int | None): Only return the events recorded after this event ID.
+            limit (int | None): Maximum number of events returned.
+        """
+        query = select(*ITEM_EVENT_COLUMNS).where(ItemEventModel.item_id == item_id)
+        return await self._select_events(query, after, limit)
+
+    async def list_events(
+        self,
+        start: datetime,
+        end: datetime,
+        *,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[ItemEventEntity]:
+        """Retrieves the events of all items that occurred in [start, end), oldest first.
+
+        Args:
+            start (datetime): Start of the time range, included.
+            end (datetime): End of the time range, excluded.
+            after (int | None): Only return the events recorded after this event ID.
+            limit (int | None): Maximum number of events returned.
+        """
+        query = select(*ITEM_EVENT_COLUMNS).where(
+            ItemEventModel.occurred_at >= start,
+            ItemEventModel.occurred_at < end,
+        )
+        return await self._select_events(query, after, limit)
+
+    @staticmethod
+    async def _latest_snapshot(
+        session: AsyncSession,
+        as_of: datetime,
+    ) -> ItemSnapshotEntity | None:
+        """Returns the latest snapshot taken at or before a date, if any."""
+        result = await session.execute(
+            select(*SNAPSHOT_COLUMNS)
+            .where(ItemHistorySnapshotModel.taken_at <= as_of)
+            .order_by(ItemHistorySnapshotModel.taken_at.desc())
+            .limit(1),
+        )
+        row = result.first()
+        return ItemSnapshotEntity(*row) if row else None
+
+    async def purge_snapshots(self, before: datetime) -> int:
+        """Thins out the snapshots taken before the latest one taken before a date.
+
+        The first snapshot of each month (UTC) is kept, so the past dates before `before`
+        still start their replay at most about a month back, and the ones since keep
+        their snapshot. The rows of the deleted snapshots go with them (ON DELETE
+        CASCADE).
+
+        Returns:
+            The number of snapshots deleted.
+        """
+        mark_write()
+        kept = (
+            select(func.max(ItemHistorySnapshotModel.taken_at))
+            .where(ItemHistorySnapshotModel.taken_at <= before)
+            .scalar_subquery()
+        )
+        month = func.date_trunc("month", func.timezone("UTC", ItemHistorySnapshotModel.taken_at))
+        first_of_month = (
+            select(ItemHistorySnapshotModel.id)
+            .distinct(month)
+            .order_by(month, ItemHistorySnapshotModel.taken_at)
+        )
+        async with self.session() as session:
+            result = await session.execute(
+                delete(ItemHistorySnapshotModel).where(
+                    ItemHistorySnapshotModel.taken_at < kept,
+                    ItemHistorySnapshotModel.id.not_in(first_of_month),
+                ),
+            )
+            await session.commit()
+            return result.rowcount
+
+    @staticmethod
+    def _events_since(
+        snapshot: ItemSnapshotEntity | None,
+        as_of: datetime,
+    ) -> list[ColumnElement[bool]]:
+        """Returns the conditions on the events to replay on a snapshot to reach a date."""
+        conditions = [ItemEventModel.occurred_at <= as_of]
+        if snapshot is not None:
+            conditions += [
+                ItemEventModel.id > snapshot.last_event_id,
+                ItemEventModel.occurred_at >= snapshot.settled_at,
+            ]
+        return conditions
+
+    @staticmethod
+    async def _select_events_since(
+        session: AsyncSession,
+        snapshot: ItemSnapshotEntity | None,
+        as_of: datetime,
+        item_id: UUID | None = None,
+    ) -> list[ItemEventEntity]:
+        """Selects the events to replay on a snapshot (or on nothing) to reach a date.
+
+        The time range keeps the scan to the BRIN ranges (or the per-item index entries)
+        of one snapshot interval, whatever the size of the history.
+        """
+        conditions = ItemPostgreRepository._events_since(snapshot, as_of)
+        query = select(*ITEM_EVENT_COLUMNS).where(*conditions)
+        if item_id is not None:
+            query = query.where(ItemEventModel.item_id == item_id)
+        # In the order of the changes, which the IDs alone do not give when the events
+        # are written behind (drawn as each worker flushes its batch)
+        result = await session.execute(
+            query.order_by(ItemEventModel.occurred_at, ItemEventModel.id),
+        )
+        return [ItemEventEntity(*row) for row in result]
+
+    async def _select_events(
+        self,
+        query: Select,
+        after: int | None,
+        limit: int | None,
+    ) -> list[ItemEventEntity]:
+        """Runs a query of events, paginated by event ID."""
+        if after is not None:
+            query = query.where(ItemEventModel.id > after)
+        query = query.order_by(ItemEventModel.id).limit(limit)
+        async with self._read_session() as session:
+            result = await session.execute(query)
+            return [ItemEventEntity(*row) for row in result]
+
+    async def _commit_with_event(self, session: AsyncSession, event: ItemEventEntity) -> None:
+        """Commits a change of an item along with its history event.
+
+        The event is inserted in the same transaction, or queued for the history writer
+        once the change is committed.
+        """
+        if self.history_writer is None:
+            # Core INSERT without RETURNING: the event is never read back here
+            await session.execute(insert(ItemEventModel).values(**event_values(event)))
+            await session.commit()
+        else:
             await session.commit()
+            self.history_writer.enqueue(event)
+
+    @staticmethod
+    def _select_with_owner() -> Select:
+        """Selects items along with their owner's names (LEFT JOIN on users)."""
+        return select(*ITEM_COLUMNS, UserModel.first_name, UserModel.last_name).outerjoin(
+            UserModel,
+            UserModel.email == ItemModel.owner,
+        )
+
+    @staticmethod
+    def _to_entity_with_owner(row: Row) -> ItemEntity:
+        """Converts a row of `_select_with_owner` to an ItemEntity with owner details."""
+        *columns, first_name, last_name = row
+        owner_details = None
+        if row.owner is not None and first_name is not None:
+            owner_details = ItemOwnerEntity(row.owner, first_name, last_name)
+        return ItemEntity(*columns, owner_details=owner_details)
+
+    @staticmethod
+    def _to_model(item: ItemEntity) -> ItemModel:
+        """Converts an ItemEntity object to an ItemModel object."""
+        return ItemModel(
+            id=item.id,
+            name=item.name,
+            category=item.category,
+            serial_number_1=item.serial_number_1,
+            serial_number_2=item.serial_number_2,
+            serial_number_3=item.serial_number_3,
+            owner=item.owner,
+            location=item.location,
+            status=item.status,
+            created_at=item.created_at,
+        )
 
-    def _to_entity(self, model: ItemModel) -> ItemEntity:
+    @staticmethod
+    def _to_entity(model: ItemModel) -> ItemEntity:
         """Converts an ItemModel object to an ItemEntity object."""
         return ItemEntity(
             id=model.id,
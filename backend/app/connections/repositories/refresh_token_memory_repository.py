@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import dataclasses
+import uuid
+from typing import TYPE_CHECKING
+
+from app.business.entities.refresh_token_entity import RefreshTokenEntity
+from app.core.timing import get_current_time
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+    from app.connections.dao.memory_dao import MemoryDatabase
+
+
+class RefreshTokenMemoryRepository:
+    """Repository for refresh tokens, kept in memory."""
+
+    def __init__(self, db: MemoryDatabase) -> None:
+        """Initializes the RefreshTokenMemoryRepository with the in-memory tables."""
+        self.db = db
+
+    async def create(
+        self,
+        token_hash: str,
+        user_email: str,
+        expires_at: datetime,
+        replaced_by: UUID | None = None,
+    ) -> RefreshTokenEntity:
+        """Stores a new refresh token.
+
+        Args:
+            token_hash: The hashed value of the refresh token.
+            user_email: The email of the user associated with the refresh token.
+            expires_at: The timestamp when the refresh token expires.
+            replaced_by: The ID of the refresh token that replaced this one, if any.
+
+        Returns:
+            The newly created refresh token.
+        """
+        token = RefreshTokenEntity(
+            id=uuid.uuid4(),
+            token_hash=token_hash,
+            user_email=user_email,
+            issued_at=get_current_time(),
+            expires_at=expires_at,
+            replaced_by=replaced_by,
+        )
+        self.db.put_refresh_token(token)
+        return dataclasses.replace(token)
+
+    async def get_by_hash(self, token_hash: str) -> RefreshTokenEntity | None:
+        """Retrieves a refresh token by its hashed value."""
+        token_id = self.db.refresh_tokens_by_hash.get(token_hash)
+        if token_id is None:
+            return None
+        return dataclasses.replace(self.db.refresh_tokens[token_id])
+
+    async def revoke(self, token_id: UUID, replaced_by: UUID | None = None) -> None:
+        """Revokes a refresh token.
+
+        Args:
+            token_id: The ID of the refresh token to revoke.
+            replaced_by: The ID of the refresh token that replaced this one, if any.
+        """
+        token = self.db.refresh_tokens.get(token_id)
+        if token is not None:
+            token.revoked = True
+            token.replaced_by = replaced_by
+
+    async def revoke_by_user(self, user_email: str) -> None:
+        """Revoke all refresh tokens for a user (useful for logout-all)."""
+        for token in self.db.refresh_tokens.values():
+            if token.user_email == user_email:
+                token.revoked = True
@@ -4,25 +4,44 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import select, update
 
+from app.business.entities.refresh_token_entity import RefreshTokenEntity
 from app.connections.dao.postgre_dao import RefreshTokenModel
+from app.connections.dao.routing import mark_write, must_read_from_primary
 from app.core.timing import get_current_time
 
 if TYPE_CHECKING:
     from datetime import datetime
     from uuid import UUID
 
+    from sqlalchemy import Select
     from sqlalchemy.ext.asyncio import AsyncSession
     from sqlalchemy.orm import sessionmaker
 
 
-class RefreshTokenRepository:
+class RefreshTokenPostgreRepository:
     """Repository for refresh token persistence and lookups."""
 
     session: sessionmaker[AsyncSession]
+    read_session: sessionmaker[AsyncSession]
 
-    def __init__(self, session_local: sessionmaker[AsyncSession]) -> None:
-        """Initializes the RefreshTokenRepository with a session maker."""
+    def __init__(
+        self,
+        session_local: sessionmaker[AsyncSession],
+        read_session_local: sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        """Initializes the RefreshTokenPostgreRepository with a session maker.
+
+        Read-only methods use `read_session_local` (e.g. bound to a replica) when given,
+        unless the current request has written or asked to read from the primary.
+        """
         self.session = session_local
+        self.read_session = read_session_local or session_local
+
+    def _read_session(self) -> AsyncSession:
+        """Opens a session for a read-only query, on the replica when allowed."""
+        if must_read_from_primary():
+            return self.session()
+        return self.read_session()
 
     async def create(
         self,
@@ -30,7 +49,7 @@ class RefreshTokenRepository:
         user_email: str,
         expires_at: datetime,
         replaced_by: UUID | None = None,
-    ) -> RefreshTokenModel:
+    ) -> RefreshTokenEntity:
         """Creates a new refresh token.
 
         Args:
@@ -40,8 +59,9 @@ class RefreshTokenRepository:
             replaced_by: The ID of the refresh token that replaced this one, if any.
 
         Returns:
-            The newly created RefreshTokenModel object.
+            The newly created refresh token.
         """
+        mark_write()
         async with self.session() as session:
             model = RefreshTokenModel(
                 token_hash=token_hash,
@@ -54,15 +74,19 @@ class RefreshTokenRepository:
             session.add(model)
             await session.commit()
             await session.refresh(model)
-            return model
+            return self._to_entity(model)
 
-    async def get_by_hash(self, token_hash: str) -> RefreshTokenModel | None:
+    @staticmethod
+    def select_by_hash(token_hash: str) -> Select:
+        """Builds the query of `get_by_hash`, prepared ahead by the pool warm-up."""
+        return select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash)
+
+    async def get_by_hash(self, token_hash: str) -> RefreshTokenEntity | None:
         """Retrieves a refresh token by its hashed value."""
-        async with self.session() as session:
-            result = await session.execute(
-                select(RefreshTokenModel).where(RefreshTokenModel.token_hash == token_hash),
-            )
-            return result.scalars().first()
+        async with self._read_session() as session:
+            result = await session.execute(self.select_by_hash(token_hash))
+            model = result.scalars().first()
+            return self._to_entity(model) if model else None
 
     async def revoke(self, token_id: UUID, replaced_by: UUID | None = None) -> None:
         """Revokes a refresh token.
@@ -71,6 +95,7 @@ class RefreshTokenRepository:
             token_id: The ID of the refresh token to revoke.
             replaced_by: The ID of the refresh token that replaced this one, if any.
         """
+        mark_write()
         async with self.session() as session:
             await session.execute(
                 update(RefreshTokenModel)
@@ -81,6 +106,7 @@ class RefreshTokenRepository:
 
     async def revoke_by_user(self, user_email: str) -> None:
         """Revoke all refresh tokens for a user (useful for logout-all)."""
+        mark_write()
         async with self.session() as session:
             await session.execute(
                 update(RefreshTokenModel)
@@ -88,3 +114,16 @@ class RefreshTokenRepository:
                 .values(revoked=True),
             )
             await session.commit()
+
+    @staticmethod
+    def _to_entity(model: RefreshTokenModel) -> RefreshTokenEntity:
+        """Converts a RefreshTokenModel object to a RefreshTokenEntity object."""
+        return RefreshTokenEntity(
+            id=model.id,
+            token_hash=model.token_hash,
+            user_email=model.user_email,
+            issued_at=model.issued_at,
+            expires_at=model.expires_at,
+            revoked=model.revoked,
+            replaced_by=model.replaced_by,
+        )
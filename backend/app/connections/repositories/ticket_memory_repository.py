@@ -0,0 +1,155 @@
+import dataclasses
+import heapq
+import itertools
+import uuid
+from collections.abc import Iterator
+from uuid import UUID
+
+from app.business.entities.ticket_entity import TicketDecisionsEntity, TicketEntity, TicketStatus
+from app.connections.dao.item_history import new_item_event
+from app.connections.dao.memory_dao import (
+    ForeignKeyViolationError,
+    MemoryDatabase,
+    NotNullViolationError,
+)
+from app.core.notifications import NotificationHub
+from app.core.timing import get_current_time
+from app.exceptions.ticket_exceptions import TicketNotFoundError
+
+
+def publish_ticket(hub: NotificationHub, ticket: TicketEntity, recipients: list[str]) -> None:
+    """Publishes a new or decided ticket to the users it concerns.
+
+    Used by the memory backend: the notification is the payload the database trigger
+    on tickets sends in the Postgres backend.
+    """
+    notification = {
+        "kind": "ticket",
+        "ticket_id": str(ticket.id),
+        "item_id": str(ticket.item_id),
+        "status": ticket.status.value,
+        "requester": ticket.requester,
+        "approver": ticket.approver,
+        "decided_by": ticket.decided_by,
+    }
+    hub.publish(notification, recipients)
+
+
+class TicketMemoryRepository:
+    """Repository for Ticket entities, kept in memory.
+
+    Entities are copied in and out of the `MemoryDatabase`, so callers never share
+    (and mutate) the stored ones, as with the Postgres repository.
+    """
+
+    def __init__(self, db: MemoryDatabase) -> None:
+        """Initializes the TicketMemoryRepository with the in-memory tables."""
+        self.db = db
+
+    async def create(self, ticket: TicketEntity) -> TicketEntity:
+        """Stores a new ticket, generating its ID if None."""
+        stored = dataclasses.replace(ticket, id=ticket.id or uuid.uuid4())
+        self.db.put_ticket(stored)
+        return self._copy(stored)
+
+    async def get(self, ticket_id: UUID) -> TicketEntity:
+        """Retrieves a ticket by its ID."""
+        ticket = self.db.tickets.get(ticket_id)
+        if ticket is None:
+            raise TicketNotFoundError(ticket_id)
+        return self._copy(ticket)
+
+    async def list_pending(
+        self,
+        approver: str | None,
+        limit: int,
+        offset: int = 0,
+    ) -> list[TicketEntity]:
+        """Retrieves the open tickets of a queue, oldest first.
+
+        Args:
+            approver (str | None): The manager whose queue is read, None for all.
+            limit (int): Maximum number of tickets to return.
+            offset (int): Number of tickets to skip.
+        """
+        ids = self._pending_ids(approver)
+        return [
+            self._copy(self.db.tickets[ticket_id])
+            for ticket_id in itertools.islice(ids, offset, offset + limit)
+        ]
+
+    async def decide(
+        self,
+        ticket_ids: list[UUID],
+        *,
+        approve: bool,
+        decided_by: str,
+        approver: str | None,
+        comment: str | None = None,
+    ) -> TicketDecisionsEntity:
+        """Approves or rejects open tickets of a queue.
+
+        Writes are atomic here, so no ticket is ever being decided by someone else.
+
+        Args:
+            ticket_ids (list[UUID]): The tickets to decide.
+            approve (bool): True to approve them, False to reject them.
+            decided_by (str): The user deciding.
+            approver (str | None): The queue the tickets must be in, None for all.
+            comment (str | None): A comment on the decision.
+        """
+        decisions = TicketDecisionsEntity()
+        status = TicketStatus.APPROVED if approve else TicketStatus.REJECTED
+        now = get_current_time()
+        for ticket_id in ticket_ids:
+            ticket = self.db.tickets.get(ticket_id)
+            if ticket is None or not self._in_queue(ticket, approver):
+                decisions.skipped.append(ticket_id)
+                continue
+            if approve:
+                item = self.db.items[ticket.item_id]
+                # Reasons worded as in the Postgres backend
+                try:
+                    self.db.put_item(dataclasses.replace(item, **ticket.changes))
+                except NotNullViolationError as e:
+                    decisions.failed[ticket_id] = f"{e.field}: required"
+                    continue
+                except ForeignKeyViolationError as e:
+                    decisions.failed[ticket_id] = f"{e.field}: not a user"
+                    continue
+                self.db.append_item_event(
+                    new_item_event(ticket.item_id, "updated", ticket.changes),
+                )
+            decided = dataclasses.replace(
+                ticket,
+                status=status,
+                decided_by=decided_by,
+                decided_at=now,
+                decision_comment=comment,
+            )
+            self.db.put_ticket(decided)
+            decisions.decided.append(self._copy(decided))
+        return decisions
+
+    def _pending_ids(self, approver: str | None) -> Iterator[UUID]:
+        """Iterates over the IDs of the open tickets of a queue, oldest first."""
+        if approver is None:
+            return iter(self.db.open_tickets)
+        queues = self.db.open_tickets_by_approver
+        return heapq.merge(
+            queues.get(approver, {}),
+            queues.get(None, {}),
+            key=lambda ticket_id: self.db.tickets[ticket_id].created_at,
+        )
+
+    @staticmethod
+    def _in_queue(ticket: TicketEntity, approver: str | None) -> bool:
+        """Tells whether a ticket is open in the queue of an approver (None for all)."""
+        if ticket.status != TicketStatus.OPEN:
+            return False
+        return approver is None or ticket.approver in {approver, None}
+
+    @staticmethod
+    def _copy(ticket: TicketEntity) -> TicketEntity:
+        """Copies a stored ticket."""
+        return dataclasses.replace(ticket, changes=dict(ticket.changes))
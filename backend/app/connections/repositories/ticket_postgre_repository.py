@@ -0,0 +1,247 @@
+import dataclasses
+from uuid import UUID
+
+from sqlalchemy import Row, Select, insert, literal_column, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.business.entities.ticket_entity import TicketDecisionsEntity, TicketEntity, TicketStatus
+from app.connections.dao.item_history import ItemHistoryWriter, event_values, new_item_event
+from app.connections.dao.postgre_dao import ItemEventModel, ItemModel, TicketModel
+from app.connections.dao.routing import mark_write, must_read_from_primary
+from app.core.timing import get_current_time
+from app.exceptions.ticket_exceptions import TicketNotFoundError
+
+# Columns in TicketEntity field order
+TICKET_COLUMNS = (
+    TicketModel.id,
+    TicketModel.item_id,
+    TicketModel.requester,
+    TicketModel.approver,
+    TicketModel.changes,
+    TicketModel.comment,
+    TicketModel.status,
+    TicketModel.created_at,
+    TicketModel.decided_by,
+    TicketModel.decided_at,
+    TicketModel.decision_comment,
+)
+# Written inline rather than as a bound parameter: the planner only uses the partial
+# indexes on open tickets when it sees the value, which a generic plan of the
+# prepared statement would not
+IS_OPEN = TicketModel.status == literal_column("'open'")
+
+# SQLSTATE of the constraint violations an item update can run into
+NOT_NULL_VIOLATION = "23502"
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def _refusal_reason(error: IntegrityError) -> str:
+    """Describes why the database refused the item update of a ticket, by field.
+
+    The message of the database is not passed on: its DETAIL repeats the values of the
+    row (e.g. "Failing row contains (...)"), the owner email included.
+    """
+    sqlstate = getattr(error.orig, "sqlstate", None)
+    if sqlstate == NOT_NULL_VIOLATION:
+        # The asyncpg error, wrapped by the DBAPI adapter, names the column
+        column = getattr(error.orig.__cause__, "column_name", None)
+        return f"{column}: required"
+    if sqlstate == FOREIGN_KEY_VIOLATION:
+        return "owner: not a user"  # the only reference of the items
+    return "Refused by the database"
+
+
+class TicketPostgreRepository:
+    """Repository for Ticket entities.
+
+    Approvals apply the changes of the tickets to the items in the transaction of the
+    decision, recording the item events as the item repository does.
+    """
+
+    session: sessionmaker[AsyncSession]
+    read_session: sessionmaker[AsyncSession]
+    history_writer: ItemHistoryWriter | None
+
+    def __init__(
+        self,
+        session_local: sessionmaker[AsyncSession],
+        read_session_local: sessionmaker[AsyncSession] | None = None,
+        history_writer: ItemHistoryWriter | None = None,
+    ) -> None:
+        """Initializes the TicketPostgreRepository with a session factory.
+
+        Read-only methods use `read_session_local` (e.g. bound to a replica) when given,
+        unless the current request has written or asked to read from the primary.
+        Item events are written by `history_writer` when given, else in the transaction
+        of each decision.
+        """
+        self.session = session_local
+        self.read_session = read_session_local or session_local
+        self.history_writer = history_writer
+
+    def _read_session(self) -> AsyncSession:
+        """Opens a session for a read-only query, on the replica when allowed."""
+        if must_read_from_primary():
+            return self.session()
+        return self.read_session()
+
+    async def create(self, ticket: TicketEntity) -> TicketEntity:
+        """Creates a new ticket in the database."""
+        mark_write()
+        values = {
+            column.key: getattr(ticket, column.key)
+            for column in TICKET_COLUMNS
+            if getattr(ticket, column.key) is not None
+        }
+        values["status"] = ticket.status.value
+        async with self.session() as session:
+            result = await session.execute(
+                insert(TicketModel).values(**values).returning(*TICKET_COLUMNS),
+            )
+            row = result.one()
+            await session.commit()
+            return self._to_entity(row)
+
+    async def get(self, ticket_id: UUID) -> TicketEntity:
+        """Retrieves a ticket by its ID."""
+        async with self._read_session() as session:
+            result = await session.execute(
+                select(*TICKET_COLUMNS).where(TicketModel.id == ticket_id),
+            )
+            row = result.first()
+            if not row:
+                raise TicketNotFoundError(ticket_id)
+            return self._to_entity(row)
+
+    async def list_pending(
+        self,
+        approver: str | None,
+        limit: int,
+        offset: int = 0,
+    ) -> list[TicketEntity]:
+        """Retrieves the open tickets of a queue, oldest first.
+
+        A manager's queue is read from ix_tickets_open_approver (their tickets and the
+        unassigned ones), the whole queue from ix_tickets_open_created_at.
+
+        Args:
+            approver (str | None): The manager whose queue is read, None for all.
+            limit (int): Maximum number of tickets to return.
+            offset (int): Number of tickets to skip.
+        """
+        query = (
+            self._select_pending(approver)
+            .order_by(TicketModel.created_at, TicketModel.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        async with self._read_session() as session:
+            result = await session.execute(query)
+            return [self._to_entity(row) for row in result]
+
+    async def decide(
+        self,
+        ticket_ids: list[UUID],
+        *,
+        approve: bool,
+        decided_by: str,
+        approver: str | None,
+        comment: str | None = None,
+    ) -> TicketDecisionsEntity:
+        """Approves or rejects open tickets of a queue, in one transaction.
+
+        The tickets are locked with FOR UPDATE SKIP LOCKED: the ones another approver
+        is deciding are skipped at once instead of waited for, so approvers working
+        the same queue never block each other. The changes of each approved ticket are
+        applied in a savepoint: a change the database refuses (e.g. an owner deleted
+        since) leaves its ticket open without failing the others.
+
+        Args:
+            ticket_ids (list[UUID]): The tickets to decide.
+            approve (bool): True to approve them, False to reject them.
+            decided_by (str): The user deciding.
+            approver (str | None): The queue the tickets must be in, None for all.
+            comment (str | None): A comment on the decision.
+        """
+        mark_write()
+        decisions = TicketDecisionsEntity()
+        status = TicketStatus.APPROVED if approve else TicketStatus.REJECTED
+        now = get_current_time()
+        events = []
+        async with self.session() as session:
+            # Locked in item order, as the items are updated: two approvers deciding
+            # tickets of the same items lock them in the same order, without deadlock
+            result = await session.execute(
+                self._select_pending(approver)
+                .where(TicketModel.id.in_(ticket_ids))
+                .order_by(TicketModel.item_id, TicketModel.created_at)
+                .with_for_update(skip_locked=True),
+            )
+            tickets = [self._to_entity(row) for row in result]
+
+            for ticket in tickets:
+                if approve:
+                    try:
+                        async with session.begin_nested():
+                            await session.execute(
+                                update(ItemModel)
+                                .where(ItemModel.id == ticket.item_id)
+                                .values(**ticket.changes),
+                            )
+                    except IntegrityError as e:
+                        decisions.failed[ticket.id] = _refusal_reason(e)
+                        continue
+                    events.append(new_item_event(ticket.item_id, "updated", ticket.changes))
+                decisions.decided.append(
+                    dataclasses.replace(
+                        ticket,
+                        status=status,
+                        decided_by=decided_by,
+                        decided_at=now,
+                        decision_comment=comment,
+                    ),
+                )
+
+            if decisions.decided:
+                await session.execute(
+                    update(TicketModel)
+                    .where(TicketModel.id.in_([ticket.id for ticket in decisions.decided]))
+                    .values(
+                        status=status.value,
+                        decided_by=decided_by,
+                        decided_at=now,
+                        decision_comment=comment,
+                    ),
+                )
+            if events and self.history_writer is None:
+                await session.execute(
+                    insert(ItemEventModel),
+                    [event_values(event) for event in events],
+                )
+            await session.commit()
+
+        if self.history_writer is not None:
+            for event in events:
+                self.history_writer.enqueue(event)
+        locked = {ticket.id for ticket in tickets}
+        decisions.skipped = [ticket_id for ticket_id in ticket_ids if ticket_id not in locked]
+        return decisions
+
+    @staticmethod
+    def _select_pending(approver: str | None) -> Select:
+        """Selects the open tickets of a queue: an approver's and the unassigned ones."""
+        query = select(*TICKET_COLUMNS).where(IS_OPEN)
+        if approver is not None:
+            query = query.where(
+                or_(TicketModel.approver == approver, TicketModel.approver.is_(None)),
+            )
+        return query
+
+    @staticmethod
+    def _to_entity(row: Row) -> TicketEntity:
+        """Converts a row of TICKET_COLUMNS to a TicketEntity."""
+        ticket = TicketEntity(*row)
+        ticket.status = TicketStatus(ticket.status)
+        return ticket
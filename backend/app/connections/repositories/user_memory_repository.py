@@ -0,0 +1,142 @@
+import dataclasses
+import itertools
+from collections import Counter
+
+from app.business.entities.user_entity import UserEntity, UserItemStatsEntity
+from app.connections.dao.memory_dao import MemoryDatabase
+from app.exceptions.user_exceptions import UserAlreadyExistsError, UserNotFoundError
+
+
+class UserMemoryRepository:
+    """Repository for User entities, kept in memory.
+
+    Entities are copied in and out of the `MemoryDatabase`, so callers never share
+    (and mutate) the stored ones, as with the Postgres repository.
+    """
+
+    def __init__(self, db: MemoryDatabase) -> None:
+        """Initializes the UserMemoryRepository with the in-memory tables."""
+        self.db = db
+
+    async def list_users(
+        self,
+        prefix: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserEntity]:
+        """Retrieves users ordered by email, without their password hash.
+
+        Args:
+            prefix (str | None): Case-insensitive prefix matched against the email,
+                first name and last name. If None, all users are returned.
+            limit (int | None): Maximum number of users to return. If None, no limit.
+            offset (int): Number of users to skip.
+        """
+        users = (self.db.users[email] for email in self.db.sorted_emails)
+        if prefix:
+            prefix = prefix.lower()
+            users = (
+                user
+                for user in users
+                if user.email.lower().startswith(prefix)
+                or user.first_name.lower().startswith(prefix)
+                or user.last_name.lower().startswith(prefix)
+            )
+        stop = offset + limit if limit is not None else None
+        return [
+            dataclasses.replace(user, hashed_password=None)
+            for user in itertools.islice(users, offset, stop)
+        ]
+
+    async def list_item_counts(
+        self,
+        limit: int,
+        offset: int = 0,
+        *,
+        descending: bool = True,
+        with_categories: bool = False,
+    ) -> list[UserItemStatsEntity]:
+        """Retrieves users along with their number of assigned items.
+
+        Counts come from the items-by-owner index.
+
+        Args:
+            limit (int): Maximum number of users to return.
+            offset (int): Number of users to skip.
+            descending (bool): Flag to sort by decreasing item count (ties by email).
+            with_categories (bool): Flag to also count the items per category.
+        """
+        sign = -1 if descending else 1
+        by_owner = self.db.items_by_owner
+        emails = sorted(
+            self.db.sorted_emails,
+            key=lambda email: sign * len(by_owner.get(email, ())),
+        )[offset : offset + limit]
+
+        stats = []
+        for email in emails:
+            user = self.db.users[email]
+            item_ids = by_owner.get(email, ())
+            entry = UserItemStatsEntity(
+                email=user.email,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                role=user.role,
+                item_count=len(item_ids),
+            )
+            if with_categories:
+                categories = Counter(self.db.items[item_id].category for item_id in item_ids)
+                entry.items_per_category = dict(categories)
+            stats.append(entry)
+        return stats
+
+    async def get(self, email: str, *, user_or_none: bool = False) -> UserEntity | None:
+        """Retrieves a user by their email.
+
+        Args:
+            email (str): The email of the user to retrieve.
+            user_or_none (bool): Flag to return None if user is not found.
+                Otherwise, raises UserNotFoundError (Default behavior).
+        """
+        user = self.db.users.get(email)
+        if user is None:
+            if user_or_none:
+                return None
+            raise UserNotFoundError(email)
+        return dataclasses.replace(user)
+
+    async def create(self, user: UserEntity) -> UserEntity:
+        """Stores a new user."""
+        if user.email in self.db.users:
+            raise UserAlreadyExistsError(user.email)
+        self.db.put_user(dataclasses.replace(user))
+        return dataclasses.replace(user)
+
+    async def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Returns the subset of the given emails that already belong to a user."""
+        return {email for email in emails if email in self.db.users}
+
+    async def create_many(self, users: list[UserEntity]) -> list[UserEntity]:
+        """Stores many users, skipping those whose email already exists.
+
+        Returns:
+            The users that were actually stored.
+        """
+        created = []
+        for user in users:
+            if user.email not in self.db.users:
+                self.db.put_user(dataclasses.replace(user))
+                created.append(user)
+        return created
+
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        """Replaces the stored password hash of a user."""
+        user = self.db.users.get(email)
+        if user is None:
+            raise UserNotFoundError(email)
+        self.db.put_user(dataclasses.replace(user, hashed_password=hashed_password))
+
+    async def delete(self, email: str) -> None:
+        """Deletes a user (and their refresh tokens)."""
+        if self.db.pop_user(email) is None:
+            raise UserNotFoundError(email)
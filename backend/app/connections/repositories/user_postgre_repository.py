@@ -1,12 +1,19 @@
-from sqlalchemy import select
+from sqlalchemy import Select, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.business.entities.user_entity import UserEntity, UserRole
-from app.connections.dao.postgre_dao import UserModel
+from app.business.entities.user_entity import UserEntity, UserItemStatsEntity, UserRole
+from app.connections.dao.postgre_dao import ItemModel, UserModel
+from app.connections.dao.routing import mark_write, must_read_from_primary
 from app.exceptions.user_exceptions import UserNotFoundError
 
 
+def _escape_like(value: str) -> str:
+    """Escapes LIKE wildcards (backslash is the Postgres default escape character)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
 class UserPostgreRepository:
     """Repository class for handling User entities.
 
@@ -15,17 +22,151 @@ class UserPostgreRepository:
     """
 
     session: sessionmaker[AsyncSession]
+    read_session: sessionmaker[AsyncSession]
+
+    def __init__(
+        self,
+        session_local: sessionmaker[AsyncSession],
+        read_session_local: sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        """Initializes the UserPostgreRepository with a session factory.
 
-    def __init__(self, session_local: sessionmaker[AsyncSession]) -> None:
-        """Initializes the UserPostgreRepository with a session factory."""
+        Read-only methods use `read_session_local` (e.g. bound to a replica) when given,
+        unless the current request has written or asked to read from the primary.
+        """
         self.session = session_local
+        self.read_session = read_session_local or session_local
 
-    async def list_users(self) -> list[UserEntity]:
-        """Retrieves all users from the database."""
-        async with self.session() as session:
-            result = await session.execute(select(UserModel))
-            rows = result.scalars().all()
-            return [self._to_entity(row) for row in rows]
+    def _read_session(self) -> AsyncSession:
+        """Opens a session for a read-only query, on the replica when allowed."""
+        if must_read_from_primary():
+            return self.session()
+        return self.read_session()
+
+    async def list_users(
+        self,
+        prefix: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[UserEntity]:
+        """Retrieves users from the database, ordered by email.
+
+        Only public columns are selected, so returned entities carry no password hash.
+
+        Args:
+            prefix (str | None): Case-insensitive prefix matched against the email,
+                first name and last name. If None, all users are returned.
+            limit (int | None): Maximum number of users to return. If None, no limit.
+            offset (int): Number of users to skip.
+        """
+        stmt = select(
+            UserModel.email,
+            UserModel.first_name,
+            UserModel.last_name,
+            UserModel.role,
+        )
+        if prefix:
+            pattern = _escape_like(prefix.lower()) + "%"
+            stmt = stmt.where(
+                or_(
+                    func.lower(UserModel.email).like(pattern),
+                    func.lower(UserModel.first_name).like(pattern),
+                    func.lower(UserModel.last_name).like(pattern),
+                ),
+            )
+        stmt = stmt.order_by(UserModel.email).offset(offset).limit(limit)
+
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            return [
+                UserEntity(
+                    email=row.email,
+                    first_name=row.first_name,
+                    last_name=row.last_name,
+                    hashed_password=None,
+                    role=UserRole(row.role),
+                )
+                for row in result
+            ]
+
+    async def list_item_counts(
+        self,
+        limit: int,
+        offset: int = 0,
+        *,
+        descending: bool = True,
+        with_categories: bool = False,
+    ) -> list[UserItemStatsEntity]:
+        """Retrieves users along with their number of assigned items.
+
+        Counts are computed by a single GROUP BY owner aggregate, LEFT JOINed to users
+        so that users without items are listed with a count of 0.
+
+        Args:
+            limit (int): Maximum number of users to return.
+            offset (int): Number of users to skip.
+            descending (bool): Flag to sort by decreasing item count (ties by email).
+            with_categories (bool): Flag to also compute the item counts per category
+                of the returned users (one extra aggregate restricted to them).
+        """
+        counts = (
+            select(ItemModel.owner.label("owner"), func.count().label("item_count"))
+            .where(ItemModel.owner.is_not(None))
+            .group_by(ItemModel.owner)
+            .subquery()
+        )
+        item_count = func.coalesce(counts.c.item_count, 0).label("item_count")
+        stmt = (
+            select(
+                UserModel.email,
+                UserModel.first_name,
+                UserModel.last_name,
+                UserModel.role,
+                item_count,
+            )
+            .outerjoin(counts, counts.c.owner == UserModel.email)
+            .order_by(item_count.desc() if descending else item_count.asc(), UserModel.email)
+            .offset(offset)
+            .limit(limit)
+        )
+
+        async with self._read_session() as session:
+            result = await session.execute(stmt)
+            stats = [
+                UserItemStatsEntity(
+                    email=row.email,
+                    first_name=row.first_name,
+                    last_name=row.last_name,
+                    role=UserRole(row.role),
+                    item_count=row.item_count,
+                )
+                for row in result
+            ]
+
+            if with_categories and stats:
+                by_email = {entry.email: entry for entry in stats}
+                for entry in stats:
+                    entry.items_per_category = {}
+                result = await session.execute(
+                    select(ItemModel.owner, ItemModel.category, func.count())
+                    .where(ItemModel.owner.in_(by_email))
+                    .group_by(ItemModel.owner, ItemModel.category),
+                )
+                for owner, category, count in result:
+                    by_email[owner].items_per_category[category] = count
+
+            return stats
+
+    @staticmethod
+    def select_by_email(email: str) -> Select:
+        """Builds the query of `get`, prepared ahead by the pool warm-up."""
+        return select(
+            UserModel.email,
+            UserModel.first_name,
+            UserModel.last_name,
+            UserModel.hashed_password,
+            UserModel.role,
+        ).where(UserModel.email == email)
 
     async def get(self, email: str, *, user_or_none: bool = False) -> UserEntity | None:
         """Retrieves a user by their email.
@@ -35,25 +176,73 @@ class UserPostgreRepository:
             user_or_none (bool): Flag to return None if user is not found.
                 Otherwise, raises UserNotFoundError (Default behavior).
         """
-        async with self.session() as session:
-            model = await session.get(UserModel, email)
-            if not model:
+        async with self._read_session() as session:
+            result = await session.execute(self.select_by_email(email))
+            row = result.first()
+            if not row:
                 if user_or_none:
                     return None
                 raise UserNotFoundError(email)
-            return self._to_entity(model)
+            return UserEntity(*row[:4], role=UserRole(row.role))
 
     async def create(self, user: UserEntity) -> UserEntity:
         """Creates a new user in the database."""
+        mark_write()
         async with self.session() as session:
-            model = UserModel(**vars(user))
+            model = UserModel(**self._to_values(user))
             session.add(model)
             await session.commit()
             await session.refresh(model)
             return self._to_entity(model)
 
+    async def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Returns the subset of the given emails that already belong to a user."""
+        if not emails:
+            return set()
+        async with self._read_session() as session:
+            result = await session.execute(
+                select(UserModel.email).where(UserModel.email.in_(emails)),
+            )
+            return set(result.scalars().all())
+
+    async def create_many(self, users: list[UserEntity]) -> list[UserEntity]:
+        """Creates many users in a single INSERT statement.
+
+        Users whose email already exists (e.g. created concurrently) are skipped.
+
+        Returns:
+            The users that were actually inserted.
+        """
+        if not users:
+            return []
+        mark_write()
+        async with self.session() as session:
+            result = await session.execute(
+                insert(UserModel)
+                .values([self._to_values(user) for user in users])
+                .on_conflict_do_nothing(index_elements=[UserModel.email])
+                .returning(UserModel.email),
+            )
+            inserted = set(result.scalars().all())
+            await session.commit()
+            return [user for user in users if user.email in inserted]
+
+    async def update_password_hash(self, email: str, hashed_password: str) -> None:
+        """Replaces the stored password hash of a user."""
+        mark_write()
+        async with self.session() as session:
+            result = await session.execute(
+                update(UserModel)
+                .where(UserModel.email == email)
+                .values(hashed_password=hashed_password),
+            )
+            if result.rowcount == 0:
+                raise UserNotFoundError(email)
+            await session.commit()
+
     async def delete(self, email: str) -> None:
         """Deletes a user from the database."""
+        mark_write()
         async with self.session() as session:
             model = await session.get(UserModel, email)
             if not model:
@@ -61,6 +250,17 @@ class UserPostgreRepository:
             await session.delete(model)
             await session.commit()
 
+    @staticmethod
+    def _to_values(user: UserEntity) -> dict:
+        """Converts a UserEntity object to the column values of a users row."""
+        return {
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "hashed_password": user.hashed_password,
+            "role": user.role,
+        }
+
     def _to_entity(self, model: UserModel) -> UserEntity:
         """Converts a UserModel object to a UserEntity object."""
         return UserEntity(
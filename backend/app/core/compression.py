@@ -0,0 +1,279 @@
+"""Response compression negotiated with `Accept-Encoding`.
+
+gzip is always available. brotli (`br`) and zstd are used when their optional
+packages are installed (`brotli`, `zstandard`, see the `compression` extra).
+
+Responses are compressed as they are sent: a single-body response is compressed at
+once (when larger than `config.compression_min_size`), a streamed one chunk by chunk,
+each chunk being flushed so the client receives it without waiting for the next one.
+Already compressed payloads (xlsx, zip, images...) and server-sent events are sent
+unchanged.
+"""
+
+import time
+import zlib
+from typing import Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import config
+from app.core.metrics import REGISTRY, Counter
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Content types never compressed: already compressed formats and event streams
+SKIPPED_CONTENT_TYPES = (
+    "application/vnd.openxmlformats-officedocument.",  # xlsx, docx, pptx (zip)
+    "application/zip",
+    "application/gzip",
+    "application/x-gzip",
+    "application/zstd",
+    "application/pdf",
+    "image/",
+    "audio/",
+    "video/",
+    "font/woff",
+    "text/event-stream",
+)
+COMPRESSIBLE_IMAGES = ("image/svg+xml",)
+
+COMPRESSION_BYTES_IN = REGISTRY.register(
+    Counter(
+        "http_compression_bytes_in_total",
+        "Response bytes before compression.",
+        ("encoding",),
+    ),
+)
+COMPRESSION_BYTES_SAVED = REGISTRY.register(
+    Counter(
+        "http_compression_bytes_saved_total",
+        "Response bytes saved by compression.",
+        ("encoding",),
+    ),
+)
+COMPRESSION_CPU = REGISTRY.register(
+    Counter(
+        "http_compression_cpu_seconds_total",
+        "CPU time spent compressing responses.",
+        ("encoding",),
+    ),
+)
+
+
+class Compressor(Protocol):
+    """Incremental compressor of a response body."""
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk and flushes it, so it can be decoded right away."""
+        ...
+
+    def finish(self) -> bytes:
+        """Returns the end of the compressed stream."""
+        ...
+
+
+class GzipCompressor:
+    """gzip compressor based on zlib."""
+
+    def __init__(self) -> None:
+        """Initializes the compressor with the configured level."""
+        self._compressor = zlib.compressobj(config.compression_gzip_level, wbits=31)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk and flushes it."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Returns the end of the compressed stream."""
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor:
+    """brotli compressor (requires the `brotli` package)."""
+
+    def __init__(self) -> None:
+        """Initializes the compressor with the configured quality."""
+        self._compressor = brotli.Compressor(quality=config.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk and flushes it."""
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        """Returns the end of the compressed stream."""
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    """zstd compressor (requires the `zstandard` package)."""
+
+    def __init__(self) -> None:
+        """Initializes the compressor with the configured level."""
+        compressor = zstandard.ZstdCompressor(level=config.compression_zstd_level)
+        self._compressor = compressor.compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk and flushes it."""
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+        )
+
+    def finish(self) -> bytes:
+        """Returns the end of the compressed stream."""
+        return self._compressor.flush()
+
+
+def available_compressors() -> dict[str, type[Compressor]]:
+    """Returns the compressors usable here, by encoding, in server preference order."""
+    compressors: dict[str, type[Compressor]] = {}
+    for encoding in config.compression_encodings:
+        if encoding == "zstd" and zstandard is not None:
+            compressors[encoding] = ZstdCompressor
+        elif encoding == "br" and brotli is not None:
+            compressors[encoding] = BrotliCompressor
+        elif encoding == "gzip":
+            compressors[encoding] = GzipCompressor
+    return compressors
+
+
+def negotiate_encoding(accept_encoding: str, supported: list[str]) -> str | None:
+    """Picks the encoding of a response from the `Accept-Encoding` request header.
+
+    Args:
+        accept_encoding: The header value, e.g. "gzip, br;q=0.9, *;q=0".
+        supported: The encodings the server can produce, preferred first.
+
+    Returns:
+        The supported encoding with the highest quality for the client (ties are
+        broken by the server preference), or None to send the response unencoded.
+    """
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.strip().split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.strip().lower()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in supported:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _is_compressible(headers: Headers) -> bool:
+    """Checks whether a response may be compressed, from its headers."""
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "").lower()
+    if content_type.startswith(COMPRESSIBLE_IMAGES):
+        return True
+    return not content_type.startswith(SKIPPED_CONTENT_TYPES)
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding accepted by the client."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initializes the middleware around an ASGI application."""
+        self.app = app
+        self.compressors = available_compressors()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request, compressing its response if negotiated."""
+        # HEAD responses declare the length of a body they do not send
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not config.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoding = negotiate_encoding(accept_encoding, list(self.compressors))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.compressors[encoding])
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Wraps `send` to compress the body of one response."""
+
+    def __init__(self, send: Send, encoding: str, compressor_type: type[Compressor]) -> None:
+        self._send = send
+        self.encoding = encoding
+        self.compressor_type = compressor_type
+        self.compressor: Compressor | None = None
+        self.start_message: Message | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        """Sends a message of the response, compressing its body when relevant."""
+        if message["type"] == "http.response.start":
+            # Held until the first body chunk tells whether compression is worth it
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            content_length = int(headers.get("content-length", len(body)))
+            # A stream of unknown length is compressed whatever its first chunk size
+            small = content_length < config.compression_min_size and not (
+                more_body and "content-length" not in headers
+            )
+            if small or not _is_compressible(headers):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.compressor = self.compressor_type()
+            compressed = self._compress(body, finish=not more_body)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(compressed))
+            await self._send(start)
+            await self._send({**message, "body": compressed})
+            return
+
+        await self._send({**message, "body": self._compress(body, finish=not more_body)})
+
+    def _compress(self, data: bytes, *, finish: bool) -> bytes:
+        """Compresses a chunk (and ends the stream with the last one), recording metrics."""
+        start = time.thread_time()
+        compressed = self.compressor.compress(data) if data else b""
+        if finish:
+            compressed += self.compressor.finish()
+        COMPRESSION_CPU.inc(time.thread_time() - start, (self.encoding,))
+        COMPRESSION_BYTES_IN.inc(len(data), (self.encoding,))
+        COMPRESSION_BYTES_SAVED.inc(len(data) - len(compressed), (self.encoding,))
+        return compressed
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,12 +13,79 @@ class Settings(BaseSettings):
     Attributes:
         app_host (str): The host address for the application. Defaults to "localhost".
         app_port (int): The port number for the application. Defaults to 8000.
+        repository_backend (str): "postgres" to store data in PostgreSQL, "memory" to keep
+            it in the worker process (lost on restart, no database needed: benchmarks,
+            tests and demos). Defaults to "postgres".
         postgre_host (str): The host address for the PostgreSQL database. Defaults to "localhost".
         postgre_port (int): The port number for the PostgreSQL database. Defaults to 5432.
         postgre_user (str): The username for the PostgreSQL database.
         postgre_db (str): The name of the PostgreSQL database.
         postgre_password (str): The password for the PostgreSQL database.
         database_url (str): The full database URL constructed from the PostgreSQL configuration.
+        replica_database_url (str | None): URL of a read replica. When set, read-only
+            repository methods use it unless the request wrote or asked for the primary.
+        db_echo (bool): Log every SQL statement. Defaults to False.
+        db_pool_size (int): Connections kept open per worker. Defaults to 5.
+        db_max_overflow (int): Extra connections opened under load per worker. Defaults to 10.
+        db_pool_timeout (float): Seconds to wait for a free connection. Defaults to 30.
+        db_pool_recycle (int): Seconds after which a connection is replaced, -1 to disable.
+        db_pool_pre_ping (bool): Check connections are alive on checkout. Defaults to True.
+        db_statement_cache_size (int): Prepared statements cached per asyncpg connection.
+        db_warmup_connections (int | None): Connections opened and prepared before reporting
+            ready. Defaults to db_pool_size.
+        warmup_recent_items (int): Most recent items read at warm-up to prime the database
+            caches, 0 to disable. Defaults to 0.
+        profiling_enabled (bool): Allow admins to profile single requests with the
+            `X-Profile` header or `profile` query flag. Defaults to False.
+        profiling_max_stored (int): Profiles kept in memory per worker. Defaults to 20.
+        profiling_top_functions (int): Functions kept in each profile. Defaults to 40.
+        log_level (str): Level of the application logger. Defaults to "DEBUG".
+        log_format (str): "json" for JSON lines, "text" for human-readable lines.
+        log_file (str | None): Rotating log file, None to log to the console only.
+        log_sampling (dict[str, float]): Fraction of the records below WARNING kept, by
+            logger name (e.g. {"app_logger.sql": 0.1}). Other loggers keep everything.
+        slow_query_threshold_ms (float | None): Statements running longer are logged and
+            kept for /internal/slow-queries, None to disable. Defaults to 500.
+        slow_query_explain (bool): Capture the plan of new slow statements in the
+            background with EXPLAIN (without ANALYZE). Defaults to False.
+        slow_query_max_stored (int): Slow statements kept per worker. Defaults to 100.
+        slow_query_max_plans (int): Plans kept per worker. Defaults to 20.
+        compression_enabled (bool): Compress responses negotiated with Accept-Encoding.
+        compression_min_size (int): Responses smaller than this (in bytes) are sent
+            uncompressed. Defaults to 1024.
+        compression_encodings (list[str]): Encodings offered, preferred first, among
+            "zstd", "br" and "gzip" (zstd and br need their optional packages).
+        compression_gzip_level (int): gzip level, 1 to 9. Defaults to 6.
+        compression_brotli_quality (int): brotli quality, 0 to 11. Defaults to 4.
+        compression_zstd_level (int): zstd level, 1 to 22. Defaults to 3.
+        item_history_write_behind (bool): Write the item history events in batches in the
+            background instead of in the transaction of each change (faster writes, but
+            buffered events are lost if the worker dies). Defaults to False.
+        item_history_batch_size (int): Events inserted per batch by the write-behind
+            queue. Defaults to 500.
+        item_history_flush_interval_ms (int): Longest wait before the write-behind queue
+            inserts its events. Defaults to 200.
+        item_history_max_buffered (int): Events kept by the write-behind queue while the
+            database is unavailable, the oldest are dropped beyond. Defaults to 100000.
+        item_snapshot_interval_hours (float | None): Time between the snapshots of the
+            items on which past state queries (`as_of`) replay the history, None to only
+            take them on demand (/internal/item-snapshots). Defaults to 24.
+        item_snapshot_retention_days (float): Time all the item snapshots are kept, each
+            holding a copy of every item. Older ones are thinned out to the first of each
+            month (UTC), so past state queries further back replay at most about a month
+            of history. Defaults to 30.
+        item_snapshot_settle_seconds (int): Age of the most recent events a snapshot
+            counts as included, longer than any item write transaction. Defaults to 60.
+        item_changes_settle_seconds (float): Age of the most recent item changes a changes
+            cursor moves past, longer than any item write transaction: the changes of
+            the transactions still running then are not missed. Defaults to 5.
+        item_tombstone_retention_days (float): Time the deleted items are kept for the
+            changes feed, beyond which older cursors expire. Defaults to 30.
+        notification_queue_size (int): Notifications (about distinct subjects) pending
+            per stream before the oldest are dropped and the client asked to resync.
+            Defaults to 100.
+        notification_keepalive_seconds (float): Longest silence on a notification stream,
+            filled with comments so proxies keep it open. Defaults to 15.
     """
     app_host: str = "localhost"
     app_port: int = 8000
@@ -27,8 +96,19 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  # refresh token lifetime
     ALGORITHM: str = "HS256"
 
+    # Password hashing policy
+    PASSWORD_HASH_SCHEMES: list[str] = ["bcrypt"]  # first scheme is used for new hashes
+    BCRYPT_ROUNDS: int = 12  # cost of new hashes, older hashes are upgraded on login
+    BCRYPT_MAX_ROUNDS: int | None = None  # set to force a downgrade of costlier hashes
+    PASSWORD_HASH_TARGET_MS: int = 250  # target verify latency used by calibration
+    PASSWORD_HASH_CALIBRATE_ON_STARTUP: bool = False  # override BCRYPT_ROUNDS at startup
+    PASSWORD_HASH_WORKERS: int | None = None  # threads hashing in parallel, None = CPU count
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
+    # Storage of the repositories
+    repository_backend: Literal["postgres", "memory"] = "postgres"
+
     # Postgre config
     postgre_host: str = "localhost"
     postgre_port: int = 5432
@@ -40,5 +120,60 @@ class Settings(BaseSettings):
         f"@{postgre_host}:{postgre_port}/{postgre_db}"
     )
 
+    replica_database_url: str | None = None
+
+    # Database engine and connection pool (sized per worker process)
+    db_echo: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+
+    # Warm-up run after startup, before /health/ready reports ready
+    db_warmup_connections: int | None = None
+    warmup_recent_items: int = 0
+
+    # On-demand request profiling, for admins only
+    profiling_enabled: bool = False
+    profiling_max_stored: int = 20
+    profiling_top_functions: int = 40
+
+    # Logging
+    log_level: str = "DEBUG"
+    log_format: Literal["json", "text"] = "json"
+    log_file: str | None = "logs/app.log"
+    log_sampling: dict[str, float] = {}
+
+    # Slow-query log
+    slow_query_threshold_ms: float | None = 500.0
+    slow_query_explain: bool = False
+    slow_query_max_stored: int = 100
+    slow_query_max_plans: int = 20
+
+    # Response compression
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_encodings: list[str] = ["zstd", "br", "gzip"]
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
+    # Item history (item_events)
+    item_history_write_behind: bool = False
+    item_history_batch_size: int = 500
+    item_history_flush_interval_ms: int = 200
+    item_history_max_buffered: int = 100_000
+    item_snapshot_interval_hours: float | None = 24.0
+    item_snapshot_retention_days: float = 30.0
+    item_snapshot_settle_seconds: int = 60
+    item_changes_settle_seconds: float = 5.0
+    item_tombstone_retention_days: float = 30.0
+
+    # Notification streams
+    notification_queue_size: int = 100
+    notification_keepalive_seconds: float = 15.0
+
 
 config = Settings()
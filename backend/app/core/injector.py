@@ -1,19 +1,108 @@
 # app/core/injector.py
+import asyncio
+import contextlib
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import partial
 
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
 
 from app.business.services.auth_service import AuthService
 from app.business.services.item_service import ItemService
+from app.business.services.ticket_service import TicketService
 from app.business.services.user_service import UserService
-from app.connections.dao.postgre_dao import Base
+from app.connections.dao.engine import create_engine_from_config
+from app.connections.dao.instrumentation import instrument_engine
+from app.connections.dao.item_history import ItemHistoryWriter, publish_item_event
+from app.connections.dao.memory_dao import MemoryDatabase
+from app.connections.dao.notification_listener import NotificationListener
+from app.connections.dao.schema import check_schema
+from app.connections.dao.warmup import warm_up
+from app.connections.repositories.item_memory_repository import ItemMemoryRepository
 from app.connections.repositories.item_postgre_repository import ItemPostgreRepository
-from app.connections.repositories.refresh_token_repository import RefreshTokenRepository
+from app.connections.repositories.refresh_token_memory_repository import (
+    RefreshTokenMemoryRepository,
+)
+from app.connections.repositories.refresh_token_postgre_repository import (
+    RefreshTokenPostgreRepository,
+)
+from app.connections.repositories.ticket_memory_repository import (
+    TicketMemoryRepository,
+    publish_ticket,
+)
+from app.connections.repositories.ticket_postgre_repository import TicketPostgreRepository
+from app.connections.repositories.user_memory_repository import UserMemoryRepository
 from app.connections.repositories.user_postgre_repository import UserPostgreRepository
 from app.core.config import config
+from app.core.log import logger, setup_logging, shutdown_logging
+from app.core.notifications import NotificationHub
+from app.core.security import (
+    calibrate_bcrypt_rounds,
+    set_bcrypt_rounds,
+    shutdown_hash_executor,
+)
+from app.core.timing import PhaseTimer
+
+
+async def _warm_up_then_ready(app: FastAPI) -> None:
+    """Warms up the connection pool, then marks the application as ready."""
+    connections = config.db_warmup_connections
+    if connections is None:
+        connections = config.db_pool_size
+
+    try:
+        await warm_up(app.state.engine, connections, config.warmup_recent_items)
+        if app.state.replica_engine is not None:
+            await warm_up(app.state.replica_engine, connections, config.warmup_recent_items)
+        logger.info(f"Warm-up completed ({connections} connections)")
+    except Exception as e:  # noqa: BLE001
+        # Readiness still requires a successful database ping
+        logger.warning(f"Warm-up failed: {e}")
+    finally:
+        app.state.warmed_up = True
+
+
+# Time between checks that the latest item snapshot is older than the interval
+SNAPSHOT_CHECK_SECONDS = 300
+
+
+async def _snapshot_items_periodically(item_service: ItemService, interval: timedelta) -> None:
+    """Snapshots the items whenever the latest snapshot is older than `interval`.
+
+    Every worker runs this loop, but a snapshot taken by one is seen by the others. The
+    worker taking a snapshot then thins out the ones older than the retention.
+    """
+    while True:
+        try:
+            snapshot = await item_service.take_history_snapshot(min_interval=interval)
+            if snapshot is not None:
+                logger.info(f"Took item snapshot {snapshot.id} ({snapshot.item_count} items)")
+                purged = await item_service.purge_history_snapshots()
+                if purged:
+                    logger.info(f"Thinned out {purged} item snapshots")
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Item snapshot failed: {e}")
+        await asyncio.sleep(min(SNAPSHOT_CHECK_SECONDS, interval.total_seconds()))
+
+
+# Time between two purges of the tombstones of the deleted items
+TOMBSTONE_PURGE_SECONDS = 3600
+
+
+async def _purge_item_tombstones_periodically(item_service: ItemService) -> None:
+    """Purges the tombstones of the items deleted longer ago than the retention."""
+    while True:
+        try:
+            purged = await item_service.purge_item_tombstones()
+            if purged:
+                logger.info(f"Purged {purged} item tombstones")
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Item tombstone purge failed: {e}")
+        await asyncio.sleep(TOMBSTONE_PURGE_SECONDS)
 
 
 @asynccontextmanager
@@ -21,7 +110,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager.
 
     This async context manager handles the application's startup and shutdown processes.
-    It creates the database engine, sets up repositories and services, and manages
+    It creates the database engine (or the in-memory tables, depending on
+    `config.repository_backend`), sets up repositories and services, and manages
     the database connection lifecycle.
 
     Args:
@@ -30,30 +120,124 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         None: The context manager yields control to the application during its runtime.
     """
-    # Async Postgres engine
-    engine = create_async_engine(config.database_url, echo=True, future=True)
-    async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    timer = PhaseTimer()
+    app.state.warmed_up = False
+    setup_logging()
+
+    # Password hashing cost tuned to this machine (optional)
+    if config.PASSWORD_HASH_CALIBRATE_ON_STARTUP:
+        rounds = await run_in_threadpool(calibrate_bcrypt_rounds)
+        set_bcrypt_rounds(rounds)
+        logger.info(f"Calibrated bcrypt cost to {rounds} rounds")
+        timer.mark("password_calibration")
+
+    engine = replica_engine = memory_db = history_writer = listener = None
+    notification_hub = NotificationHub()
+    if config.repository_backend == "memory":
+        # Data kept in this worker process, no database involved
+        memory_db = MemoryDatabase()
+        memory_db.item_event_listeners.append(partial(publish_item_event, notification_hub))
+        memory_db.ticket_listeners.append(partial(publish_ticket, notification_hub))
+        item_repo = ItemMemoryRepository(memory_db)
+        user_repo = UserMemoryRepository(memory_db)
+        refresh_repo = RefreshTokenMemoryRepository(memory_db)
+        ticket_repo = TicketMemoryRepository(memory_db)
+        timer.mark("repositories")
+    else:
+        # Async Postgres engine
+        engine = create_engine_from_config()
+        instrument_engine(engine, "primary")
+        async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        # Optional read replica for read-only repository methods
+        read_session = async_session
+        if config.replica_database_url:
+            replica_engine = create_engine_from_config(config.replica_database_url)
+            instrument_engine(replica_engine, "replica")
+            read_session = sessionmaker(
+                replica_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+            )
+        timer.mark("engine")
 
-    # Create tables if not exist (optional)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        # Check the schema is migrated (`alembic upgrade head`)
+        await check_schema(engine)
+        timer.mark("schema_check")
 
-    # Repositories
-    item_repo = ItemPostgreRepository(async_session)
-    user_repo = UserPostgreRepository(async_session)
-    refresh_repo = RefreshTokenRepository(async_session)
+        # Item history written in batches in the background (optional)
+        if config.item_history_write_behind:
+            history_writer = ItemHistoryWriter(
+                async_session,
+                batch_size=config.item_history_batch_size,
+                flush_interval=config.item_history_flush_interval_ms / 1000,
+                max_buffered=config.item_history_max_buffered,
+            )
+            history_writer.start()
+
+        # One connection per worker listening to the notifications of all its clients
+        listener = NotificationListener(config.database_url, notification_hub)
+        listener.start()
+
+        # Repositories
+        item_repo = ItemPostgreRepository(async_session, read_session, history_writer)
+        user_repo = UserPostgreRepository(async_session, read_session)
+        refresh_repo = RefreshTokenPostgreRepository(async_session, read_session)
+        ticket_repo = TicketPostgreRepository(async_session, read_session, history_writer)
 
     # Services
     item_service = ItemService(item_repo)
     user_service = UserService(user_repo)
     auth_service = AuthService(user_repo, refresh_repo)
+    ticket_service = TicketService(ticket_repo, item_repo, user_repo)
 
     # Attach to app.state
+    app.state.engine = engine
+    app.state.replica_engine = replica_engine
+    app.state.memory_db = memory_db
     app.state.item_service = item_service
     app.state.user_service = user_service
     app.state.auth_service = auth_service
+    app.state.ticket_service = ticket_service
+    app.state.notification_hub = notification_hub
+    timer.mark("services")
+
+    app.state.startup_phases = timer.as_dict()
+    logger.info(f"Startup completed in {timer.total * 1000:.0f} ms")
+
+    # Warm up in the background: /health answers right away, /health/ready after warm-up
+    warmup_task = None
+    if engine is not None:
+        warmup_task = asyncio.create_task(_warm_up_then_ready(app))
+    else:
+        app.state.warmed_up = True
+
+    snapshot_task = None
+    if config.item_snapshot_interval_hours is not None:
+        snapshot_task = asyncio.create_task(
+            _snapshot_items_periodically(
+                item_service,
+                timedelta(hours=config.item_snapshot_interval_hours),
+            ),
+        )
+
+    purge_task = asyncio.create_task(_purge_item_tombstones_periodically(item_service))
 
     try:
         yield
     finally:
-        await engine.dispose()
+        for task in (warmup_task, snapshot_task, purge_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        if listener is not None:
+            await listener.stop()
+        if history_writer is not None:
+            await history_writer.stop()
+        if engine is not None:
+            await engine.dispose()
+        if replica_engine is not None:
+            await replica_engine.dispose()
+        shutdown_hash_executor()
+        shutdown_logging()
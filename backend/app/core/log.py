@@ -1,26 +1,258 @@
+"""Application logging.
+
+Log calls never do I/O on the calling thread: records are put on an unbounded queue
+by a QueueHandler, and a QueueListener thread formats and writes them to the console
+and to a rotating file. Records are written as JSON lines (or as text with
+`LOG_FORMAT=text`) and carry the id of the request that emitted them.
+"""
+
+import atexit
+import datetime
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import TextIO, override
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import config
+
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+_request_scope: ContextVar[Scope | None] = ContextVar("request_scope", default=None)
+
+# Attributes of every LogRecord, the other ones come from `extra=`
+_RECORD_ATTRIBUTES = {
+    *vars(logging.LogRecord("", 0, "", 0, "", (), None)),
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+class LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler creating its directory and file on the first record.
+
+    Importing this module therefore touches neither the filesystem nor file handles.
+    """
+
+    def __init__(self, filename: str, **kwargs: object) -> None:
+        """Initializes the handler without opening the file."""
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self) -> TextIO:
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    @override
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.UTC).isoformat(
+                timespec="milliseconds",
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        entry.update(
+            (key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES
+        )
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Adds the request id to records and samples high-volume loggers.
+
+    Runs on the thread emitting the record, where the request context is available.
+    Sampling rates apply to a logger and its children (e.g. `app_logger.sql`), and
+    never drop warnings or errors.
+    """
+
+    def __init__(self, sampling: dict[str, float]) -> None:
+        """Initializes the filter with the kept fraction of records by logger name."""
+        super().__init__()
+        self.sampling = sampling
+        self._rates: dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        """Returns the sampling rate of a logger, inherited from its closest parent."""
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = 1.0
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:i])
+                if prefix in self.sampling:
+                    rate = self.sampling[prefix]
+                    break
+            self._rates[name] = rate
+        return rate
+
+    @override
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            rate = self._rate(record.name)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler leaving the formatting of records to the listener thread."""
+
+    @override
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what cannot be pickled or may change after the call returns
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
-# Create logs directory if it doesn't exist
-Path("logs").mkdir(parents=True, exist_ok=True)
 
 # Configure logger
 logger = logging.getLogger("app_logger")
-logger.setLevel(logging.DEBUG)  # Change to INFO or WARNING in production
-
-# Format for logs
-formatter = logging.Formatter(
-    "[%(asctime)s] [%(levelname)s] %(name)s: %(message)s",
-    "%Y-%m-%d %H:%M:%S",
-)
-
-# Console handler
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
-
-# File handler with rotation
-file_handler = RotatingFileHandler("logs/app.log", maxBytes=1_000_000, backupCount=3)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+logger.setLevel(config.log_level.upper())
+
+_listener: QueueListener | None = None
+
+
+def _build_handlers() -> list[logging.Handler]:
+    """Builds the handlers run by the listener thread."""
+    if config.log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "[%(asctime)s] [%(levelname)s] [%(request_id)s] %(name)s: %(message)s",
+            "%Y-%m-%d %H:%M:%S",
+        )
+
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers: list[logging.Handler] = [console_handler]
+
+    # File handler with rotation (logs directory is created on first write)
+    if config.log_file:
+        file_handler = LazyRotatingFileHandler(
+            config.log_file,
+            maxBytes=1_000_000,
+            backupCount=3,
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    return handlers
+
+
+def setup_logging() -> None:
+    """Starts the listener thread writing the queued records, if not running."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter(config.log_sampling))
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Writes the queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+setup_logging()
+atexit.register(shutdown_logging)
+
+
+class RequestIdMiddleware:
+    """Gives each request an id, available to log records and echoed in `X-Request-ID`.
+
+    The id sent by the client (or a proxy) in `X-Request-ID` is kept, so logs can be
+    correlated across services. Otherwise a new one is generated.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initializes the middleware around an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request within the context of its request id."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = uuid.uuid4().hex.encode()
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER and 0 < len(value) <= MAX_REQUEST_ID_LENGTH:
+                request_id = value
+                break
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER, request_id)]
+            await send(message)
+
+        token = request_id_var.set(request_id.decode("latin-1"))
+        scope_token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_scope.reset(scope_token)
+            request_id_var.reset(token)
+
+
+def get_request_route() -> str | None:
+    """Returns the method and route template of the current request (e.g. GET /api/items).
+
+    Falls back to the request path before routing or when no route matched, and
+    returns None outside of a request.
+    """
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope['method']} {route.path if route else scope['path']}"
+
+
+def get_request_header(name: bytes) -> str | None:
+    """Returns a header of the current request (lowercase name), or None if absent.
+
+    Returns None outside of a request as well.
+    """
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
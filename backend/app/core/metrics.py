@@ -0,0 +1,259 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Metrics are plain in-memory counters updated from the event loop, so recording a
+value costs a dict lookup and a few additions. Values are only formatted when
+`/metrics` is scraped. Each worker process exposes its own metrics.
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import override
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escapes a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Labels, values: Labels, extra: str = "") -> str:
+    """Formats label pairs as `{name="value",...}` (empty string without labels)."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Formats a sample value, keeping integers without a decimal part."""
+    if value == int(value) and abs(value) < 1e15:  # noqa: PLR2004
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric:
+    """Base class of the metric types, holding one value per set of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def header(self) -> list[str]:
+        """Returns the HELP and TYPE lines of the metric."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        """Returns the sample lines of the metric."""
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """A value that only increases (e.g. a number of requests)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        """Initializes the counter with no samples."""
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Increases the counter of the given label values."""
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    @override
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down (e.g. a number of requests in flight)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()) -> None:
+        """Initializes the gauge with no samples."""
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[Labels, float] = {}
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Sets the gauge of the given label values."""
+        self.values[labels] = value
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Increases the gauge of the given label values."""
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Decreases the gauge of the given label values."""
+        self.inc(-amount, labels)
+
+    @override
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class CallbackGauge(_Metric):
+    """A gauge whose samples are computed by a callback when metrics are scraped."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], dict[Labels, float]],
+        labelnames: Labels = (),
+    ) -> None:
+        """Initializes the gauge with the callback returning {label values: value}."""
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    @override
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.callback().items()
+        ]
+
+
+class CallbackCounter(CallbackGauge):
+    """A counter maintained elsewhere (e.g. by the pool), read when metrics are scraped."""
+
+    kind = "counter"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. latencies) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Initializes the histogram with the given upper bounds (+Inf is implicit)."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [bucket counts..., +Inf count, sum]
+        self.values: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Records an observation for the given label values."""
+        data = self.values.get(labels)
+        if data is None:
+            data = self.values[labels] = [0.0] * (len(self.buckets) + 2)
+        data[bisect_left(self.buckets, value)] += 1
+        data[-1] += value
+
+    @override
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, data in self.values.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), data, strict=False):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(data[-1])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(cumulative)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of the metrics exposed by the application."""
+
+    def __init__(self) -> None:
+        """Initializes an empty registry."""
+        self.metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        """Adds a metric to the registry (replacing one with the same name)."""
+        self.metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, names: Iterable[str]) -> None:
+        """Removes metrics from the registry."""
+        for name in names:
+            self.metrics.pop(name, None)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template, method and status.",
+        ("method", "route", "status"),
+    ),
+)
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being handled."),
+)
+
+
+class MetricsMiddleware:
+    """Records the latency of each HTTP request and the number of requests in flight.
+
+    Requests are labelled with their route template (e.g. /api/items/{item_id}), so
+    the number of series stays bounded whatever the path parameters.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initializes the middleware around an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request, timing it until its response is fully sent."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                (scope["method"], route.path if route else "<unmatched>", str(status)),
+            )
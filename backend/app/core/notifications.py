@@ -0,0 +1,133 @@
+"""In-process fan-out of notifications to the connected clients of a worker.
+
+Notifications arrive once per worker (from the database listener, or straight from
+the memory repositories) and are published to the `NotificationHub`, which hands
+them to the subscriptions of the users they concern, and to the admins' ones.
+
+Each subscription (one per open stream) buffers its pending notifications, so a slow
+client never holds back the others or the publisher:
+- a notification about the same subject as a pending one (the same item, for the
+  "item" kind: the `<kind>_id` field) replaces it, the client only needs the latest,
+  and counts the changes it stands for in `coalesced`;
+- when `config.notification_queue_size` subjects are pending, the oldest is dropped
+  and the client is asked to resync (reload its data) once it catches up.
+"""
+
+import asyncio
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+
+from app.core.config import config
+from app.core.metrics import REGISTRY, CallbackGauge, Counter
+
+NOTIFICATIONS = REGISTRY.register(
+    Counter(
+        "notifications_total",
+        "Notifications handed to subscriptions, by outcome (queued, coalesced, dropped).",
+        ("outcome",),
+    ),
+)
+
+
+class Subscription:
+    """Pending notifications of one stream, coalesced by subject."""
+
+    def __init__(self, user: str, *, is_admin: bool, max_pending: int) -> None:
+        """Initializes an empty subscription of a user."""
+        self.user = user
+        self.is_admin = is_admin
+        self.max_pending = max_pending
+        self.resync = False  # notifications were dropped
+        self._pending: OrderedDict[tuple, dict] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def push(self, notification: dict) -> None:
+        """Queues a notification, replacing a pending one about the same subject."""
+        kind = notification.get("kind")
+        key = (kind, notification.get(f"{kind}_id"))
+        previous = self._pending.pop(key, None)  # the latest goes to the end
+        if previous is not None:
+            outcome = "coalesced"
+            notification = {**notification, "coalesced": previous.get("coalesced", 1) + 1}
+        elif len(self._pending) >= self.max_pending:
+            outcome = "dropped"
+            self._pending.popitem(last=False)
+            self.resync = True
+        else:
+            outcome = "queued"
+        self._pending[key] = notification
+        NOTIFICATIONS.inc(1, (outcome,))
+        self._ready.set()
+
+    def request_resync(self) -> None:
+        """Asks the client to reload its data, e.g. when notifications may have been missed."""
+        self._pending.clear()
+        self.resync = True
+        self._ready.set()
+
+    async def wait(self, seconds: float) -> bool:
+        """Waits for pending notifications, returning False after `seconds` without."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), seconds)
+        except TimeoutError:
+            return False
+        return True
+
+    def drain(self) -> tuple[bool, list[dict]]:
+        """Takes the resync flag and the pending notifications, oldest first."""
+        resync, notifications = self.resync, list(self._pending.values())
+        self.resync = False
+        self._pending.clear()
+        self._ready.clear()
+        return resync, notifications
+
+
+class NotificationHub:
+    """Routes the notifications of a worker to the subscriptions they concern."""
+
+    def __init__(self) -> None:
+        """Initializes the hub without subscriptions."""
+        self._by_user: defaultdict[str, set[Subscription]] = defaultdict(set)
+        self._admins: set[Subscription] = set()
+        REGISTRY.register(
+            CallbackGauge(
+                "notification_subscriptions",
+                "Notification streams open on this worker.",
+                lambda: {(): sum(len(subs) for subs in self._by_user.values())},
+            ),
+        )
+
+    def subscribe(self, user: str, *, is_admin: bool = False) -> Subscription:
+        """Opens a subscription to the notifications of a user (all of them for admins)."""
+        subscription = Subscription(
+            user,
+            is_admin=is_admin,
+            max_pending=config.notification_queue_size,
+        )
+        self._by_user[user].add(subscription)
+        if is_admin:
+            self._admins.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Closes a subscription."""
+        subscriptions = self._by_user.get(subscription.user)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._by_user[subscription.user]
+        self._admins.discard(subscription)
+
+    def publish(self, notification: dict, recipients: Iterable[str]) -> None:
+        """Hands a notification to the subscriptions of its recipients, and of the admins."""
+        targets = set(self._admins)
+        for user in recipients:
+            targets.update(self._by_user.get(user, ()))
+        for subscription in targets:
+            subscription.push(notification)
+
+    def request_resync(self) -> None:
+        """Asks every client to reload its data (notifications may have been missed)."""
+        for subscriptions in self._by_user.values():
+            for subscription in subscriptions:
+                subscription.request_resync()
@@ -0,0 +1,202 @@
+"""On-demand profiling of single requests, for admins.
+
+When `config.profiling_enabled` is set, an admin can send a request with the
+`X-Profile: 1` header or the `profile=1` query parameter. The request then runs
+under cProfile, and the profile is stored in memory under the id returned in the
+`X-Profile-Id` response header (see `/internal/profiles`).
+
+Besides the function statistics, each profile splits the wall time of the request
+between SQL statements (DB), CPU of the event loop thread (e.g. pydantic validation
+or entity conversions), and the remaining waits (pool checkouts, thread pools...).
+"""
+
+import asyncio
+import cProfile
+import pstats
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from http import HTTPStatus
+from urllib.parse import parse_qs
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import config
+from app.core.security import is_admin_token
+from app.core.timing import get_current_time
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+_TRUE_VALUES = {"1", "true", "yes"}
+
+
+@dataclass
+class RequestTimings:
+    """Time spent in SQL statements by the current request."""
+
+    db_time: float = 0.0
+    db_statements: int = 0
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def record_db_time(elapsed: float) -> None:
+    """Adds the duration of a SQL statement to the current request, if it is profiled."""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.db_time += elapsed
+        timings.db_statements += 1
+
+
+class ProfileStore:
+    """The last profiles of this worker, the oldest being dropped first."""
+
+    def __init__(self, max_size: int) -> None:
+        """Initializes an empty store keeping at most `max_size` profiles."""
+        self.max_size = max_size
+        self._profiles: OrderedDict[str, dict] = OrderedDict()
+
+    def add(self, profile: dict) -> None:
+        """Stores a profile under its id."""
+        self._profiles[profile["id"]] = profile
+        while len(self._profiles) > self.max_size:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> dict | None:
+        """Returns a profile by id, or None if it is unknown or was dropped."""
+        return self._profiles.get(profile_id)
+
+    def summaries(self) -> list[dict]:
+        """Returns the stored profiles without their function statistics, newest first."""
+        return [
+            {key: value for key, value in profile.items() if key != "functions"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+
+PROFILES = ProfileStore(config.profiling_max_stored)
+
+
+def _function_stats(profiler: cProfile.Profile, limit: int) -> list[dict]:
+    """Returns the `limit` functions with the highest cumulative time."""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "own_ms": own_time * 1000,
+            "cumulative_ms": cumulative_time * 1000,
+        }
+        for (filename, line, name), (_, calls, own_time, cumulative_time, _) in rows
+    ]
+
+
+def _wants_profile(scope: Scope) -> bool:
+    """Checks whether the request asks to be profiled."""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            return value.decode("latin-1").lower() in _TRUE_VALUES
+
+    query = parse_qs(scope["query_string"].decode("latin-1"))
+    return any(value.lower() in _TRUE_VALUES for value in query.get(PROFILE_QUERY_PARAM, []))
+
+
+def _is_admin(scope: Scope) -> bool:
+    """Checks whether the request carries the access token of an admin."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return is_admin_token(value.decode("latin-1"))
+    return False
+
+
+class ProfilingMiddleware:
+    """Profiles the requests of admins asking for it, when profiling is enabled.
+
+    Only one request is profiled at a time: cProfile records everything running on
+    the event loop thread, so other requests served meanwhile by the worker also
+    show up in the profile. A profiling request arriving while another one is
+    profiled is served normally, with `X-Profile-Id: busy`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initializes the middleware around an ASGI application."""
+        self.app = app
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request, profiling it if requested by an admin."""
+        if scope["type"] != "http" or not config.profiling_enabled or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not _is_admin(scope):
+            response = JSONResponse(
+                {"detail": "Profiling requires an admin access token"},
+                status_code=HTTPStatus.FORBIDDEN,
+            )
+            await response(scope, receive, send)
+            return
+
+        if self._lock.locked():
+            await self.app(scope, receive, self._with_header(send, b"busy"))
+            return
+
+        async with self._lock:
+            await self._profile(scope, receive, send)
+
+    @staticmethod
+    def _with_header(send: Send, profile_id: bytes) -> Send:
+        """Wraps `send` to add the profile id header to the response."""
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id)]
+            await send(message)
+
+        return send_wrapper
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Runs the request under cProfile and stores its profile."""
+        profile_id = uuid.uuid4().hex
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        profiler = cProfile.Profile()
+        started_at = get_current_time()
+        start, cpu_start = time.perf_counter(), time.thread_time()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, self._with_header(send_wrapper, profile_id.encode()))
+        finally:
+            profiler.disable()
+            wall, cpu = time.perf_counter() - start, time.thread_time() - cpu_start
+            _request_timings.reset(token)
+
+            PROFILES.add(
+                {
+                    "id": profile_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "started_at": started_at.isoformat(),
+                    "wall_ms": wall * 1000,
+                    "db_ms": timings.db_time * 1000,
+                    "db_statements": timings.db_statements,
+                    "cpu_ms": cpu * 1000,
+                    "other_wait_ms": max(wall - timings.db_time - cpu, 0.0) * 1000,
+                    "functions": _function_stats(profiler, config.profiling_top_functions),
+                },
+            )
@@ -1,12 +1,109 @@
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 
-from jose import jwt
+from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.business.entities.user_entity import UserRole
 from app.core.config import config
+from app.core.log import get_request_header
+from app.core.metrics import REGISTRY, CallbackGauge
 from app.core.timing import get_current_time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 31
+
+
+def build_password_context(rounds: int | None = None) -> CryptContext:
+    """Builds the password hashing context from the configured policy.
+
+    New hashes use the first configured scheme with the given bcrypt cost. Hashes
+    made with a deprecated scheme, a lower cost, or a cost above `BCRYPT_MAX_ROUNDS`
+    are reported by `needs_update` so they can be upgraded on the next login.
+
+    Args:
+        rounds: The bcrypt cost factor. If None, use `config.BCRYPT_ROUNDS`.
+
+    Returns:
+        The configured CryptContext.
+    """
+    if rounds is None:
+        rounds = config.BCRYPT_ROUNDS
+
+    settings = {
+        "schemes": config.PASSWORD_HASH_SCHEMES,
+        "deprecated": "auto",
+        "bcrypt__default_rounds": rounds,
+        "bcrypt__min_rounds": rounds,
+    }
+    if config.BCRYPT_MAX_ROUNDS is not None:
+        settings["bcrypt__max_rounds"] = max(rounds, config.BCRYPT_MAX_ROUNDS)
+
+    return CryptContext(**settings)
+
+
+pwd_context = build_password_context()
+
+# bcrypt releases the GIL while hashing, so threads spread the work over all cores
+_hash_executor: ThreadPoolExecutor | None = None
+# Tasks submitted to the executor and not finished yet (running or queued)
+_hash_tasks_in_flight = 0
+
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    """Replaces the password hashing context with one using the given bcrypt cost."""
+    global pwd_context
+    pwd_context = build_password_context(rounds)
+
+
+def calibrate_bcrypt_rounds(
+    target_ms: float | None = None,
+    min_rounds: int = 10,
+    max_rounds: int = 16,
+    samples: int = 3,
+) -> int:
+    """Finds the bcrypt cost factor matching a target verify latency on this machine.
+
+    Each extra round doubles the work, so costs are measured in increasing order and
+    the search stops as soon as the target is exceeded.
+
+    Args:
+        target_ms: The target verify latency in milliseconds.
+            If None, use `config.PASSWORD_HASH_TARGET_MS`.
+        min_rounds: The lowest cost that may be returned.
+        max_rounds: The highest cost that may be returned.
+        samples: The number of verifications timed for each cost (best one is kept).
+
+    Returns:
+        The highest cost whose verify time stays within the target, or `min_rounds`
+        if even the lowest cost is slower than the target.
+    """
+    if target_ms is None:
+        target_ms = config.PASSWORD_HASH_TARGET_MS
+
+    min_rounds = max(min_rounds, BCRYPT_MIN_ROUNDS)
+    max_rounds = min(max_rounds, BCRYPT_MAX_ROUNDS)
+    handler = pwd_context.handler("bcrypt")
+
+    best = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        sample_hash = handler.using(rounds=rounds).hash("calibration-password")
+
+        elapsed_ms = float("inf")
+        for _ in range(samples):
+            start = time.perf_counter()
+            handler.verify("calibration-password", sample_hash)
+            elapsed_ms = min(elapsed_ms, (time.perf_counter() - start) * 1000)
+
+        if elapsed_ms > target_ms:
+            break
+        best = rounds
+
+    return best
 
 
 def hash_password(plain_password: str) -> str:
@@ -21,6 +118,62 @@ def hash_password(plain_password: str) -> str:
     return pwd_context.hash(plain_password)
 
 
+def _hash_workers() -> int:
+    """Returns the number of threads of the password hashing executor."""
+    return config.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    """Returns the shared executor used to hash passwords off the event loop."""
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ThreadPoolExecutor(
+            max_workers=_hash_workers(),
+            thread_name_prefix="password-hash",
+        )
+    return _hash_executor
+
+
+def shutdown_hash_executor() -> None:
+    """Stops the password hashing executor, if it was started."""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True)
+        _hash_executor = None
+
+
+async def run_in_hash_executor[T](func: Callable[..., T], *args: object) -> T:
+    """Runs a hashing function in the password hashing executor.
+
+    Args:
+        func: The function to run (e.g. hash_password).
+        *args: The positional arguments of the function.
+
+    Returns:
+        The result of the function.
+    """
+    global _hash_tasks_in_flight
+    _hash_tasks_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_hash_executor(), func, *args)
+    finally:
+        _hash_tasks_in_flight -= 1
+
+
+async def hash_passwords(plain_passwords: list[str]) -> list[str]:
+    """Hashes many plain text passwords in parallel.
+
+    Args:
+        plain_passwords: The plain text passwords to hash.
+
+    Returns:
+        The hashed passwords, in the same order.
+    """
+    return await asyncio.gather(
+        *(run_in_hash_executor(hash_password, password) for password in plain_passwords),
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain text password against a hashed password.
 
@@ -34,6 +187,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str,
+) -> tuple[bool, str | None]:
+    """Verifies a password and rehashes it if its hash does not match the current policy.
+
+    Args:
+        plain_password: The plain text password to verify.
+        hashed_password: The hashed password to verify against.
+
+    Returns:
+        A tuple (valid, new_hash). new_hash is None unless the password is valid and
+        the stored hash uses a deprecated scheme or cost, in which case it holds the
+        replacement hash to persist.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+REGISTRY.register(
+    CallbackGauge(
+        "password_hash_tasks_in_flight",
+        "Password hashes and verifications submitted to the executor and not finished.",
+        lambda: {(): _hash_tasks_in_flight},
+    ),
+)
+REGISTRY.register(
+    CallbackGauge(
+        "password_hash_queue_depth",
+        "Password hashes and verifications waiting for a free executor thread.",
+        lambda: {(): max(_hash_tasks_in_flight - _hash_workers(), 0)},
+    ),
+)
+
+
 def create_access_token(
     subject: str,
     expires_delta: timedelta | None = None,
@@ -90,3 +277,66 @@ def decode_token(token: str) -> dict:
         The decoded token payload.
     """
     return jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+
+
+def get_access_token_payload(authorization: str | None, token: str | None = None) -> dict:
+    """Returns the verified payload of the access token of a request.
+
+    The token is read from the Authorization header ("Bearer <token>"), else taken
+    from `token` (e.g. a query parameter, for clients that cannot send headers).
+
+    Args:
+        authorization: The value of the Authorization header, None when missing.
+        token: The token to use when the header carries no bearer token.
+
+    Returns:
+        The payload, with "role" as a UserRole (USER when missing or unknown).
+
+    Raises:
+        JWTError: If there is no token, or it is not a valid access token (bad
+            signature, expired, refresh token or without subject).
+    """
+    scheme, _, bearer = (authorization or "").partition(" ")
+    if scheme.lower() == "bearer":
+        token = bearer
+    if not token:
+        msg = "Access token required"
+        raise JWTError(msg)
+    payload = decode_token(token)
+    if payload.get("typ") == "refresh" or not payload.get("sub"):
+        msg = "Not an access token"
+        raise JWTError(msg)
+    try:
+        payload["role"] = UserRole(payload.get("role", UserRole.USER))
+    except ValueError:
+        payload["role"] = UserRole.USER
+    return payload
+
+
+def is_admin_token(authorization: str | None) -> bool:
+    """Checks that an Authorization header carries a valid access token of an admin.
+
+    Args:
+        authorization: The value of the Authorization header, None when missing.
+
+    Returns:
+        True if the access token is valid and carries the admin role.
+    """
+    try:
+        payload = get_access_token_payload(authorization)
+    except JWTError:
+        return False
+    return payload["role"] == UserRole.ADMIN
+
+
+def get_request_actor() -> str | None:
+    """Returns the user making the current request, from its bearer access token.
+
+    Returns None outside of a request, or when the request carries no valid access
+    token (the item endpoints do not require one).
+    """
+    try:
+        payload = get_access_token_payload(get_request_header(b"authorization"))
+    except JWTError:
+        return None
+    return payload["sub"]
@@ -1,7 +1,32 @@
 import datetime
+import time
 
 DEFAULT_TIMEZONE = datetime.UTC
 
 def get_current_time() -> datetime.datetime:
     """Get the current time in the default timezone."""
     return datetime.datetime.now(tz=DEFAULT_TIMEZONE)
+
+
+class PhaseTimer:
+    """Records the duration of consecutive named phases (e.g. application startup)."""
+
+    def __init__(self) -> None:
+        """Starts timing the first phase."""
+        self.phases: dict[str, float] = {}
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Ends the current phase, recording its duration under the given name."""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        """Time elapsed since the timer was created, in seconds."""
+        return self._last - self._start
+
+    def as_dict(self) -> dict[str, float]:
+        """Returns the phase durations and their total, in milliseconds."""
+        return {**{k: v * 1000 for k, v in self.phases.items()}, "total": self.total * 1000}
@@ -16,3 +16,33 @@ class ItemNotFoundError(Exception):
         """
         super().__init__(f"Item {item_id} not found")
         self.item_id = item_id
+
+
+class ItemChangesCursorError(Exception):
+    """Exception raised when a cursor of the item changes is malformed."""
+
+    def __init__(self, cursor: str) -> None:
+        """Initialize the ItemChangesCursorError with the cursor.
+
+        Args:
+            cursor (str): The rejected cursor.
+        """
+        super().__init__(f"Invalid cursor {cursor!r}")
+        self.cursor = cursor
+
+
+class ItemChangesExpiredError(Exception):
+    """Exception raised when the deletions since a cursor are no longer all kept.
+
+    Either their tombstones were purged, or the items were reset since (a new epoch).
+    The client has to download all the items again, then continue from a new cursor.
+    """
+
+    def __init__(self, cursor: str) -> None:
+        """Initialize the ItemChangesExpiredError with the cursor.
+
+        Args:
+            cursor (str): The expired cursor.
+        """
+        super().__init__(f"Cursor {cursor!r} has expired, start over without cursor")
+        self.cursor = cursor
@@ -0,0 +1,31 @@
+from uuid import UUID
+
+
+class TicketNotFoundError(Exception):
+    """Exception raised when a ticket is not found in the repository.
+
+    Attributes:
+        ticket_id (UUID): The ID of the ticket that was not found.
+    """
+
+    def __init__(self, ticket_id: UUID) -> None:
+        """Initialize the TicketNotFoundError with the ticket ID.
+
+        Args:
+            ticket_id (UUID): The ID of the ticket that was not found.
+        """
+        super().__init__(f"Ticket {ticket_id} not found")
+        self.ticket_id = ticket_id
+
+
+class InvalidApproverError(Exception):
+    """Exception raised when a ticket is assigned to a user who cannot approve it."""
+
+    def __init__(self, email: str) -> None:
+        """Initialize the InvalidApproverError with the user's email.
+
+        Args:
+            email (str): The email of the user who is not a manager or an admin.
+        """
+        super().__init__(f"User {email} is not a manager or an admin")
+        self.email = email
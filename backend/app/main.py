@@ -1,8 +1,18 @@
-from fastapi import FastAPI  # noqa: INP001
+from http import HTTPStatus  # noqa: INP001
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.controllers import general_router
+from app.api.controllers.internal_controller import internal_router
+from app.connections.dao.routing import ReadRoutingMiddleware
+from app.connections.dao.warmup import ping_database
+from app.core.compression import CompressionMiddleware
 from app.core.injector import lifespan
+from app.core.log import RequestIdMiddleware
+from app.core.metrics import REGISTRY, MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
 
 app = FastAPI(title="Inventory App", lifespan=lifespan)
 
@@ -14,8 +24,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadRoutingMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(CompressionMiddleware)
+# Added last so it is the outermost middleware and times the whole request
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(general_router)
+app.include_router(internal_router)
 
 
 @app.get("/")
@@ -32,3 +49,31 @@ async def root() -> dict:
 def health_check() -> dict[str, str]:
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@app.get(
+    "/health/ready",
+    summary="Readiness check endpoint",
+    description=(
+        "Endpoint to check whether the application is ready to serve traffic: "
+        "the warm-up is done and the database answers."
+    ),
+)
+async def readiness_check(request: Request, response: Response) -> dict[str, str]:
+    """Readiness check endpoint, answering 503 until the worker can serve traffic."""
+    if not request.app.state.warmed_up:
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+
+    engine = request.app.state.engine
+    if engine is not None and not await ping_database(engine):
+        response.status_code = HTTPStatus.SERVICE_UNAVAILABLE
+        return {"status": "database_unavailable"}
+
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> PlainTextResponse:
+    """Metrics of this worker in the Prometheus text exposition format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
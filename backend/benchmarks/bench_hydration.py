@@ -0,0 +1,166 @@
+"""Item hydration benchmark: ORM instances vs Core rows.
+
+Compares, on the same rows, the time and memory needed to turn a full `items` table
+read into entities:
+- orm: `select(ItemModel)` loads tracked ORM instances, copied by `_to_entity`;
+- core: `select(*ITEM_COLUMNS)` returns plain rows, unpacked into slotted entities.
+
+The rows are inserted in a transaction that is rolled back at the end, so the
+database is left untouched (it must be reachable, see DATABASE_URL). The memory of
+the entities alone is also compared with an equivalent dataclass without slots.
+
+Usage:
+    uv run python -m benchmarks.bench_hydration --rows 100000 --runs 3
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.business.entities.item_entity import ItemEntity
+from app.connections.dao.engine import create_engine_from_config
+from app.connections.dao.postgre_dao import ItemModel
+from app.connections.repositories.item_postgre_repository import (
+    ITEM_COLUMNS,
+    ItemPostgreRepository,
+)
+from app.core.log import logger
+from app.core.timing import get_current_time
+
+INSERT_BATCH = 5000
+
+UnslottedItemEntity = dataclasses.make_dataclass(
+    "UnslottedItemEntity",
+    [field.name for field in dataclasses.fields(ItemEntity)],
+)
+
+
+def make_rows(count: int) -> list[dict]:
+    """Builds the column values of synthetic items."""
+    now = get_current_time()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Laptop {i}",
+            "category": "Laptop",
+            "serial_number_1": f"SN-{i:08d}",
+            "serial_number_2": None,
+            "serial_number_3": f"ALT-{i}" if i % 3 == 0 else None,
+            "owner": None,
+            "location": "Building A - Floor 2",
+            "status": "available",
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+async def fetch_orm(session: AsyncSession) -> list[ItemEntity]:
+    """Reads the items as ORM instances and converts them to entities."""
+    result = await session.execute(select(ItemModel))
+    to_entity = ItemPostgreRepository._to_entity  # noqa: SLF001
+    entities = [to_entity(model) for model in result.scalars().all()]
+    session.expunge_all()  # the next run must not reuse the identity map
+    return entities
+
+
+async def fetch_core(session: AsyncSession) -> list[ItemEntity]:
+    """Reads the items as Core rows unpacked into entities."""
+    result = await session.execute(select(*ITEM_COLUMNS))
+    return [ItemEntity(*row) for row in result]
+
+
+async def measure(
+    fetch: Callable[[AsyncSession], Awaitable[list]],
+    session: AsyncSession,
+    runs: int,
+) -> dict[str, float]:
+    """Times a fetch path, then measures its peak and retained memory in a separate run."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fetch(session)
+        durations.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    entities = await fetch(session)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": len(entities),
+        "median_ms": statistics.median(durations) * 1000,
+        "per_row_us": statistics.median(durations) / len(entities) * 1_000_000,
+        "peak_mb": peak / 1_000_000,
+        "retained_mb": retained / 1_000_000,
+    }
+
+
+def entity_memory(rows: list[dict]) -> dict[str, float]:
+    """Returns the memory (MB) of the entities alone, with and without slots."""
+    values = [tuple(row.values()) for row in rows]
+    memory = {}
+    for name, entity_type in (("slotted", ItemEntity), ("unslotted", UnslottedItemEntity)):
+        tracemalloc.start()
+        entities = [entity_type(*value, None) for value in values]
+        memory[name] = tracemalloc.get_traced_memory()[0] / 1_000_000
+        tracemalloc.stop()
+        del entities
+    return memory
+
+
+async def main(row_count: int, runs: int) -> dict:
+    """Inserts the rows in a transaction, benchmarks both paths, then rolls back."""
+    rows = make_rows(row_count)
+    engine = create_engine_from_config()
+    try:
+        async with AsyncSession(engine) as session, session.begin():
+            for start in range(0, row_count, INSERT_BATCH):
+                await session.execute(insert(ItemModel), rows[start : start + INSERT_BATCH])
+
+            results = {
+                "orm": await measure(fetch_orm, session, runs),
+                "core": await measure(fetch_core, session, runs),
+            }
+            await session.rollback()
+    finally:
+        await engine.dispose()
+
+    results["entities_mb"] = entity_memory(rows)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark item hydration from the database.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Items inserted and read")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per path")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args.rows, args.runs))
+
+    logger.info(f"Hydration of {args.rows} inserted items (plus existing ones):")
+    for name in ("orm", "core"):
+        stats = results[name]
+        logger.info(
+            f"- {name}: {stats['per_row_us']:.2f} us/row (median {stats['median_ms']:.0f} ms), "
+            f"peak {stats['peak_mb']:.1f} MB, retained {stats['retained_mb']:.1f} MB",
+        )
+    memory = results["entities_mb"]
+    logger.info(
+        f"Entities alone: {memory['slotted']:.1f} MB slotted, "
+        f"{memory['unslotted']:.1f} MB without slots",
+    )
+
+    if args.output:
+        args.output.write_text(json.dumps({"rows": args.rows, "results": results}))
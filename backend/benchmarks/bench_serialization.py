@@ -0,0 +1,130 @@
+"""List response serialization benchmark.
+
+Compares, on synthetic items, the per-row cost of:
+- models: building an `ItemResponse` per entity with `model_validate(item)`,
+  wrapping them in `ItemsListResponse`, then letting FastAPI validate and serialize
+  the result against the declared response model (the former controller path);
+- fast: dumping the entities straight to JSON bytes with `EntityListSerializer`.
+
+No database is needed.
+
+Usage:
+    uv run python -m benchmarks.bench_serialization --rows 10000 --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.serializers import EntityListSerializer
+from app.api.validators.item_validators import ItemResponse, ItemsListResponse
+from app.business.entities.item_entity import ItemEntity, ItemOwnerEntity
+from app.core.log import logger
+from app.core.timing import get_current_time
+
+
+def make_items(count: int, *, with_owner: bool) -> list[ItemEntity]:
+    """Builds synthetic items, half of them assigned to an owner."""
+    now = get_current_time()
+    items = []
+    for i in range(count):
+        owner = f"user{i % 500}@example.com" if i % 2 else None
+        items.append(
+            ItemEntity(
+                id=uuid.uuid4(),
+                name=f"Laptop {i}",
+                category="Laptop",
+                serial_number_1=f"SN-{i:08d}",
+                serial_number_2=None,
+                serial_number_3=f"ALT-{i}" if i % 3 == 0 else None,
+                owner=owner,
+                location="Building A - Floor 2",
+                status="assigned" if owner else "available",
+                created_at=now,
+                owner_details=(
+                    ItemOwnerEntity(owner, "First", "Last") if with_owner and owner else None
+                ),
+            ),
+        )
+    return items
+
+
+# What FastAPI builds once per route from the declared return type
+response_field = create_model_field(
+    name="Response_list_items",
+    type_=ItemsListResponse,
+    mode="serialization",
+)
+serializer = EntityListSerializer(ItemEntity, ItemResponse)
+loop = asyncio.new_event_loop()
+
+
+def models_path(items: list[ItemEntity]) -> bytes:
+    """Serializes items as the controllers did before the fast path."""
+    response = ItemsListResponse(
+        items=[ItemResponse.model_validate(item, from_attributes=True) for item in items],
+    )
+    content = loop.run_until_complete(
+        serialize_response(field=response_field, response_content=response),
+    )
+    return JSONResponse(content).body
+
+
+def fast_path(items: list[ItemEntity]) -> bytes:
+    """Serializes items with the precompiled entity serializer."""
+    return serializer.dump_response("items", items)
+
+
+def time_path(path: Callable[[list[ItemEntity]], bytes], items: list, runs: int) -> list[float]:
+    """Returns the duration of each run, in seconds."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        path(items)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization.")
+    parser.add_argument("--rows", type=int, default=10_000, help="Items per response")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per path")
+    parser.add_argument("--expand-owner", action="store_true", help="Embed owner details")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    items = make_items(args.rows, with_owner=args.expand_owner)
+
+    # Both paths must produce the same document
+    if json.loads(models_path(items)) != json.loads(fast_path(items)):
+        msg = "The fast path output differs from the response model output"
+        raise SystemExit(msg)
+
+    results = {}
+    for name, path in (("models", models_path), ("fast", fast_path)):
+        durations = time_path(path, items, args.runs)
+        results[name] = {
+            "median_ms": statistics.median(durations) * 1000,
+            "min_ms": min(durations) * 1000,
+            "per_row_us": statistics.median(durations) / args.rows * 1_000_000,
+        }
+
+    logger.info(f"Serialization of {args.rows} items over {args.runs} runs:")
+    for name, stats in results.items():
+        logger.info(
+            f"- {name}: {stats['per_row_us']:.2f} us/row "
+            f"(median {stats['median_ms']:.1f} ms, min {stats['min_ms']:.1f} ms)",
+        )
+    logger.info(f"Speedup: {results['models']['per_row_us'] / results['fast']['per_row_us']:.1f}x")
+
+    if args.output:
+        args.output.write_text(json.dumps({"rows": args.rows, "results": results}))
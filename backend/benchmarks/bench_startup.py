@@ -0,0 +1,111 @@
+"""Worker startup benchmark.
+
+Measures, each in a fresh interpreter, the time to import `app.main` and the duration
+of every lifespan startup phase (the lifespan phases need a reachable database).
+
+Usage:
+    uv run python -m benchmarks.bench_startup --runs 5 --output startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from app.core.log import logger
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app.main
+print(json.dumps({"import": (time.perf_counter() - start) * 1000}))
+"""
+
+LIFESPAN_SCRIPT = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+from app.core.injector import lifespan
+import_ms = (time.perf_counter() - start) * 1000
+
+async def main():
+    async with lifespan(app):
+        return app.state.startup_phases
+
+phases = asyncio.run(main())
+print(json.dumps({"import": import_ms, **{f"lifespan.{k}": v for k, v in phases.items()}}))
+"""
+
+
+def run_script(script: str) -> dict[str, float]:
+    """Runs a script in a fresh interpreter and returns the JSON timings it prints."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(count: int) -> list[tuple[str, float]]:
+    """Returns the modules with the highest cumulative import time, in milliseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        timings.append((module.strip(), int(cumulative) / 1000))
+    return sorted(timings, key=lambda timing: timing[1], reverse=True)[:count]
+
+
+def summarize(samples: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    """Aggregates the timings of several runs into min/median/max per phase."""
+    return {
+        phase: {
+            "min": min(s[phase] for s in samples),
+            "median": statistics.median(s[phase] for s in samples),
+            "max": max(s[phase] for s in samples),
+        }
+        for phase in samples[0]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark worker import and startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters")
+    parser.add_argument("--import-only", action="store_true", help="Skip the lifespan phases")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to report")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    script = IMPORT_SCRIPT if args.import_only else LIFESPAN_SCRIPT
+    summary = summarize([run_script(script) for _ in range(args.runs)])
+    top_imports = slowest_imports(args.top)
+
+    logger.info(f"Startup over {args.runs} runs (ms):")
+    for phase, stats in summary.items():
+        logger.info(
+            f"- {phase}: median {stats['median']:.1f} "
+            f"(min {stats['min']:.1f}, max {stats['max']:.1f})",
+        )
+    logger.info("Slowest imports (cumulative ms):")
+    for module, elapsed in top_imports:
+        logger.info(f"- {module}: {elapsed:.1f}")
+
+    if args.output:
+        args.output.write_text(
+            json.dumps({"runs": args.runs, "phases": summary, "slowest_imports": top_imports}),
+        )
@@ -0,0 +1,254 @@
+"""Microbenchmarks of the per-row hot paths, with stored baselines.
+
+Each case processes N synthetic rows through one function of the backend:
+- to_entity: `ItemPostgreRepository._to_entity` on ORM instances;
+- item_response: `ItemResponse.model_validate(entity, from_attributes=True)`;
+- item_create: `ItemCreateRequest.model_validate` (with an `EmailStr` owner);
+- import_normalize: `normalize_import_rows` on a parsed import file;
+- jwt_encode / jwt_decode: `create_access_token` / `decode_token`.
+
+Each case and size is timed over repeated runs (the best run is kept, as the least
+disturbed) and reported per row, along with the noise of the runs (how much slower
+the median run is than the best). Results are compared with the stored baseline, and
+the run fails if a case got slower than the baseline by more than the threshold plus
+the noise of either measure, so that a noisy machine does not report regressions.
+
+Baselines depend on the machine, so none is committed: save one (--save-baseline) on
+the machine or CI runner that runs the comparison, e.g. from the base branch.
+
+No database is needed.
+
+Usage:
+    uv run python -m benchmarks.microbench
+    uv run python -m benchmarks.microbench --cases jwt_encode jwt_decode --sizes 1000
+    uv run python -m benchmarks.microbench --save-baseline
+"""
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import timeit
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from statistics import median
+
+from app.api.validators.item_validators import ItemCreateRequest, ItemResponse
+from app.business.entities.item_entity import ItemEntity
+from app.business.services.item_service import normalize_import_rows
+from app.connections.dao.postgre_dao import ItemModel
+from app.connections.repositories.item_postgre_repository import ItemPostgreRepository
+from app.core.log import logger
+from app.core.security import create_access_token, decode_token
+from app.core.timing import get_current_time
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "microbench.json"
+DEFAULT_SIZES = (100, 1_000, 10_000)
+# Fewer runs give a best time and a noise too unreliable to compare
+MIN_REPEAT = 5
+
+
+def _item_values(i: int) -> dict:
+    """Returns the column values of a synthetic item."""
+    owner = f"user{i % 500}@example.com" if i % 2 else None
+    return {
+        "id": uuid.uuid4(),
+        "name": f"Laptop {i}",
+        "category": "Laptop",
+        "serial_number_1": f"SN-{i:08d}",
+        "serial_number_2": None,
+        "serial_number_3": f"ALT-{i}" if i % 3 == 0 else None,
+        "owner": owner,
+        "location": "Building A - Floor 2",
+        "status": "assigned" if owner else "available",
+        "created_at": get_current_time(),
+    }
+
+
+def setup_to_entity(size: int) -> Callable[[], object]:
+    """Converts ORM instances to entities."""
+    models = [ItemModel(**_item_values(i)) for i in range(size)]
+    to_entity = ItemPostgreRepository._to_entity  # noqa: SLF001
+    return lambda: [to_entity(model) for model in models]
+
+
+def setup_item_response(size: int) -> Callable[[], object]:
+    """Builds response models from entities."""
+    entities = [ItemEntity(**_item_values(i)) for i in range(size)]
+    return lambda: [
+        ItemResponse.model_validate(entity, from_attributes=True) for entity in entities
+    ]
+
+
+def setup_item_create(size: int) -> Callable[[], object]:
+    """Validates item creation payloads, as the import does for each row."""
+    payloads = []
+    for i in range(size):
+        values = _item_values(i)
+        del values["id"], values["status"], values["created_at"]
+        payloads.append(values)
+    return lambda: [ItemCreateRequest.model_validate(payload) for payload in payloads]
+
+
+def setup_import_normalize(size: int) -> Callable[[], object]:
+    """Normalizes the rows of a parsed CSV import file."""
+    import pandas as pd  # noqa: PLC0415
+
+    lines = ["Name, Category ,Serial-Number 1,Email,Location"]
+    lines.extend(
+        f" Laptop {i} ,Laptop,SN-{i:08d} , user{i % 500}@example.com,GD-{i % 100:04d}"
+        for i in range(size)
+    )
+    df = pd.read_csv(io.StringIO("\n".join(lines)), dtype=str)
+    # Each run gets a fresh frame, as the normalization renames the columns in place
+    return lambda: normalize_import_rows(df.copy())
+
+
+def setup_jwt_encode(size: int) -> Callable[[], object]:
+    """Encodes access tokens."""
+    subjects = [f"user{i}@example.com" for i in range(size)]
+    return lambda: [create_access_token(s, extra={"role": "USER"}) for s in subjects]
+
+
+def setup_jwt_decode(size: int) -> Callable[[], object]:
+    """Decodes access tokens."""
+    tokens = [create_access_token(f"user{i}@example.com") for i in range(size)]
+    return lambda: [decode_token(token) for token in tokens]
+
+
+CASES: dict[str, Callable[[int], Callable[[], object]]] = {
+    "to_entity": setup_to_entity,
+    "item_response": setup_item_response,
+    "item_create": setup_item_create,
+    "import_normalize": setup_import_normalize,
+    "jwt_encode": setup_jwt_encode,
+    "jwt_decode": setup_jwt_decode,
+}
+
+
+def measure(run: Callable[[], object], size: int, repeat: int) -> dict[str, float]:
+    """Times a case run, keeping the best of `repeat` timings of enough loops.
+
+    The noise is how much slower the median timing is than the best one.
+    """
+    timer = timeit.Timer(run)
+    loops, _ = timer.autorange()  # enough loops for a run of at least 0.2 s
+    timings = sorted(timing / loops for timing in timer.repeat(repeat=repeat, number=loops))
+    best = timings[0]
+    return {
+        "per_row_us": best / size * 1_000_000,
+        "run_ms": best * 1000,
+        "noise": median(timings) / best - 1,
+    }
+
+
+def environment() -> dict[str, str]:
+    """Describes the machine and interpreter the benchmarks ran on."""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def run_cases(cases: list[str], sizes: list[int], repeat: int) -> dict[str, dict]:
+    """Runs the cases at every size, then returns the timings by case and size."""
+    results: dict[str, dict] = {}
+    for name in cases:
+        results[name] = {}
+        for size in sizes:
+            stats = measure(CASES[name](size), size, repeat)
+            results[name][str(size)] = stats
+            logger.info(
+                f"{name:<18}{size:>8} rows {stats['per_row_us']:>10.2f} us/row "
+                f"(noise {stats['noise']:.1%})",
+            )
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Logs the change of every timing against the baseline, returning the regressions.
+
+    A timing is a regression when it is slower than the baseline by more than the
+    threshold plus the larger noise of the two measures.
+    """
+    if baseline["environment"] != environment():
+        logger.warning(f"Baseline recorded on another environment: {baseline['environment']}")
+
+    regressions = []
+    for name, by_size in results.items():
+        for size, stats in by_size.items():
+            reference = baseline["results"].get(name, {}).get(size)
+            if reference is None:
+                logger.info(f"{name:<18}{size:>8} rows: no baseline")
+                continue
+            change = stats["per_row_us"] / reference["per_row_us"] - 1
+            margin = threshold + max(stats["noise"], reference.get("noise", 0.0))
+            flag = ""
+            if change > margin:
+                flag = "  REGRESSION"
+                regressions.append(f"{name}[{size}] {change:+.1%}")
+            logger.info(
+                f"{name:<18}{size:>8} rows {reference['per_row_us']:>10.2f} -> "
+                f"{stats['per_row_us']:>10.2f} us/row ({change:+.1%}, "
+                f"margin {margin:.1%}){flag}",
+            )
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the per-row hot paths.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=MIN_REPEAT,
+        help=f"Timed runs per case and size (at least {MIN_REPEAT})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="Slowdown over the baseline and the noise reported as a regression (0.15 = 15%%)",
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the baseline instead of comparing with it",
+    )
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    if args.repeat < MIN_REPEAT:
+        parser.error(f"--repeat must be at least {MIN_REPEAT}")
+
+    start = time.perf_counter()
+    results = run_cases(args.cases, args.sizes, args.repeat)
+    logger.info(f"Ran {len(args.cases)} cases in {time.perf_counter() - start:.1f} s")
+    document = {"environment": environment(), "results": results}
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2))
+
+    if args.save_baseline:
+        # Keep the baseline of the cases and sizes not run this time
+        if args.baseline.exists():
+            previous = json.loads(args.baseline.read_text())["results"]
+            for name, by_size in results.items():
+                previous.setdefault(name, {}).update(by_size)
+            document["results"] = previous
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        logger.info(f"Baseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            logger.error(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+    else:
+        logger.warning(f"No baseline at {args.baseline}, run with --save-baseline to store one")
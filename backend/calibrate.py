@@ -0,0 +1,30 @@
+import argparse
+
+from app.core.config import config
+from app.core.log import logger
+from app.core.security import calibrate_bcrypt_rounds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Find the bcrypt cost factor matching a target verify latency.",
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=config.PASSWORD_HASH_TARGET_MS,
+        help="Target verify latency in milliseconds",
+    )
+    parser.add_argument("--min-rounds", type=int, default=10, help="Lowest acceptable cost")
+    parser.add_argument("--max-rounds", type=int, default=16, help="Highest acceptable cost")
+    parser.add_argument("--samples", type=int, default=3, help="Timed verifications per cost")
+    args = parser.parse_args()
+
+    rounds = calibrate_bcrypt_rounds(
+        target_ms=args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        samples=args.samples,
+    )
+
+    logger.info(f"Target verify latency: {args.target_ms:.0f} ms")
+    logger.info(f"Recommended setting: BCRYPT_ROUNDS={rounds}")
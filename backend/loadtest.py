@@ -0,0 +1,446 @@
+"""Load test of the API with concurrent virtual users.
+
+Each virtual user registers, logs in, then sends requests drawn from a weighted
+workload mix in a closed loop (a new request as soon as the previous one answered)
+until the test duration or request count is reached:
+- list: GET /api/items, with the owner details one time in four;
+- filter: GET /api/users?q=<prefix>&limit=20 (owner autocomplete);
+- get: GET /api/items/{id};
+- patch: PATCH /api/items/{id}, moving the item to another location;
+- import: POST /api/items/import with a small generated CSV;
+- login: POST /api/auth/login;
+- refresh: POST /api/auth/refresh, rotating the user's refresh token.
+
+Latency percentiles, throughput and error rates are reported per operation, and can
+be written as JSON (--output) and compared with a previous run (--compare). The
+users and items created by the test are deleted at the end with --cleanup.
+
+Usage:
+    uv run python loadtest.py --concurrency 50 --duration 60 --output run.json
+    uv run python loadtest.py --mix list=1,get=4,patch=1 --compare run.json
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import math
+import random
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from app.core.log import logger
+from app.core.timing import get_current_time
+from fake import FIRST_NAMES, LAST_NAMES, generate_fake_item, generate_location
+
+DEFAULT_MIX = {
+    "list": 15,
+    "filter": 20,
+    "get": 35,
+    "patch": 15,
+    "import": 2,
+    "login": 3,
+    "refresh": 10,
+}
+PERCENTILES = (50, 90, 95, 99)
+PASSWORD = "LoadTest-Password-1"  # noqa: S105
+IMPORT_ROWS = 10
+
+
+@dataclass
+class VirtualUser:
+    """A registered user and its current tokens."""
+
+    email: str
+    first_name: str
+    last_name: str
+    access_token: str | None = None
+    refresh_token: str | None = None
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Returns the authorization header of the user, once logged in."""
+        return {"Authorization": f"Bearer {self.access_token}"} if self.access_token else {}
+
+
+@dataclass
+class OperationStats:
+    """Latencies and outcomes of one operation."""
+
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[str] = field(default_factory=Counter)
+    errors: int = 0
+
+    def record(self, status: str, elapsed: float, *, error: bool) -> None:
+        """Records the outcome of one request."""
+        self.latencies.append(elapsed)
+        self.statuses[status] += 1
+        self.errors += error
+
+    def summary(self, duration: float) -> dict:
+        """Returns the statistics of the operation over a run of `duration` seconds."""
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        summary = {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": self.errors / count if count else 0.0,
+            "throughput_rps": count / duration if duration else 0.0,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+        if count:
+            summary["latency_ms"] = {
+                "min": latencies[0] * 1000,
+                "mean": sum(latencies) / count * 1000,
+                **{f"p{p}": percentile(latencies, p) * 1000 for p in PERCENTILES},
+                "max": latencies[-1] * 1000,
+            }
+        return summary
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Returns the nearest-rank percentile `p` (0-100) of sorted values."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parses a workload mix such as "list=1,get=4,patch=1"."""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            msg = f"Unknown operation {name!r}, expected one of {', '.join(DEFAULT_MIX)}"
+            raise argparse.ArgumentTypeError(msg)
+        try:
+            mix[name] = float(weight)
+        except ValueError as e:
+            msg = f"Invalid weight for {name}: {weight!r}"
+            raise argparse.ArgumentTypeError(msg) from e
+    return mix
+
+
+def items_csv(owners: list[VirtualUser], rows: int) -> bytes:
+    """Builds an import file of generated items, owned by the given users.
+
+    Only the columns filled on every row are written: blank optional cells are
+    rejected by the import (read back as NaN), which would skew its timings.
+    """
+    buffer = io.StringIO()
+    columns = ["name", "category", "serial_number_1", "email", "location"]
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for _ in range(rows):
+        item = generate_fake_item([{"email": user.email} for user in owners])
+        writer.writerow({**item, "email": item["owner"]})
+    return buffer.getvalue().encode()
+
+
+class LoadTest:
+    """Concurrent virtual users sending a weighted mix of API requests."""
+
+    def __init__(self, client: httpx.AsyncClient, mix: dict[str, float]) -> None:
+        """Initializes a load test sending requests with the given client."""
+        self.client = client
+        self.operations = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.operations]
+        self.stats: dict[str, OperationStats] = {name: OperationStats() for name in self.operations}
+        self.users: list[VirtualUser] = []
+        self.item_ids: list[str] = []
+        self.created_item_ids: list[str] = []
+        self.measuring = False
+        self.sent = 0
+
+    async def setup(self, concurrency: int, min_items: int) -> None:
+        """Registers and logs in the virtual users, and makes sure items exist."""
+        run_id = uuid.uuid4().hex[:8]
+        self.users = [
+            VirtualUser(
+                email=f"loadtest.{run_id}.{i}@example.com",
+                first_name=random.choice(FIRST_NAMES),
+                last_name=random.choice(LAST_NAMES),
+            )
+            for i in range(concurrency)
+        ]
+        await asyncio.gather(*(self._register(user) for user in self.users))
+
+        response = await self.client.get("/api/items")
+        response.raise_for_status()
+        self.item_ids = [item["id"] for item in response.json()["items"]]
+        if len(self.item_ids) < min_items:
+            missing = min_items - len(self.item_ids)
+            await self.import_items(self.users[0], rows=missing)
+        logger.info(f"Setup done: {len(self.users)} users, {len(self.item_ids)} items")
+
+    async def _register(self, user: VirtualUser) -> None:
+        """Registers a virtual user and logs it in."""
+        response = await self.client.post(
+            "/api/auth/register",
+            json={
+                "email": user.email,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "password": PASSWORD,
+            },
+        )
+        response.raise_for_status()
+        (await self.login(user)).raise_for_status()
+
+    async def run(
+        self,
+        duration: float,
+        *,
+        warmup: float = 0.0,
+        max_requests: int | None = None,
+    ) -> float:
+        """Runs the workload, then returns the measured duration in seconds.
+
+        Args:
+            duration: Measured duration of the test, in seconds.
+            warmup: Duration before the measurement starts, in seconds. Requests sent
+                during the warm-up are not recorded.
+            max_requests: Stop after this many measured requests.
+
+        Returns:
+            The time spent measuring, in seconds.
+        """
+        if warmup > 0:
+            await self._run_workers(time.perf_counter() + warmup, None)
+
+        self.measuring = True
+        start = time.perf_counter()
+        await self._run_workers(start + duration, max_requests)
+        return time.perf_counter() - start
+
+    async def _run_workers(self, deadline: float, max_requests: int | None) -> None:
+        """Runs one closed-loop worker per virtual user until the deadline."""
+
+        async def worker(user: VirtualUser) -> None:
+            while time.perf_counter() < deadline:
+                if max_requests is not None:
+                    if self.sent >= max_requests:
+                        return
+                    self.sent += 1
+                name = random.choices(self.operations, self.weights)[0]
+                await self._call(name, user)
+
+        await asyncio.gather(*(worker(user) for user in self.users))
+
+    async def _call(self, name: str, user: VirtualUser) -> None:
+        """Sends one request of an operation and records its outcome."""
+        operation = getattr(self, f"{name}_op")
+        start = time.perf_counter()
+        try:
+            response = await operation(user)
+        except httpx.HTTPError as e:
+            status, error = type(e).__name__, True
+        else:
+            status, error = str(response.status_code), response.is_error
+        elapsed = time.perf_counter() - start
+
+        if self.measuring:
+            self.stats[name].record(status, elapsed, error=error)
+
+    # Operations
+
+    async def list_op(self, user: VirtualUser) -> httpx.Response:
+        """Lists all items, with the owner details one time in four."""
+        params = {"expand": "owner"} if random.random() < 0.25 else None  # noqa: PLR2004
+        return await self.client.get("/api/items", params=params, headers=user.headers)
+
+    async def filter_op(self, user: VirtualUser) -> httpx.Response:
+        """Searches the users whose name starts with a random prefix."""
+        prefix = random.choice(FIRST_NAMES + LAST_NAMES)[: random.randint(1, 4)]
+        return await self.client.get(
+            "/api/users",
+            params={"q": prefix, "limit": 20},
+            headers=user.headers,
+        )
+
+    async def get_op(self, user: VirtualUser) -> httpx.Response:
+        """Gets a random item."""
+        item_id = random.choice(self.item_ids)
+        return await self.client.get(f"/api/items/{item_id}", headers=user.headers)
+
+    async def patch_op(self, user: VirtualUser) -> httpx.Response:
+        """Moves a random item to another location."""
+        item_id = random.choice(self.item_ids)
+        return await self.client.patch(
+            f"/api/items/{item_id}",
+            json={"location": generate_location()},
+            headers=user.headers,
+        )
+
+    async def import_op(self, user: VirtualUser) -> httpx.Response:
+        """Imports a few generated items owned by virtual users."""
+        return await self.import_items(user, rows=IMPORT_ROWS)
+
+    async def login_op(self, user: VirtualUser) -> httpx.Response:
+        """Logs the user in again."""
+        return await self.login(user)
+
+    async def refresh_op(self, user: VirtualUser) -> httpx.Response:
+        """Rotates the refresh token of the user."""
+        response = await self.client.post(
+            "/api/auth/refresh",
+            json={"refresh_token": user.refresh_token},
+        )
+        if response.is_success:
+            self._store_tokens(user, response.json())
+        return response
+
+    async def login(self, user: VirtualUser) -> httpx.Response:
+        """Logs a user in and stores its tokens."""
+        response = await self.client.post(
+            "/api/auth/login",
+            json={"email": user.email, "password": PASSWORD},
+        )
+        if response.is_success:
+            self._store_tokens(user, response.json())
+        return response
+
+    async def import_items(self, user: VirtualUser, rows: int) -> httpx.Response:
+        """Imports generated items and adds them to the item pool."""
+        owners = random.sample(self.users, min(len(self.users), 5))
+        response = await self.client.post(
+            "/api/items/import",
+            files={"file": ("items.csv", items_csv(owners, rows), "text/csv")},
+            headers=user.headers,
+        )
+        if response.is_success:
+            created = [item["id"] for item in response.json()["created"]]
+            self.item_ids.extend(created)
+            self.created_item_ids.extend(created)
+        return response
+
+    @staticmethod
+    def _store_tokens(user: VirtualUser, tokens: dict) -> None:
+        """Keeps the tokens returned by a login or refresh."""
+        user.access_token = tokens["access_token"]
+        user.refresh_token = tokens["refresh_token"]
+
+    async def cleanup(self) -> None:
+        """Deletes the items and users created by the test."""
+        for item_id in self.created_item_ids:
+            await self.client.delete(f"/api/items/{item_id}")
+        for user in self.users:
+            await self.client.delete(f"/api/users/{user.email}")
+        logger.info(
+            f"Deleted {len(self.created_item_ids)} items and {len(self.users)} users",
+        )
+
+    def results(self, duration: float, config: dict) -> dict:
+        """Returns the results of the run, JSON serializable."""
+        endpoints = {name: stats.summary(duration) for name, stats in self.stats.items()}
+        total = sum(stats["requests"] for stats in endpoints.values())
+        errors = sum(stats["errors"] for stats in endpoints.values())
+        return {
+            "finished_at": get_current_time().isoformat(),
+            "config": config,
+            "duration_s": duration,
+            "totals": {
+                "requests": total,
+                "errors": errors,
+                "error_rate": errors / total if total else 0.0,
+                "throughput_rps": total / duration if duration else 0.0,
+            },
+            "endpoints": endpoints,
+        }
+
+
+def report(results: dict, baseline: dict | None = None) -> None:
+    """Logs the results, with the change from a baseline run if given."""
+    totals = results["totals"]
+    logger.info(
+        f"{totals['requests']} requests in {results['duration_s']:.1f} s: "
+        f"{totals['throughput_rps']:.1f} req/s, {totals['error_rate']:.2%} errors",
+    )
+    logger.info(
+        f"{'operation':<10}{'req':>8}{'req/s':>9}{'err %':>8}"
+        + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES),
+    )
+    for name, stats in results["endpoints"].items():
+        latency = stats.get("latency_ms", {})
+        line = (
+            f"{name:<10}{stats['requests']:>8}{stats['throughput_rps']:>9.1f}"
+            f"{stats['error_rate']:>8.2%}"
+            + "".join(f"{latency.get(f'p{p}', 0):>10.1f}" for p in PERCENTILES)
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(name, {})
+        if "latency_ms" in previous and latency:
+            p95_change = latency["p95"] / previous["latency_ms"]["p95"] - 1
+            rps_change = stats["throughput_rps"] / previous["throughput_rps"] - 1
+            line += f"   p95 {p95_change:+.0%}, req/s {rps_change:+.0%}"
+        logger.info(line)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    """Sets up the virtual users, runs the load test and returns its results."""
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        load_test = LoadTest(client, args.mix)
+        await load_test.setup(args.concurrency, args.min_items)
+        logger.info(
+            f"Running {args.concurrency} users for {args.duration:.0f} s "
+            f"(warm-up {args.warmup:.0f} s)",
+        )
+        try:
+            duration = await load_test.run(
+                args.duration,
+                warmup=args.warmup,
+                max_requests=args.requests,
+            )
+        finally:
+            if args.cleanup:
+                await load_test.cleanup()
+
+    config = {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "warmup_s": args.warmup,
+        "max_requests": args.requests,
+        "mix": args.mix,
+    }
+    return load_test.results(duration, config)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API with concurrent users.")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=20, help="Virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds first")
+    parser.add_argument("--requests", type=int, help="Stop after this many measured requests")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=DEFAULT_MIX,
+        help="Operation weights, e.g. list=15,filter=20,get=35,patch=15,import=2,login=3,"
+        "refresh=10 (omitted operations are not sent)",
+    )
+    parser.add_argument("--min-items", type=int, default=50, help="Items imported if missing")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Request timeout (s)")
+    parser.add_argument("--cleanup", action="store_true", help="Delete created users and items")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Results of a previous run to compare with")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args))
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    report(results, baseline)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
@@ -0,0 +1,55 @@
+"""Item events.
+
+The append-only history of the items.
+
+Revision ID: 082258347c68
+Revises: d672399112a5
+Create Date: 2026-10-19 03:31:27.444457
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "082258347c68"
+down_revision: str | Sequence[str] | None = "d672399112a5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "item_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("item_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("changes", postgresql.JSONB(), nullable=False),
+        sa.Column("actor", sa.String(), nullable=True),
+        sa.Column("request_id", sa.String(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_item_events_item_id",
+        "item_events",
+        ["item_id", "id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_item_events_occurred_at_brin",
+        "item_events",
+        ["occurred_at"],
+        postgresql_using="brin",
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_events")
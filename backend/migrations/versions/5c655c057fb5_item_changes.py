@@ -0,0 +1,108 @@
+"""Item changes.
+
+Numbers every change of the items from the item_change_seq sequence, for the changes
+feed (GET /items/changes): the number and the change time of each item, and the
+tombstones of the deleted items, all set by the track_item_change trigger. The existing
+items are numbered in creation order.
+
+Revision ID: 5c655c057fb5
+Revises: d3247861f5cb
+Create Date: 2026-10-19 03:58:12.382214
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c655c057fb5"
+down_revision: str | Sequence[str] | None = "d3247861f5cb"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE IF NOT EXISTS item_change_seq")
+    op.create_table(
+        "item_tombstones",
+        sa.Column("item_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("item_id"),
+        sa.UniqueConstraint("change_seq"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_item_tombstones_deleted_at",
+        "item_tombstones",
+        ["deleted_at"],
+        if_not_exists=True,
+    )
+
+    # Added nullable, numbered, then made NOT NULL
+    op.execute("ALTER TABLE items ADD COLUMN IF NOT EXISTS change_seq bigint")
+    op.execute("ALTER TABLE items ADD COLUMN IF NOT EXISTS updated_at timestamp with time zone")
+    op.execute("""
+    UPDATE items
+    SET change_seq = numbered.change_seq, updated_at = now()
+    FROM (
+        SELECT id, nextval('item_change_seq') AS change_seq
+        FROM (SELECT id FROM items WHERE change_seq IS NULL ORDER BY created_at, id) ordered
+    ) numbered
+    WHERE items.id = numbered.id
+    """)
+    op.alter_column("items", "change_seq", nullable=False)
+    op.alter_column("items", "updated_at", nullable=False)
+    op.create_index(
+        "ix_items_change_seq",
+        "items",
+        ["change_seq"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION track_item_change() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO item_tombstones (item_id, change_seq, deleted_at)
+            VALUES (OLD.id, nextval('item_change_seq'), clock_timestamp())
+            ON CONFLICT (item_id) DO UPDATE
+            SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at;
+            RETURN NULL;
+        END IF;
+        IF TG_OP = 'INSERT' THEN
+            -- An item created again with the ID of a deleted one
+            DELETE FROM item_tombstones WHERE item_id = NEW.id;
+        END IF;
+        NEW.change_seq := nextval('item_change_seq');
+        NEW.updated_at := clock_timestamp();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    for trigger in (
+        "item_changes_insert BEFORE INSERT ON items FOR EACH ROW",
+        (
+            "item_changes_update BEFORE UPDATE ON items FOR EACH ROW "
+            "WHEN (OLD.* IS DISTINCT FROM NEW.*)"
+        ),
+        "item_changes_delete AFTER DELETE ON items FOR EACH ROW",
+    ):
+        op.execute("CREATE OR REPLACE TRIGGER " + trigger + " EXECUTE FUNCTION track_item_change()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in ("item_changes_insert", "item_changes_update", "item_changes_delete"):
+        op.execute("DROP TRIGGER IF EXISTS " + trigger + " ON items")
+    op.execute("DROP FUNCTION IF EXISTS track_item_change()")
+    op.drop_index("ix_items_change_seq", table_name="items")
+    op.drop_column("items", "updated_at")
+    op.drop_column("items", "change_seq")
+    op.drop_table("item_tombstones")
+    op.execute("DROP SEQUENCE IF EXISTS item_change_seq")
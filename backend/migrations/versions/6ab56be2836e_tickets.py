@@ -0,0 +1,94 @@
+"""Tickets.
+
+Change tickets of the items, approved or rejected by the managers, and their
+announcement on the "notifications" channel to the requester, the approver and the
+owner of the item.
+
+Revision ID: 6ab56be2836e
+Revises: f0072ad8f753
+Create Date: 2026-10-19 03:41:05.312547
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "6ab56be2836e"
+down_revision: str | Sequence[str] | None = "f0072ad8f753"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tickets",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("item_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("requester", sa.String(), nullable=False),
+        sa.Column("approver", sa.String(), nullable=True),
+        sa.Column("changes", postgresql.JSONB(), nullable=False),
+        sa.Column("comment", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("decided_by", sa.String(), nullable=True),
+        sa.Column("decided_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("decision_comment", sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["requester"], ["users.email"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["approver"], ["users.email"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_tickets_open_approver",
+        "tickets",
+        ["approver", "created_at"],
+        postgresql_where=sa.text("status = 'open'"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_tickets_open_created_at",
+        "tickets",
+        ["created_at"],
+        postgresql_where=sa.text("status = 'open'"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_tickets_item_id", "tickets", ["item_id"], if_not_exists=True)
+    op.create_index("ix_tickets_requester", "tickets", ["requester"], if_not_exists=True)
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_ticket() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('notifications', json_build_object(
+            'kind', 'ticket',
+            'ticket_id', NEW.id,
+            'item_id', NEW.item_id,
+            'status', NEW.status,
+            'requester', NEW.requester,
+            'approver', NEW.approver,
+            'decided_by', NEW.decided_by,
+            'recipients', json_build_array(
+                NEW.requester,
+                NEW.approver,
+                (SELECT owner FROM items WHERE id = NEW.item_id)
+            )
+        )::text);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE TRIGGER tickets_notify AFTER INSERT OR UPDATE OF status ON tickets
+    FOR EACH ROW EXECUTE FUNCTION notify_ticket()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tickets")
+    op.execute("DROP FUNCTION IF EXISTS notify_ticket()")
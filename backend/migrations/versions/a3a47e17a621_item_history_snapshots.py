@@ -0,0 +1,74 @@
+"""Item history snapshots.
+
+Periodic snapshots of the items, from which the past states are replayed.
+
+Revision ID: a3a47e17a621
+Revises: 082258347c68
+Create Date: 2026-10-19 03:31:29.028976
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a3a47e17a621"
+down_revision: str | Sequence[str] | None = "082258347c68"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "item_history_snapshots",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("settled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_event_id", sa.BigInteger(), nullable=False),
+        sa.Column("item_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_item_history_snapshots_taken_at",
+        "item_history_snapshots",
+        ["taken_at"],
+        if_not_exists=True,
+    )
+    op.create_table(
+        "item_snapshot_rows",
+        sa.Column("snapshot_id", sa.BigInteger(), nullable=False),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.Column("serial_number_1", sa.String(), nullable=False),
+        sa.Column("serial_number_2", sa.String(), nullable=True),
+        sa.Column("serial_number_3", sa.String(), nullable=True),
+        sa.Column("owner", sa.String(), nullable=True),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["snapshot_id"],
+            ["item_history_snapshots.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("snapshot_id", "id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_item_snapshot_rows_owner",
+        "item_snapshot_rows",
+        ["snapshot_id", "owner"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_snapshot_rows")
+    op.drop_table("item_history_snapshots")
@@ -0,0 +1,67 @@
+"""Item events notify trigger.
+
+Announces every committed item event on the "notifications" channel, to the
+notification listener of each worker. The payload lists its recipients: the current
+owner of the item, and the previous one when the event changes the owner (from the
+latest event setting it before this one). The events are ordered by occurrence: the
+write-behind queue numbers them when flushed, so their IDs may be out of order.
+
+Revision ID: d3247861f5cb
+Revises: a3a47e17a621
+Create Date: 2026-10-19 03:31:30.759838
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3247861f5cb"
+down_revision: str | Sequence[str] | None = "a3a47e17a621"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+    CREATE OR REPLACE FUNCTION notify_item_event() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_notify('notifications', json_build_object(
+            'kind', 'item',
+            'id', NEW.id,
+            'item_id', NEW.item_id,
+            'event_type', NEW.event_type,
+            'fields', (
+                SELECT coalesce(json_agg(key), '[]') FROM jsonb_object_keys(NEW.changes) key
+            ),
+            'actor', NEW.actor,
+            'occurred_at', NEW.occurred_at,
+            'recipients', json_build_array(
+                coalesce(
+                    (SELECT owner FROM items WHERE id = NEW.item_id),
+                    NEW.changes ->> 'owner'
+                ),
+                CASE WHEN NEW.changes ? 'owner' THEN (
+                    SELECT changes ->> 'owner' FROM item_events
+                    WHERE item_id = NEW.item_id AND changes ? 'owner'
+                    AND (occurred_at, id) < (NEW.occurred_at, NEW.id)
+                    ORDER BY occurred_at DESC, id DESC LIMIT 1
+                ) END
+            )
+        )::text);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+    CREATE OR REPLACE TRIGGER item_events_notify AFTER INSERT ON item_events
+    FOR EACH ROW EXECUTE FUNCTION notify_item_event()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS item_events_notify ON item_events")
+    op.execute("DROP FUNCTION IF EXISTS notify_item_event()")
@@ -0,0 +1,34 @@
+"""Items owner category index.
+
+Per-owner item lookups and per-owner/category aggregates (user statistics).
+
+Revision ID: d672399112a5
+Revises: d9bd0316e303
+Create Date: 2026-10-19 03:31:25.693456
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d672399112a5"
+down_revision: str | Sequence[str] | None = "d9bd0316e303"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_items_owner_category",
+        "items",
+        ["owner", "category"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_items_owner_category", table_name="items")
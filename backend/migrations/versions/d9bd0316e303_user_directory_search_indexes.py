@@ -0,0 +1,44 @@
+"""User directory search indexes.
+
+Case-insensitive prefix search on the emails and trigram search on the names, for the
+user directory.
+
+Revision ID: d9bd0316e303
+Revises: a3c6f6e2d8ca
+Create Date: 2026-10-19 03:31:24.140411
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9bd0316e303"
+down_revision: str | Sequence[str] | None = "a3c6f6e2d8ca"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_email_lower_prefix "
+        "ON users (lower(email) text_pattern_ops)",
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_first_name_lower_trgm "
+        "ON users USING gin (lower(first_name) gin_trgm_ops)",
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_last_name_lower_trgm "
+        "ON users USING gin (lower(last_name) gin_trgm_ops)",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS ix_users_last_name_lower_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_first_name_lower_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_users_email_lower_prefix")
@@ -0,0 +1,42 @@
+"""Item changes epochs.
+
+The resets of the items (e.g. truncated by the seeder), which fire no trigger and so
+leave no tombstone: the cursors of the changes feed from before the latest one expire.
+
+Revision ID: f0072ad8f753
+Revises: 5c655c057fb5
+Create Date: 2026-10-19 03:40:22.047053
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f0072ad8f753"
+down_revision: str | Sequence[str] | None = "5c655c057fb5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "item_changes_epochs",
+        sa.Column("epoch", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("epoch"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("item_changes_epochs")
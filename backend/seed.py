@@ -0,0 +1,223 @@
+"""Seeds a large synthetic dataset straight into PostgreSQL with COPY.
+
+Users and items are built with the generators of `fake.py` and streamed with the
+binary COPY protocol, without going through the API. Items are generated and copied
+in chunks by a pool of worker processes, each with its own connection. All users
+share one password, hashed once.
+
+The random generators are seeded from --seed (per chunk for items), so the same
+seed, counts and chunk size give the same dataset. Only the creation dates depend
+on the day of the run: they are spread over the year before it.
+
+Usage:
+    uv run python seed.py --users 10000 --items 1000000 --workers 8 --truncate
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+
+import asyncpg
+from sqlalchemy import make_url
+
+from app.core.config import config
+from app.core.log import logger
+from app.core.security import hash_password
+from app.core.timing import get_current_time
+from fake import generate_fake_item, generate_fake_user
+
+USER_COLUMNS = ("email", "first_name", "last_name", "hashed_password", "role")
+ITEM_COLUMNS = (
+    "id",
+    "name",
+    "category",
+    "serial_number_1",
+    "serial_number_2",
+    "serial_number_3",
+    "owner",
+    "location",
+    "status",
+    "created_at",
+)
+CREATED_AT_SPREAD = timedelta(days=365)
+
+# Set in each worker process by `_init_worker`
+_owners: list[dict] = []
+
+
+def database_dsn() -> str:
+    """Returns the configured database URL in the form asyncpg expects."""
+    url = make_url(config.database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def generate_users(seed: int, count: int, hashed_password: str) -> list[tuple]:
+    """Generates the rows of the users, with unique emails."""
+    random.seed(f"{seed}:users")
+    rows = []
+    for i in range(count):
+        user = generate_fake_user()
+        domain = user["email"].rpartition("@")[2]
+        email = f"{user['first_name'].lower()}.{user['last_name'].lower()}.{i}@{domain}"
+        rows.append((email, user["first_name"], user["last_name"], hashed_password, user["role"]))
+    return rows
+
+
+def generate_items(
+    seed: int,
+    chunk: int,
+    count: int,
+    *,
+    until: datetime,
+    unassigned_ratio: float,
+) -> list[tuple]:
+    """Generates the rows of one chunk of items."""
+    random.seed(f"{seed}:items:{chunk}")
+    rows = []
+    for _ in range(count):
+        item = generate_fake_item(_owners)
+        owner = item["owner"] if random.random() >= unassigned_ratio else None
+        rows.append(
+            (
+                uuid.UUID(int=random.getrandbits(128), version=4),
+                item["name"],
+                item["category"],
+                item["serial_number_1"],
+                item["serial_number_2"],
+                item["serial_number_3"],
+                owner,
+                item["location"],
+                "assigned" if owner else "available",
+                until - CREATED_AT_SPREAD * random.random(),
+            ),
+        )
+    return rows
+
+
+async def copy_rows(dsn: str, table: str, columns: tuple[str, ...], rows: list[tuple]) -> None:
+    """Copies rows into a table on a new connection."""
+    conn = await asyncpg.connect(dsn)
+    try:
+        # The dataset can be seeded again if lost, no need to wait for the WAL flush
+        await conn.execute("SET synchronous_commit = off")
+        await conn.copy_records_to_table(table, records=rows, columns=columns)
+    finally:
+        await conn.close()
+
+
+def _init_worker(owner_emails: list[str]) -> None:
+    """Receives the possible item owners in a worker process."""
+    _owners.extend({"email": email} for email in owner_emails)
+
+
+def seed_items_chunk(
+    dsn: str,
+    seed: int,
+    chunk: int,
+    count: int,
+    *,
+    until: datetime,
+    unassigned_ratio: float,
+) -> int:
+    """Generates and copies one chunk of items (in a worker process)."""
+    rows = generate_items(seed, chunk, count, until=until, unassigned_ratio=unassigned_ratio)
+    asyncio.run(copy_rows(dsn, "items", ITEM_COLUMNS, rows))
+    return len(rows)
+
+
+async def seed(args: argparse.Namespace) -> None:
+    """Seeds the users then the items, and refreshes the planner statistics."""
+    dsn = database_dsn()
+    if args.truncate:
+        conn = await asyncpg.connect(dsn)
+        try:
+            async with conn.transaction():
+                # With the item history, and the tickets and refresh tokens by cascade.
+                # TRUNCATE fires no trigger, so no tombstone records the items dropped:
+                # a new epoch expires the cursors of the changes feed instead.
+                await conn.execute(
+                    "TRUNCATE items, users, item_events, item_history_snapshots, "
+                    "item_snapshot_rows, item_tombstones CASCADE",
+                )
+                await conn.execute("INSERT INTO item_changes_epochs DEFAULT VALUES")
+        finally:
+            await conn.close()
+        logger.info("Truncated the users and items tables, and the item history")
+
+    start = time.perf_counter()
+    users = generate_users(args.seed, args.users, hash_password(args.password))
+    await copy_rows(dsn, "users", USER_COLUMNS, users)
+    logger.info(f"Copied {len(users)} users in {time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    until = get_current_time()
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=([user[0] for user in users],),
+    ) as pool:
+        tasks = [
+            loop.run_in_executor(
+                pool,
+                partial(
+                    seed_items_chunk,
+                    dsn,
+                    args.seed,
+                    chunk,
+                    min(args.chunk_size, args.items - offset),
+                    until=until,
+                    unassigned_ratio=args.unassigned_ratio,
+                ),
+            )
+            for chunk, offset in enumerate(range(0, args.items, args.chunk_size))
+        ]
+        copied = 0
+        for task in asyncio.as_completed(tasks):
+            copied += await task
+            elapsed = time.perf_counter() - start
+            logger.info(f"Copied {copied}/{args.items} items ({copied / elapsed:.0f} rows/s)")
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.execute("ANALYZE users")
+        await conn.execute("ANALYZE items")
+    finally:
+        await conn.close()
+    logger.info(f"Seeded {args.items} items in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a large synthetic dataset with COPY.")
+    parser.add_argument("--users", type=int, default=10_000, help="Users to create")
+    parser.add_argument("--items", type=int, default=1_000_000, help="Items to create")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the random generators")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Items per chunk")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel chunk workers")
+    parser.add_argument(
+        "--unassigned-ratio",
+        type=float,
+        default=0.2,
+        help="Fraction of the items without owner",
+    )
+    parser.add_argument(
+        "--password",
+        default="Seeded-Password-1",
+        help="Password shared by all the seeded users",
+    )
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Delete all users and items (and their dependent rows) first",
+    )
+    args = parser.parse_args()
+
+    if args.users < 1:
+        parser.error("--users must be at least 1, items need owners")
+
+    asyncio.run(seed(args))
@@ -0,0 +1,61 @@
+from collections.abc import Callable, Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.business.entities.user_entity import UserRole
+from app.core.config import config
+from app.core.security import create_access_token
+from app.main import app
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    """Returns a client of the app on the memory backend, starting with empty tables.
+
+    Snapshots are only taken on demand, so each test decides where they are.
+    """
+    monkeypatch.setattr(config, "repository_backend", "memory")
+    monkeypatch.setattr(config, "item_snapshot_interval_hours", None)
+    monkeypatch.setattr(config, "log_file", None)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def auth() -> Callable[..., dict[str, str]]:
+    """Returns a builder of the Authorization header of a user."""
+
+    def build(email: str, role: UserRole = UserRole.USER) -> dict[str, str]:
+        token = create_access_token(email, extra={"role": role.value})
+        return {"Authorization": f"Bearer {token}"}
+
+    return build
+
+
+@pytest.fixture
+def create_user(client: TestClient) -> Callable[..., str]:
+    """Returns a function creating a user, returning their email."""
+
+    def create(email: str, role: UserRole = UserRole.USER) -> str:
+        response = client.post(
+            "/api/users",
+            json={"email": email, "first_name": "Ada", "last_name": "Lovelace", "role": role},
+        )
+        assert response.status_code == 201, response.text
+        return email
+
+    return create
+
+
+@pytest.fixture
+def create_item(client: TestClient) -> Callable[..., dict]:
+    """Returns a function creating an item, returning it."""
+
+    def create(**fields: str | None) -> dict:
+        body = {"name": "Laptop", "category": "Computer", "serial_number_1": "SN-1"} | fields
+        response = client.post("/api/items", json=body)
+        assert response.status_code == 201, response.text
+        return response.json()
+
+    return create
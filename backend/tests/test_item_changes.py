@@ -0,0 +1,78 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def _changes(client: TestClient, since: str | None = None, limit: int = 500) -> dict:
+    params = {"limit": limit} | ({"since": since} if since is not None else {})
+    response = client.get("/api/items/changes", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_changes_page_through_all_items(
+    client: TestClient,
+    create_item: Callable[..., dict],
+) -> None:
+    """Without cursor, all the items are returned page by page."""
+    ids = [create_item(serial_number_1=f"SN-{n}")["id"] for n in range(3)]
+
+    first = _changes(client, limit=2)
+    assert first["has_more"]
+    second = _changes(client, first["cursor"], limit=2)
+    assert not second["has_more"]
+    assert [item["id"] for item in first["items"] + second["items"]] == ids
+    assert _changes(client, second["cursor"])["items"] == []
+
+
+def test_changes_since_cursor(client: TestClient, create_item: Callable[..., dict]) -> None:
+    """A cursor returns the items changed since, and the IDs of the deleted ones."""
+    kept, deleted = create_item(serial_number_1="SN-1"), create_item(serial_number_1="SN-2")
+    cursor = _changes(client)["cursor"]
+
+    client.patch(f"/api/items/{kept['id']}", json={"location": "Shelf"})
+    client.delete(f"/api/items/{deleted['id']}")
+    created = create_item(serial_number_1="SN-3")
+
+    changes = _changes(client, cursor)
+    assert [item["id"] for item in changes["items"]] == [kept["id"], created["id"]]
+    assert changes["items"][0]["location"] == "Shelf"
+    assert changes["deleted"] == [deleted["id"]]
+
+
+def test_item_changed_twice_is_returned_once(
+    client: TestClient,
+    create_item: Callable[..., dict],
+) -> None:
+    """Only the latest change of an item is returned."""
+    item = create_item()
+    cursor = _changes(client)["cursor"]
+    client.patch(f"/api/items/{item['id']}", json={"location": "Desk"})
+    client.patch(f"/api/items/{item['id']}", json={"location": "Shelf"})
+
+    changes = _changes(client, cursor)
+    assert [changed["location"] for changed in changes["items"]] == ["Shelf"]
+    assert changes["deleted"] == []
+
+
+@pytest.mark.parametrize("cursor", ["abc", "1.2", "1.2.x", "1.2.3.4"])
+def test_malformed_cursor_is_rejected(client: TestClient, cursor: str) -> None:
+    """Cursors not built by the server are rejected with 400."""
+    response = client.get("/api/items/changes", params={"since": cursor})
+    assert response.status_code == 400
+
+
+def test_cursor_older_than_the_tombstones_expires(client: TestClient) -> None:
+    """The deletions may have been forgotten since an old cursor: 410."""
+    epoch, change_seq, _ = _changes(client)["cursor"].split(".")
+    response = client.get("/api/items/changes", params={"since": f"{epoch}.{change_seq}.0"})
+    assert response.status_code == 410
+
+
+def test_cursor_of_another_epoch_expires(client: TestClient) -> None:
+    """The change numbers restart after a reset of the items: 410."""
+    epoch, change_seq, milliseconds = _changes(client)["cursor"].split(".")
+    cursor = f"{int(epoch) - 1}.{change_seq}.{milliseconds}"
+    response = client.get("/api/items/changes", params={"since": cursor})
+    assert response.status_code == 410
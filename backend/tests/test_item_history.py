@@ -0,0 +1,89 @@
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from fastapi.testclient import TestClient
+
+from app.business.entities.user_entity import UserRole
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+def _take_snapshot(client: TestClient, auth: Callable[..., dict[str, str]]) -> None:
+    response = client.post(
+        "/internal/item-snapshots",
+        headers=auth("admin@example.com", UserRole.ADMIN),
+    )
+    assert response.status_code == 201, response.text
+
+
+def test_history_records_each_change(client: TestClient, create_item: Callable[..., dict]) -> None:
+    """The history of an item lists its creation, updates and deletion, oldest first."""
+    item = create_item(location="Desk")
+    client.patch(f"/api/items/{item['id']}", json={"location": "Shelf"})
+    client.delete(f"/api/items/{item['id']}")
+
+    events = client.get(f"/api/items/{item['id']}/history").json()["events"]
+    assert [event["event_type"] for event in events] == ["created", "updated", "deleted"]
+    assert events[1]["changes"] == {"location": "Shelf"}
+
+
+def test_as_of_replays_events_on_snapshot(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_item: Callable[..., dict],
+) -> None:
+    """Past states are the latest snapshot before them with the later events replayed."""
+    item = create_item(location="Desk")
+    _take_snapshot(client, auth)
+    before_update = _now()
+    client.patch(f"/api/items/{item['id']}", json={"location": "Shelf"})
+    before_delete = _now()
+    client.delete(f"/api/items/{item['id']}")
+    _take_snapshot(client, auth)
+
+    past = client.get("/api/items", params={"as_of": before_update}).json()["items"]
+    assert [past_item["location"] for past_item in past] == ["Desk"]
+    past_item = client.get(f"/api/items/{item['id']}", params={"as_of": before_delete}).json()
+    assert past_item["location"] == "Shelf"
+    assert client.get("/api/items", params={"as_of": _now()}).json()["items"] == []
+
+
+def test_as_of_without_snapshot_replays_the_history(
+    client: TestClient,
+    create_item: Callable[..., dict],
+) -> None:
+    """Before the first snapshot, the past states come from the whole history."""
+    before_creation = _now()
+    item = create_item()
+    after_creation = _now()
+
+    assert client.get("/api/items", params={"as_of": before_creation}).json()["items"] == []
+    past = client.get("/api/items", params={"as_of": after_creation}).json()["items"]
+    assert [past_item["id"] for past_item in past] == [item["id"]]
+
+
+def test_as_of_owner_lists_the_items_owned_then(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_user: Callable[..., str],
+    create_item: Callable[..., dict],
+) -> None:
+    """The items of a user at a past date include the ones given away since."""
+    owner = create_user("owner@example.com")
+    create_user("next@example.com")
+    item = create_item(owner=owner)
+    _take_snapshot(client, auth)
+    while_owned = _now()
+    client.patch(f"/api/items/{item['id']}", json={"owner": "next@example.com"})
+
+    assert client.get(f"/api/users/{owner}/items").json()["items"] == []
+    past = client.get(f"/api/users/{owner}/items", params={"as_of": while_owned}).json()
+    assert [past_item["id"] for past_item in past["items"]] == [item["id"]]
+
+
+def test_as_of_needs_a_time_zone(client: TestClient) -> None:
+    """Past dates without time zone are ambiguous and rejected."""
+    response = client.get("/api/items", params={"as_of": "2026-01-01T00:00:00"})
+    assert response.status_code == 400
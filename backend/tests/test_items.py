@@ -0,0 +1,36 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def test_update_changes_the_given_fields(
+    client: TestClient,
+    create_item: Callable[..., dict],
+) -> None:
+    """Fields left out of an update are unchanged, the ones set to null are cleared."""
+    item = create_item(location="Desk", serial_number_2="SN-2")
+    response = client.patch(
+        f"/api/items/{item['id']}",
+        json={"name": "Tablet", "serial_number_2": None},
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    assert (updated["name"], updated["location"], updated["serial_number_2"]) == (
+        "Tablet",
+        "Desk",
+        None,
+    )
+
+
+@pytest.mark.parametrize("field", ["name", "category", "serial_number_1", "status"])
+def test_update_clearing_a_required_field_is_rejected(
+    client: TestClient,
+    create_item: Callable[..., dict],
+    field: str,
+) -> None:
+    """Items cannot be without their required fields."""
+    item = create_item()
+    response = client.patch(f"/api/items/{item['id']}", json={field: None})
+    assert response.status_code == 400
+    assert client.get(f"/api/items/{item['id']}").json()[field] == item[field]
@@ -0,0 +1,142 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.business.entities.user_entity import UserRole
+
+REQUESTER = "requester@example.com"
+MANAGER = "manager@example.com"
+
+
+@pytest.fixture
+def users(create_user: Callable[..., str]) -> None:
+    """Creates the requester and the manager deciding the tickets."""
+    create_user(REQUESTER)
+    create_user(MANAGER, UserRole.MANAGER)
+
+
+def _open_ticket(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    item_id: str,
+    changes: dict,
+) -> str:
+    response = client.post(
+        "/api/tickets",
+        headers=auth(REQUESTER),
+        json={"item_id": item_id, "changes": changes},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _approve(client: TestClient, auth: Callable[..., dict[str, str]], *ticket_ids: str) -> dict:
+    response = client.post(
+        "/api/tickets/approve",
+        headers=auth(MANAGER, UserRole.MANAGER),
+        json={"ticket_ids": list(ticket_ids)},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.usefixtures("users")
+def test_approval_applies_the_changes(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_item: Callable[..., dict],
+) -> None:
+    """An approved ticket updates its item and records the change in the history."""
+    item = create_item(location="Desk")
+    ticket_id = _open_ticket(client, auth, item["id"], {"location": "Shelf"})
+
+    decisions = _approve(client, auth, ticket_id)
+    assert [ticket["id"] for ticket in decisions["decided"]] == [ticket_id]
+    assert decisions["decided"][0]["status"] == "approved"
+    assert decisions["decided"][0]["decided_by"] == MANAGER
+    assert client.get(f"/api/items/{item['id']}").json()["location"] == "Shelf"
+    events = client.get(f"/api/items/{item['id']}/history").json()["events"]
+    assert events[-1]["changes"] == {"location": "Shelf"}
+
+
+@pytest.mark.usefixtures("users")
+def test_decided_and_unknown_tickets_are_skipped(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_item: Callable[..., dict],
+) -> None:
+    """Tickets no longer open in the queue are left as they are."""
+    item = create_item()
+    ticket_id = _open_ticket(client, auth, item["id"], {"location": "Shelf"})
+    _approve(client, auth, ticket_id)
+    unknown_id = "00000000-0000-0000-0000-000000000000"
+
+    decisions = _approve(client, auth, ticket_id, unknown_id)
+    assert decisions["decided"] == []
+    assert decisions["skipped"] == [ticket_id, unknown_id]
+
+
+@pytest.mark.usefixtures("users")
+def test_refused_change_fails_and_stays_open(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_user: Callable[..., str],
+    create_item: Callable[..., dict],
+) -> None:
+    """A change the tables refuse fails its ticket only, with the field at fault."""
+    gone = create_user("gone@example.com")
+    item = create_item()
+    failing_id = _open_ticket(client, auth, item["id"], {"owner": gone})
+    passing_id = _open_ticket(client, auth, item["id"], {"location": "Shelf"})
+    assert client.delete(f"/api/users/{gone}").status_code == 204
+
+    decisions = _approve(client, auth, failing_id, passing_id)
+    assert decisions["failed"] == [{"ticket_id": failing_id, "error": "owner: not a user"}]
+    assert [ticket["id"] for ticket in decisions["decided"]] == [passing_id]
+    ticket = client.get(f"/api/tickets/{failing_id}", headers=auth(REQUESTER)).json()
+    assert ticket["status"] == "open"
+    assert client.get(f"/api/items/{item['id']}").json()["owner"] is None
+
+
+@pytest.mark.usefixtures("users")
+def test_ticket_clearing_a_required_field_is_rejected(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_item: Callable[..., dict],
+) -> None:
+    """A ticket that could only fail once approved is refused at creation."""
+    item = create_item()
+    response = client.post(
+        "/api/tickets",
+        headers=auth(REQUESTER),
+        json={"item_id": item["id"], "changes": {"name": None}},
+    )
+    assert response.status_code == 400
+
+
+def test_tickets_need_an_access_token(client: TestClient, create_item: Callable[..., dict]) -> None:
+    """Tickets are opened by authenticated users only."""
+    item = create_item()
+    response = client.post(
+        "/api/tickets",
+        json={"item_id": item["id"], "changes": {"location": "Shelf"}},
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.usefixtures("users")
+def test_only_managers_approve(
+    client: TestClient,
+    auth: Callable[..., dict[str, str]],
+    create_item: Callable[..., dict],
+) -> None:
+    """Users without the manager or admin role cannot decide tickets."""
+    item = create_item()
+    ticket_id = _open_ticket(client, auth, item["id"], {"location": "Shelf"})
+    response = client.post(
+        "/api/tickets/approve",
+        headers=auth(REQUESTER),
+        json={"ticket_ids": [ticket_id]},
+    )
+    assert response.status_code == 403
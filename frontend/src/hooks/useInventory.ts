@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { fetchItems } from '../services/items.service';
-import { InventoryItem, ItemResponse } from '../models/item';
+import { InventoryItem, ItemResponse, mapItemResponseToInventory } from '../models/item';
 
 export function useInventory() {
   const [items, setItems] = useState<InventoryItem[]>([]);
@@ -12,26 +12,7 @@ export function useInventory() {
       try {
         const backendItems: ItemResponse[] = await fetchItems();
 
-        const mapped: InventoryItem[] = backendItems.map((item) => {
-          const ownerInitials: string = item.owner
-            .split('@')[0]
-            .split('.')
-            .map((part) => part[0])
-            .join('')
-            .toUpperCase();
-
-          return {
-            id: item.id,
-            item: item.name,
-            category: item.category,
-            serialNumber1: item.serial_number_1,
-            serialNumber2: item.serial_number_2,
-            serialNumber3: item.serial_number_3,
-            ownerEmail: item.owner,
-            ownerInitials,
-            location: item.location,
-          };
-        });
+        const mapped: InventoryItem[] = backendItems.map(mapItemResponseToInventory);
 
         setItems(mapped);
       } catch (err: any) {
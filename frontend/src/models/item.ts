@@ -1,3 +1,9 @@
+export interface ItemOwnerDetails {
+  email: string;
+  first_name: string;
+  last_name: string;
+}
+
 export interface ItemResponse {
   id: string;
   name: string;
@@ -9,6 +15,7 @@ export interface ItemResponse {
   location: string;
   status: string;
   created_at: string;
+  owner_details?: ItemOwnerDetails | null;
 }
 
 export interface InventoryItem {
@@ -20,16 +27,20 @@ export interface InventoryItem {
   serialNumber3: string | null;
   ownerEmail: string;
   ownerInitials: string;
+  ownerName: string | null;
   location: string;
 }
 
 export function mapItemResponseToInventory(item: ItemResponse): InventoryItem {
-  const initials = item.owner
-    .split('@')[0]
-    .split('.')
-    .map((part) => part[0])
-    .join('')
-    .toUpperCase();
+  const details = item.owner_details;
+  const initials = details
+    ? `${details.first_name[0] ?? ''}${details.last_name[0] ?? ''}`.toUpperCase()
+    : item.owner
+        .split('@')[0]
+        .split('.')
+        .map((part) => part[0])
+        .join('')
+        .toUpperCase();
 
   return {
     id: item.id,
@@ -40,6 +51,7 @@ export function mapItemResponseToInventory(item: ItemResponse): InventoryItem {
     serialNumber3: item.serial_number_3,
     ownerEmail: item.owner,
     ownerInitials: initials,
+    ownerName: details ? `${details.first_name} ${details.last_name}` : null,
     location: item.location,
   };
 }
@@ -258,8 +258,8 @@ export function InventoryPage() {
             <Avatar size={32} radius="xl">
               {item.ownerInitials}
             </Avatar>
-            <Text size="sm" fw={500}>
-              {item.ownerEmail}
+            <Text size="sm" fw={500} title={item.ownerEmail}>
+              {item.ownerName ?? item.ownerEmail}
             </Text>
           </Group>
         </Table.Td>
@@ -2,7 +2,7 @@ import { apiFetch } from '../api/client';
 import { ImportItemsResponse, ItemResponse } from '../models/item';
 
 export async function fetchItems(): Promise<ItemResponse[]> {
-  const data = await apiFetch<{ items: ItemResponse[] }>('/items');
+  const data = await apiFetch<{ items: ItemResponse[] }>('/items?expand=owner');
   return data.items;
 }
 
@@ -5,3 +5,9 @@ export async function fetchUsers(): Promise<UserResponse[]> {
   const data = await apiFetch<{ users: UserResponse[] }>('/users');
   return data.users;
 }
+
+export async function searchUsers(query: string, limit = 20): Promise<UserResponse[]> {
+  const params = new URLSearchParams({ q: query, limit: String(limit) });
+  const data = await apiFetch<{ users: UserResponse[] }>(`/users?${params}`);
+  return data.users;
+}